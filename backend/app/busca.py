@@ -0,0 +1,106 @@
+"""
+Módulo: busca.py
+Descrição: Busca de entregas por nome do cliente e endereço, sem diferenciar maiúsculas nem acentos, com resultados ordenados por relevância.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: A busca depende das extensões pg_trgm e unaccent e da função imutável sem_acento(text), criadas pela migração
+      'busca_de_entregas', que também cria índices GIN de trigramas sobre sem_acento(lower(nome_cliente)) e
+      sem_acento(lower(endereco_entrega)). As expressões usadas aqui devem ser idênticas às dos índices para que
+      o PostgreSQL os utilize.
+NOTE: Uma entrega corresponde ao termo quando o contém (LIKE '%termo%') ou quando o termo é parecido com alguma palavra
+      do campo (operador <% do pg_trgm, que tolera erros de digitação). A ordenação usa word_similarity().
+"""
+
+from app.db import db
+from app.models.entrega import Entrega
+from app.leitura import COLUNAS_ENTREGA, EntregaLeitura
+
+TAMANHO_MINIMO_TERMO = 3
+POR_PAGINA_PADRAO = 20
+POR_PAGINA_MAXIMO = 100
+
+def _normalizada(expressao):
+    """
+    Aplica a mesma normalização dos índices de busca (minúsculas e sem acentos).
+
+    Args:
+        expressao: Coluna ou valor SQL.
+
+    Returns:
+        Expressão SQL normalizada.
+    """
+    return db.func.sem_acento(db.func.lower(expressao))
+
+def _escapar_like(termo):
+    """
+    Escapa os caracteres curinga do LIKE no termo buscado.
+
+    Args:
+        termo (str): Termo informado pelo usuário.
+
+    Returns:
+        str: Termo com '\\', '%' e '_' escapados.
+    """
+    return termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def validar_termo(termo):
+    """
+    Valida o termo de busca.
+
+    Args:
+        termo (str): Termo informado.
+
+    Returns:
+        str: Termo sem espaços nas extremidades e com espaços internos reduzidos.
+
+    Raises:
+        ValueError: Se o termo tiver menos de TAMANHO_MINIMO_TERMO caracteres.
+    """
+    termo = ' '.join((termo or '').split())
+    if len(termo) < TAMANHO_MINIMO_TERMO:
+        raise ValueError(f"O termo de busca deve ter pelo menos {TAMANHO_MINIMO_TERMO} caracteres.")
+    return termo
+
+def buscar_entregas(termo, pagina=1, por_pagina=POR_PAGINA_PADRAO):
+    """
+    Busca entregas cujo nome do cliente ou endereço corresponda ao termo.
+
+    Args:
+        termo (str): Termo já validado com validar_termo().
+        pagina (int, optional): Página desejada, a partir de 1.
+        por_pagina (int, optional): Quantidade de entregas por página (máx. POR_PAGINA_MAXIMO).
+
+    Returns:
+        tuple: (entregas, tem_proxima), com as entregas da página (EntregaLeitura) em ordem de relevância e um
+               indicador de existência de mais resultados.
+
+    NOTE: Não há contagem total de resultados: a página seguinte é detectada buscando um registro a mais do que o
+          solicitado, o que evita um segundo COUNT sobre as correspondências.
+    NOTE: A paginação usa OFFSET, e páginas profundas não ficam mais baratas: a relevância é calculada na consulta, e
+          não há índice nessa ordem, de modo que cada página ordena todas as correspondências e descarta as
+          (pagina - 1) * por_pagina primeiras. Paginação por chave (relevância, criado_em, id) evitaria o descarte,
+          mas não o cálculo e a ordenação; o custo é limitado pelo termo mínimo de TAMANHO_MINIMO_TERMO caracteres,
+          que restringe as correspondências.
+    """
+    valor = _normalizada(db.literal(termo))
+    padrao = db.literal('%').concat(_normalizada(db.literal(_escapar_like(termo)))).concat('%')
+    entrega = Entrega.__table__
+    nome = _normalizada(entrega.c.nome_cliente)
+    endereco = _normalizada(entrega.c.endereco_entrega)
+    relevancia = db.func.greatest(db.func.word_similarity(valor, nome), db.func.word_similarity(valor, endereco))
+
+    consulta = (
+        db.select(*COLUNAS_ENTREGA)
+        .where(db.or_(
+            nome.like(padrao, escape='\\'),
+            endereco.like(padrao, escape='\\'),
+            valor.op('<%')(nome),
+            valor.op('<%')(endereco),
+        ))
+        .order_by(relevancia.desc(), entrega.c.criado_em.desc(), entrega.c.id)
+        .limit(por_pagina + 1)
+        .offset((pagina - 1) * por_pagina)
+    )
+    entregas = [EntregaLeitura(linha) for linha in db.session.execute(consulta)]
+    return entregas[:por_pagina], len(entregas) > por_pagina
@@ -0,0 +1,203 @@
+"""
+Módulo: compressao.py
+Descrição: Compressão gzip e brotli das respostas, negociada pelo header Accept-Encoding.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: São comprimidas apenas respostas de tipos textuais (JSON, texto, CSV, XML) com pelo menos COMPRESSAO_MINIMO
+      bytes; abaixo disso o ganho não compensa o custo. Arquivos servidos diretamente (send_file, como as fotos) e
+      respostas que já têm Content-Encoding não são alterados. Quando o cliente aceita os dois formatos com a mesma
+      preferência, brotli é usado.
+NOTE: Os níveis padrão são COMPRESSAO_NIVEL_GZIP (1 a 9) e COMPRESSAO_NIVEL_BROTLI (0 a 11) e podem ser alterados por
+      rota com o decorador nivel_compressao (nível 0 desativa a compressão da rota).
+NOTE: Respostas com streaming são comprimidas por partes, com um flush a cada parte enviada pela rota.
+NOTE: Os corpos comprimidos são guardados em um cache LRU por processo, indexado pelo resumo do corpo original, pelo
+      formato e pelo nível, limitado a COMPRESSAO_CACHE_MAX bytes (0 desativa). Um mesmo resultado servido a vários
+      clientes (ex.: a lista de entregas de um motorista) é comprimido uma única vez.
+"""
+
+from flask import request, g, current_app
+from collections import OrderedDict
+from functools import wraps
+import brotli
+import hashlib
+import threading
+import zlib
+
+TIPOS_COMPRIMIVEIS = ('application/json', 'application/xml', 'application/javascript', 'text/')
+CODIFICACOES = ['br', 'gzip']
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_trava = threading.Lock()
+
+def nivel_compressao(gzip=None, brotli=None):
+    """
+    Define os níveis de compressão de uma rota, em substituição aos níveis padrão.
+
+    Args:
+        gzip (int, optional): Nível gzip (0 desativa gzip na rota).
+        brotli (int, optional): Nível brotli (0 desativa brotli na rota).
+
+    Returns:
+        Callable: Decorador do método do Resource.
+    """
+    niveis = {nome: nivel for nome, nivel in (('gzip', gzip), ('br', brotli)) if nivel is not None}
+
+    def decorador(funcao):
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            g.compressao_niveis = niveis
+            return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+def _niveis():
+    """
+    Retorna os níveis de compressão da requisição atual.
+
+    Returns:
+        dict: Nível por codificação ('br' e 'gzip').
+    """
+    niveis = {'gzip': current_app.config['COMPRESSAO_NIVEL_GZIP'], 'br': current_app.config['COMPRESSAO_NIVEL_BROTLI']}
+    niveis.update(g.get('compressao_niveis', {}))
+    return niveis
+
+def _negociar(niveis):
+    """
+    Escolhe a codificação aceita pelo cliente, entre as habilitadas.
+
+    Args:
+        niveis (dict): Nível por codificação.
+
+    Returns:
+        str: 'br', 'gzip', ou None se nenhuma for aceita.
+    """
+    habilitadas = [codificacao for codificacao in CODIFICACOES if niveis.get(codificacao)]
+    return request.accept_encodings.best_match(habilitadas) if habilitadas else None
+
+def _comprimir(dados, codificacao, nivel):
+    """
+    Comprime um corpo completo.
+
+    Args:
+        dados (bytes): Corpo original.
+        codificacao (str): 'br' ou 'gzip'.
+        nivel (int): Nível de compressão.
+
+    Returns:
+        bytes: Corpo comprimido.
+    """
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=nivel)
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+    return compressor.compress(dados) + compressor.flush()
+
+def _comprimir_partes(partes, codificacao, nivel):
+    """
+    Comprime uma resposta com streaming, parte a parte.
+
+    Args:
+        partes (Iterable): Partes do corpo original (bytes ou str).
+        codificacao (str): 'br' ou 'gzip'.
+        nivel (int): Nível de compressão.
+
+    Yields:
+        bytes: Partes comprimidas, com flush ao final de cada parte para que o cliente as receba sem esperar o fim.
+    """
+    if codificacao == 'br':
+        compressor = brotli.Compressor(quality=nivel)
+        comprimir, descarregar, finalizar = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+        comprimir, finalizar = compressor.compress, compressor.flush
+        descarregar = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+    for parte in partes:
+        if isinstance(parte, str):
+            parte = parte.encode()
+        if parte:
+            saida = comprimir(parte) + descarregar()
+            if saida:
+                yield saida
+    yield finalizar()
+
+def _comprimido_em_cache(dados, codificacao, nivel):
+    """
+    Comprime um corpo, reaproveitando o resultado de uma compressão anterior do mesmo corpo.
+
+    Args:
+        dados (bytes): Corpo original.
+        codificacao (str): 'br' ou 'gzip'.
+        nivel (int): Nível de compressão.
+
+    Returns:
+        bytes: Corpo comprimido.
+    """
+    global _cache_bytes
+    limite = current_app.config['COMPRESSAO_CACHE_MAX']
+    if limite <= 0:
+        return _comprimir(dados, codificacao, nivel)
+
+    chave = (hashlib.blake2b(dados, digest_size=16).digest(), len(dados), codificacao, nivel)
+    with _trava:
+        comprimido = _cache.get(chave)
+        if comprimido is not None:
+            _cache.move_to_end(chave)
+            return comprimido
+
+    comprimido = _comprimir(dados, codificacao, nivel)
+    if len(comprimido) > limite:
+        return comprimido
+    with _trava:
+        if chave not in _cache:
+            _cache[chave] = comprimido
+            _cache_bytes += len(comprimido)
+            while _cache_bytes > limite:
+                _, antigo = _cache.popitem(last=False)
+                _cache_bytes -= len(antigo)
+    return comprimido
+
+def comprimir_resposta(resposta):
+    """
+    Comprime a resposta, se o tipo, o tamanho e o Accept-Encoding da requisição permitirem.
+
+    Args:
+        resposta (Response): Resposta da rota.
+
+    Returns:
+        Response: A mesma resposta, comprimida ou não.
+    """
+    if (request.method == 'HEAD' or resposta.status_code < 200 or resposta.status_code in (204, 206, 304)
+            or resposta.direct_passthrough or 'Content-Encoding' in resposta.headers
+            or not (resposta.mimetype or '').startswith(TIPOS_COMPRIMIVEIS)):
+        return resposta
+
+    resposta.vary.add('Accept-Encoding')
+    niveis = _niveis()
+    codificacao = _negociar(niveis)
+    if codificacao is None:
+        return resposta
+
+    if resposta.is_streamed:
+        resposta.response = _comprimir_partes(resposta.response, codificacao, niveis[codificacao])
+        resposta.headers.pop('Content-Length', None)
+    else:
+        dados = resposta.get_data()
+        if len(dados) < current_app.config['COMPRESSAO_MINIMO']:
+            return resposta
+        resposta.set_data(_comprimido_em_cache(dados, codificacao, niveis[codificacao]))
+
+    resposta.headers['Content-Encoding'] = codificacao
+    etag, fraca = resposta.get_etag()
+    if etag:
+        resposta.set_etag(f"{etag}-{codificacao}", weak=fraca)
+    return resposta
+
+def init_compressao(app):
+    """
+    Registra a compressão das respostas na aplicação.
+
+    Args:
+        app (Flask): Aplicação.
+    """
+    app.after_request(comprimir_resposta)
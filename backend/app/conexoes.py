@@ -0,0 +1,116 @@
+"""
+Módulo: conexoes.py
+Descrição: Configuração do pool de conexões com o banco de dados e estatísticas de uso do pool.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: O pool de cada processo mantém até BANCO_POOL_TAMANHO conexões abertas e abre até BANCO_POOL_EXCEDENTE conexões
+      extras em picos. Quando todas estão em uso, a requisição aguarda até BANCO_POOL_ESPERA segundos e falha, em vez
+      de acumular threads paradas. O total de conexões no PostgreSQL é (tamanho + excedente) x processos, que deve
+      ficar abaixo de max_connections.
+NOTE: BANCO_TEMPO_LIMITE_CONSULTA (milissegundos) é aplicado como statement_timeout em cada conexão: uma consulta
+      travada é cancelada pelo próprio PostgreSQL e libera a conexão.
+NOTE: PoolMedido registra quanto tempo as requisições esperaram para obter uma conexão e quantas desistiram por
+      esgotamento do pool; estatisticas_pool() reúne esses valores com a ocupação atual.
+"""
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+import os
+import threading
+import time
+
+class PoolMedido(QueuePool):
+    """
+    QueuePool que mede o tempo de obtenção das conexões.
+
+    NOTE: O tempo medido inclui a abertura de uma conexão nova, quando o pool precisa criá-la.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trava_medidas = threading.Lock()
+        self.obtencoes = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.esgotamentos = 0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._trava_medidas:
+                self.esgotamentos += 1
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._trava_medidas:
+                self.obtencoes += 1
+                self.espera_total += espera
+                self.espera_maxima = max(self.espera_maxima, espera)
+
+def opcoes_engine(url):
+    """
+    Monta as opções do engine a partir das variáveis de ambiente.
+
+    Args:
+        url (str): URL do banco de dados.
+
+    Returns:
+        dict: Opções para SQLALCHEMY_ENGINE_OPTIONS (poolclass, pool_size, max_overflow, pool_timeout, pool_recycle,
+              pool_pre_ping e connect_args).
+
+    NOTE: SQLite em memória (usado em testes locais) mantém o pool padrão do Flask-SQLAlchemy.
+    """
+    url = make_url(url)
+    opcoes = {
+        'pool_pre_ping': os.getenv('BANCO_POOL_PRE_PING', '1').lower() not in ('0', 'false', 'nao', 'não'),
+        'pool_recycle': int(os.getenv('BANCO_POOL_RECICLAGEM', '1800')),
+    }
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return opcoes
+
+    opcoes.update({
+        'poolclass': PoolMedido,
+        'pool_size': int(os.getenv('BANCO_POOL_TAMANHO', '10')),
+        'max_overflow': int(os.getenv('BANCO_POOL_EXCEDENTE', '10')),
+        'pool_timeout': float(os.getenv('BANCO_POOL_ESPERA', '10')),
+    })
+    tempo_limite = int(os.getenv('BANCO_TEMPO_LIMITE_CONSULTA', '30000'))
+    if url.get_backend_name() == 'postgresql' and tempo_limite > 0:
+        opcoes['connect_args'] = {'options': f"-c statement_timeout={tempo_limite}"}
+    return opcoes
+
+def estatisticas_pool(engine):
+    """
+    Retorna a ocupação e os tempos de espera do pool de conexões de um engine neste processo.
+
+    Args:
+        engine (Engine): Engine do SQLAlchemy.
+
+    Returns:
+        dict: 'tamanho', 'em_uso' (conexões emprestadas), 'disponiveis', 'excedentes' (conexões além do tamanho),
+              'excedente_maximo' e, com PoolMedido, 'obtencoes', 'espera_media_ms', 'espera_maxima_ms' e 'esgotamentos'.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {'tipo': type(pool).__name__, 'descricao': pool.status()}
+
+    estatisticas = {
+        'tamanho': pool.size(),
+        'em_uso': pool.checkedout(),
+        'disponiveis': pool.checkedin(),
+        'excedentes': max(pool.overflow(), 0),
+        'excedente_maximo': pool._max_overflow,
+    }
+    if isinstance(pool, PoolMedido):
+        with pool._trava_medidas:
+            estatisticas.update({
+                'obtencoes': pool.obtencoes,
+                'espera_media_ms': round(pool.espera_total * 1000 / pool.obtencoes, 3) if pool.obtencoes else 0.0,
+                'espera_maxima_ms': round(pool.espera_maxima * 1000, 3),
+                'esgotamentos': pool.esgotamentos,
+            })
+    return estatisticas
@@ -5,24 +5,31 @@ Autor: Rafael dos Santos Giorgi
 Data: 01/10/2025
 
 NOTE: Este módulo inicializa a aplicação Flask com configurações de ambiente e o SQLAlchemy para persistência de dados.
+NOTE: Nenhuma aplicação é criada na importação: configurar_app() é chamada pela fábrica create_app() de main.py, e os
+      modelos dependem apenas da extensão 'db'.
 """
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from app.representacao import ProvedorJSON, dumps_texto
+from app.conexoes import opcoes_engine
+from app.replicas import SessaoRoteada, binds_replicas, init_replicas
+from app.proxy import redes_confiaveis
+from datetime import timedelta
+import orjson
 import os
 
-app = Flask(__name__)
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': SessaoRoteada})
 
-def create_app():
+def configurar_app():
     """
     Cria e configura a aplicação Flask com as variáveis de ambiente e inicializa o SQLAlchemy.
 
-    Configura a conexão com o banco de dados PostgreSQL, define chaves secretas para
-    segurança e desativa modificações de rastreamento para melhor desempenho.
+    Configura a conexão com o banco de dados PostgreSQL (pool de conexões configurável, ver app/conexoes.py), define
+    chaves secretas para segurança e desativa modificações de rastreamento para melhor desempenho.
 
     Returns:
-        Flask: Instância da aplicação Flask configurada.
+        Flask: Nova instância da aplicação Flask configurada.
 
     Raises:
         ValueError: Se variáveis de ambiente obrigatórias não estiverem definidas.
@@ -36,11 +43,63 @@ def create_app():
     if not os.getenv('JWT_SECRET_KEY'):
         raise ValueError("JWT_SECRET_KEY não configurada no ambiente.")
 
+    # Sem reaproveitar SECRET_KEY: trocá-la mudaria a permutação dos números de pedido e repetiria códigos já emitidos.
+    if not os.getenv('NUMERO_PEDIDO_CHAVE'):
+        raise ValueError("NUMERO_PEDIDO_CHAVE não configurada no ambiente.")
+
+    app = Flask(__name__)
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'json_serializer': dumps_texto,
+        'json_deserializer': orjson.loads,
+        **opcoes_engine(app.config['SQLALCHEMY_DATABASE_URI'])
+    }
+    app.config['SQLALCHEMY_BINDS'] = binds_replicas(os.getenv('DATABASE_REPLICA_URLS'))
+    app.config['REPLICA_QUARENTENA'] = float(os.getenv('REPLICA_QUARENTENA', '30'))
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')
+    app.config['NUMERO_PEDIDO_CHAVE'] = os.getenv('NUMERO_PEDIDO_CHAVE')
+    app.config['REFERENCIAS_CACHE_TTL'] = float(os.getenv('REFERENCIAS_CACHE_TTL', '0'))
+    app.config['REFERENCIAS_CACHE_MAX'] = int(os.getenv('REFERENCIAS_CACHE_MAX', '10000'))
+    app.config['IDEMPOTENCIA_TTL'] = int(os.getenv('IDEMPOTENCIA_TTL', '86400'))
+    app.config['FOTO_TAMANHO_MAXIMO'] = int(os.getenv('FOTO_TAMANHO_MAXIMO', str(20 * 1024 * 1024)))
+    app.config['FOTO_UPLOAD_TTL'] = int(os.getenv('FOTO_UPLOAD_TTL', '86400'))
+    app.config['FOTO_PROCESSOS'] = int(os.getenv('FOTO_PROCESSOS', '2'))
+    app.config['FOTO_FILA_MAXIMA'] = int(os.getenv('FOTO_FILA_MAXIMA', '100'))
+    app.config['FOTO_X_ACCEL_PREFIX'] = os.getenv('FOTO_X_ACCEL_PREFIX')
+    app.config['PERFIL_CACHE_TTL'] = float(os.getenv('PERFIL_CACHE_TTL', '30'))
+    app.config['SESSAO_RENOVACAO'] = int(os.getenv('SESSAO_RENOVACAO', '86400'))
+    app.config['RATELIMIT_STORAGE_URI'] = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
+    app.config['RATELIMIT_STRATEGY'] = os.getenv('RATELIMIT_STRATEGY', 'sliding-window-counter')
+    app.config['RATELIMIT_HEADERS_ENABLED'] = True
+    app.config['LIMITE_PADRAO'] = os.getenv('LIMITE_PADRAO', '1000 per hour')
+    app.config['LIMITE_LOGIN'] = os.getenv('LIMITE_LOGIN', '10 per minute')
+    app.config['LIMITE_IOT'] = os.getenv('LIMITE_IOT', '720 per hour')
+    app.config['LIMITE_IOT_IP'] = os.getenv('LIMITE_IOT_IP', '7200 per hour')
+    app.config['PROXIES_CONFIAVEIS'] = redes_confiaveis(os.getenv('PROXIES_CONFIAVEIS'))
+    app.config['JWT_BLOCKLIST'] = os.getenv('JWT_BLOCKLIST', 'banco')
+    app.config['JWT_BLOCKLIST_CACHE_TTL'] = float(os.getenv('JWT_BLOCKLIST_CACHE_TTL', '5'))
+    app.config['JWT_BLOCKLIST_CACHE_MAX'] = int(os.getenv('JWT_BLOCKLIST_CACHE_MAX', '10000'))
+    app.config['COMPRESSAO_MINIMO'] = int(os.getenv('COMPRESSAO_MINIMO', '1024'))
+    app.config['COMPRESSAO_NIVEL_GZIP'] = int(os.getenv('COMPRESSAO_NIVEL_GZIP', '6'))
+    app.config['COMPRESSAO_NIVEL_BROTLI'] = int(os.getenv('COMPRESSAO_NIVEL_BROTLI', '4'))
+    app.config['COMPRESSAO_CACHE_MAX'] = int(os.getenv('COMPRESSAO_CACHE_MAX', str(16 * 1024 * 1024)))
+    app.config['METRICAS_ATIVAS'] = os.getenv('METRICAS_ATIVAS', '1').lower() not in ('0', 'false', 'nao', 'não')
+    app.config['METRICAS_TOKEN'] = os.getenv('METRICAS_TOKEN')
+    app.config['PERFIL_SQL'] = os.getenv('PERFIL_SQL', '0').lower() in ('1', 'true', 'sim')
+    app.config['PERFIL_SQL_LENTA_MS'] = float(os.getenv('PERFIL_SQL_LENTA_MS', '200'))
+    app.config['PERFIL_SQL_REPETICOES'] = int(os.getenv('PERFIL_SQL_REPETICOES', '5'))
+    app.config['PERFIL_SQL_EXPLAIN'] = os.getenv('PERFIL_SQL_EXPLAIN', '0').lower() in ('1', 'true', 'sim')
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
+    # Sem isso, o Flask-RESTful converte os erros do flask_jwt_extended (token ausente, inválido ou revogado) em 500
+    # antes que os handlers do JWTManager respondam 401/422.
+    app.config['PROPAGATE_EXCEPTIONS'] = True
+    app.config['BABEL_DEFAULT_LOCALE'] = 'pt_BR'
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+    app.json = ProvedorJSON(app)
     
     db.init_app(app)
+    init_replicas(app, db)
     
     return app
\ No newline at end of file
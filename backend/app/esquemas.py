@@ -0,0 +1,132 @@
+"""
+Módulo: esquemas.py
+Descrição: Validação dos parâmetros de entrada dos endpoints por esquemas compilados, em substituição ao reqparse.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Cada Resource declara um Esquema uma única vez (atributo de classe). Na criação, os campos são compilados em uma
+      tupla de regras com o conversor e a mensagem já resolvidos; a validação percorre essa tupla uma vez, lendo o
+      corpo JSON apenas uma vez por requisição.
+NOTE: As regras do reqparse são mantidas: campos de corpo são lidos do JSON e, na falta dele, da query string ou do
+      formulário; campos ausentes e não obrigatórios assumem o valor padrão; campos em lista aceitam uma lista JSON ou
+      parâmetros repetidos. Um campo ausente (ou nulo) obrigatório ou um valor rejeitado pelo conversor gera
+      ErroValidacao com a mensagem declarada no campo.
+"""
+
+from flask import request
+from werkzeug.datastructures import ImmutableMultiDict
+
+_VAZIO = ImmutableMultiDict()
+
+class ErroValidacao(ValueError):
+    """
+    Erro de validação de um campo de entrada.
+
+    Args:
+        campo (str): Nome do campo inválido.
+        mensagem (str): Mensagem de erro declarada no campo.
+
+    NOTE: Por ser um ValueError, é tratado pelos blocos 'except ValueError' dos Resources, que respondem 400.
+    """
+
+    def __init__(self, campo, mensagem):
+        super().__init__(mensagem)
+        self.campo = campo
+
+class Campo:
+    """
+    Declaração de um parâmetro de entrada.
+
+    Args:
+        tipo (Callable, optional): Conversor/validador do valor (ex.: str, int, validar_cnh). Padrão: str.
+        obrigatorio (bool, optional): Se o parâmetro deve estar presente e não nulo.
+        mensagem (str, optional): Mensagem de erro para ausência ou valor inválido.
+        padrao (optional): Valor assumido quando o parâmetro não for informado.
+        lista (bool, optional): Se o parâmetro é uma lista (cada item é convertido por 'tipo').
+        origem (str, optional): 'corpo' (JSON, com query string e formulário como alternativa) ou 'query'.
+    """
+    __slots__ = ('tipo', 'obrigatorio', 'mensagem', 'padrao', 'lista', 'origem')
+
+    def __init__(self, tipo=str, obrigatorio=False, mensagem=None, padrao=None, lista=False, origem='corpo'):
+        if origem not in ('corpo', 'query'):
+            raise ValueError("Origem do campo deve ser 'corpo' ou 'query'")
+        self.tipo = tipo
+        self.obrigatorio = obrigatorio
+        self.mensagem = mensagem
+        self.padrao = padrao
+        self.lista = lista
+        self.origem = origem
+
+class Esquema:
+    """
+    Conjunto de parâmetros de entrada de um endpoint, compilado para validação em uma única passagem.
+
+    Args:
+        **campos (Campo): Parâmetros, pelo nome.
+    """
+    __slots__ = ('_regras', '_usa_corpo')
+
+    def __init__(self, **campos):
+        self._regras = tuple(
+            (nome, campo.tipo, campo.obrigatorio, campo.mensagem or f"Parâmetro '{nome}' inválido", campo.padrao,
+             campo.lista, campo.origem == 'corpo')
+            for nome, campo in campos.items()
+        )
+        self._usa_corpo = any(regra[6] for regra in self._regras)
+
+    def validar(self):
+        """
+        Valida os parâmetros da requisição atual.
+
+        Returns:
+            dict: Valores convertidos, com uma chave por campo do esquema.
+
+        Raises:
+            ErroValidacao: No primeiro campo ausente ou inválido, na ordem de declaração.
+        """
+        corpo = request.get_json(silent=True) if self._usa_corpo else None
+        formulario = request.form if self._usa_corpo and request.mimetype != 'application/json' else None
+        return self.validar_dados(corpo, request.args, formulario)
+
+    def validar_dados(self, corpo, query=_VAZIO, formulario=None):
+        """
+        Valida parâmetros já lidos, com as mesmas regras de validar().
+
+        Args:
+            corpo: Corpo JSON interpretado (ignorado se não for um objeto).
+            query (MultiDict, optional): Parâmetros da query string.
+            formulario (MultiDict, optional): Campos do formulário, usados na falta do corpo JSON.
+
+        Returns:
+            dict: Valores convertidos, com uma chave por campo do esquema.
+
+        Raises:
+            ErroValidacao: No primeiro campo ausente ou inválido, na ordem de declaração.
+
+        NOTE: Usado fora do contexto de requisição do Flask (ex.: servidor de ingestão, ver servidor_ingestao.py).
+        """
+        if not isinstance(corpo, dict):
+            corpo = {}
+
+        dados = {}
+        for nome, tipo, obrigatorio, mensagem, padrao, lista, de_corpo in self._regras:
+            if de_corpo and nome in corpo:
+                valor = corpo[nome]
+                if lista and valor is not None and not isinstance(valor, list):
+                    valor = [valor]
+            elif nome in query or (de_corpo and formulario is not None and nome in formulario):
+                origem = query if nome in query else formulario
+                valor = origem.getlist(nome) if lista else origem.get(nome)
+            else:
+                valor = None
+
+            if valor is None or (lista and not valor):
+                if obrigatorio:
+                    raise ErroValidacao(nome, mensagem)
+                dados[nome] = padrao
+                continue
+            try:
+                dados[nome] = [tipo(item) for item in valor] if lista else tipo(valor)
+            except (ValueError, TypeError):
+                raise ErroValidacao(nome, mensagem)
+        return dados
@@ -0,0 +1,97 @@
+"""
+Módulo: eventos.py
+Descrição: Registro do histórico de status de entregas e manutenção incremental dos contadores por motorista e por dia.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: registrar_eventos() é chamado por toda operação que cria entregas ou muda seu status (POST /entregas,
+      importação em lote, PUT /entregas/<id>/status e PUT /entregas/status/lote), na mesma transação da
+      alteração. Cada chamada executa um INSERT em lote em 'entrega_evento' e um único INSERT ... ON CONFLICT
+      DO UPDATE em 'entrega_contador', com as quantidades já agregadas por motorista e status.
+NOTE: Os contadores registram quantas entregas passaram para cada status no dia (pelo relógio do banco), e não
+      quantas estão em cada status no momento. Uma entrega que vai de 'em_rota' para 'pendente' e volta para
+      'em_rota' conta duas vezes em 'em_rota'.
+NOTE: As linhas de contador são gravadas sempre na mesma ordem (motorista, status), evitando deadlocks entre
+      transações concorrentes que atualizam os mesmos contadores.
+"""
+
+from app.db import db
+from app.models.entrega import StatusEntrega
+from app.models.evento import EntregaEvento, ContadorEntrega
+from sqlalchemy.dialects.postgresql import insert
+from collections import Counter
+import uuid
+
+def _como_uuid(valor):
+    """
+    Converte um ID para UUID, aceitando strings e UUIDs.
+
+    Args:
+        valor (str | UUID): ID a converter.
+
+    Returns:
+        UUID: ID convertido.
+    """
+    return valor if isinstance(valor, uuid.UUID) else uuid.UUID(str(valor))
+
+def registrar_eventos(eventos):
+    """
+    Grava eventos de status na sessão atual e incrementa os contadores correspondentes.
+
+    Args:
+        eventos (list): Dicionários com 'entrega_id', 'motorista_id', 'status' (StatusEntrega) e, opcionalmente, 'motivo'.
+
+    NOTE: O commit fica a cargo do chamador, de modo que eventos, contadores e a alteração da entrega
+          sejam gravados ou descartados juntos.
+    """
+    if not eventos:
+        return
+    registros = [{
+        'entrega_id': _como_uuid(evento['entrega_id']),
+        'motorista_id': _como_uuid(evento['motorista_id']),
+        'status': evento['status'],
+        'motivo': evento.get('motivo'),
+    } for evento in eventos]
+    db.session.execute(db.insert(EntregaEvento), registros)
+
+    quantidades = Counter((registro['motorista_id'], registro['status']) for registro in registros)
+    comando = insert(ContadorEntrega).values([
+        {'dia': db.func.current_date(), 'motorista_id': motorista_id, 'status': status, 'quantidade': quantidade}
+        for (motorista_id, status), quantidade in sorted(quantidades.items(), key=lambda item: (item[0][0], item[0][1].value))
+    ])
+    db.session.execute(comando.on_conflict_do_update(
+        index_elements=[ContadorEntrega.dia, ContadorEntrega.motorista_id, ContadorEntrega.status],
+        set_={'quantidade': ContadorEntrega.quantidade + comando.excluded.quantidade}
+    ))
+
+def consultar_estatisticas(dia=None, motorista_id=None):
+    """
+    Lê os contadores de um dia, agrupados por motorista.
+
+    Args:
+        dia (date, optional): Dia consultado. Padrão: dia atual do banco.
+        motorista_id (UUID, optional): Restringe a consulta a um motorista.
+
+    Returns:
+        tuple: (dia, motoristas), onde 'motoristas' lista {'motorista_id', 'total', <status>: quantidade}
+               para cada motorista com eventos no dia, com todos os status presentes (zero quando não houver eventos).
+
+    NOTE: A consulta usa apenas a chave primária de 'entrega_contador' e lê no máximo uma linha por status e motorista,
+          independentemente do número de entregas.
+    """
+    if dia is None:
+        dia = db.session.execute(db.select(db.func.current_date())).scalar_one()
+    consulta = db.select(ContadorEntrega.motorista_id, ContadorEntrega.status, ContadorEntrega.quantidade).where(ContadorEntrega.dia == dia)
+    if motorista_id is not None:
+        consulta = consulta.where(ContadorEntrega.motorista_id == motorista_id)
+
+    motoristas = {}
+    for linha in db.session.execute(consulta):
+        contagem = motoristas.get(linha.motorista_id)
+        if contagem is None:
+            contagem = {"motorista_id": str(linha.motorista_id), "total": 0}
+            contagem.update({status.value: 0 for status in StatusEntrega})
+            motoristas[linha.motorista_id] = contagem
+        contagem[linha.status.value] = linha.quantidade
+        contagem["total"] += linha.quantidade
+    return dia, list(motoristas.values())
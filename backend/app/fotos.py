@@ -0,0 +1,495 @@
+"""
+Módulo: fotos.py
+Descrição: Upload retomável das fotos de prova, armazenamento endereçado por conteúdo e geração das variantes em segundo plano.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: O upload é feito em duas etapas: POST /entregas/<id>/foto abre uma sessão informando tamanho, tipo e SHA-256
+      do arquivo; PATCH /entregas/<id>/foto/<upload_id> envia bytes a partir do deslocamento 'Upload-Offset'. Se a
+      conexão cair, GET /entregas/<id>/foto/<upload_id> informa quantos bytes já foram recebidos e o envio continua
+      de onde parou.
+NOTE: O corpo de cada parte é copiado de request.stream para o disco em blocos de TAMANHO_BLOCO bytes, sem carregar
+      o arquivo na memória. O hash é conferido ao final, relendo o arquivo em blocos.
+NOTE: Sessões e partes ficam em UPLOAD_FOLDER/parciais (metadados em .json e dados em .part), de modo que qualquer
+      processo com acesso à pasta pode continuar um upload. Sessões sem atividade por FOTO_UPLOAD_TTL segundos são
+      descartadas quando uma nova sessão é aberta.
+NOTE: Fotos concluídas ficam em UPLOAD_FOLDER/fotos/<h[0:2]>/<h[2:4]>/<hash>.<ext>, onde <hash> é o SHA-256 do conteúdo;
+      uploads idênticos são gravados uma única vez. As variantes (app/miniaturas.py) ficam ao lado da original e são
+      geradas por um pool de FOTO_PROCESSOS processos, com no máximo FOTO_FILA_MAXIMA tarefas pendentes por processo
+      da aplicação. Tarefas recusadas por fila cheia ou perdidas em reinícios são refeitas por 'flask processar-fotos'.
+NOTE: Os processos do pool são criados pelo método 'forkserver', e não por fork do worker: um worker gthread tem
+      outras threads em execução, e um fork dele herdaria travas ocupadas e os sockets do pool de conexões do banco.
+"""
+
+from app.miniaturas import VARIANTES, caminho_variante, gerar_variantes
+from flask import current_app
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import fcntl
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import uuid
+
+TAMANHO_BLOCO = 64 * 1024
+TIPOS_FOTO = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+}
+PADRAO_IDENTIFICADOR = re.compile(r'(?P<hash>[0-9a-f]{64})(?:-(?P<variante>%s))?' % '|'.join(VARIANTES))
+PADRAO_FOTO_PROVA = re.compile(r'fotos/[0-9a-f]{2}/[0-9a-f]{2}/(?P<hash>[0-9a-f]{64})\.\w+')
+
+_pool = None
+_pid_pool = None
+_pendentes = 0
+_recusadas = 0
+_falhas = 0
+_trava = threading.Lock()
+
+class ConflitoUpload(Exception):
+    """
+    Indica que a parte enviada não começa no deslocamento esperado pelo servidor.
+
+    Attributes:
+        recebido (int): Quantidade de bytes já recebidos, a partir da qual o envio deve continuar.
+    """
+
+    def __init__(self, mensagem, recebido):
+        super().__init__(mensagem)
+        self.recebido = recebido
+
+def _assinatura_confere(tipo, inicio):
+    """
+    Confere os primeiros bytes do arquivo com a assinatura do tipo declarado.
+
+    Args:
+        tipo (str): Tipo MIME declarado.
+        inicio (bytes): Primeiros bytes do arquivo.
+
+    Returns:
+        bool: True se o conteúdo corresponde ao tipo.
+    """
+    if tipo == 'image/jpeg':
+        return inicio.startswith(b'\xff\xd8\xff')
+    if tipo == 'image/png':
+        return inicio.startswith(b'\x89PNG\r\n\x1a\n')
+    if tipo == 'image/webp':
+        return inicio[:4] == b'RIFF' and inicio[8:12] == b'WEBP'
+    return False
+
+def _pasta_parciais():
+    """
+    Retorna (criando se preciso) a pasta dos uploads em andamento.
+
+    Returns:
+        str: Caminho absoluto da pasta.
+    """
+    pasta = os.path.join(current_app.config['UPLOAD_FOLDER'], 'parciais')
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+def _caminhos(upload_id):
+    """
+    Retorna os caminhos dos metadados e dos dados de um upload.
+
+    Args:
+        upload_id (str): ID do upload.
+
+    Returns:
+        tuple: (caminho do .json, caminho do .part).
+
+    Raises:
+        LookupError: Se o ID não tiver o formato esperado (evita acesso a caminhos arbitrários).
+    """
+    try:
+        upload_id = uuid.UUID(upload_id).hex
+    except (TypeError, ValueError):
+        raise LookupError("Upload não encontrado.")
+    base = os.path.join(_pasta_parciais(), upload_id)
+    return base + '.json', base + '.part'
+
+def _carregar_sessao(upload_id, entrega_id):
+    """
+    Carrega os metadados de um upload em andamento.
+
+    Args:
+        upload_id (str): ID do upload.
+        entrega_id (UUID): ID da entrega informado na URL.
+
+    Returns:
+        dict: Metadados do upload.
+
+    Raises:
+        LookupError: Se o upload não existir ou pertencer a outra entrega.
+    """
+    caminho_sessao, _ = _caminhos(upload_id)
+    try:
+        with open(caminho_sessao, encoding='utf-8') as arquivo:
+            sessao = json.load(arquivo)
+    except FileNotFoundError:
+        raise LookupError("Upload não encontrado.")
+    if sessao['entrega_id'] != str(entrega_id):
+        raise LookupError("Upload não encontrado.")
+    return sessao
+
+def _remover_sessao(upload_id):
+    """
+    Remove os arquivos de um upload.
+
+    Args:
+        upload_id (str): ID do upload.
+    """
+    for caminho in _caminhos(upload_id):
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+
+def _remover_expiradas():
+    """
+    Remove uploads sem atividade há mais de FOTO_UPLOAD_TTL segundos.
+    """
+    limite = time.time() - current_app.config.get('FOTO_UPLOAD_TTL', 86400)
+    with os.scandir(_pasta_parciais()) as entradas:
+        for entrada in entradas:
+            try:
+                if entrada.stat().st_mtime < limite:
+                    os.remove(entrada.path)
+            except FileNotFoundError:
+                pass
+
+def _recebido(caminho_parte):
+    """
+    Retorna quantos bytes de um upload já estão gravados.
+
+    Args:
+        caminho_parte (str): Caminho do .part.
+
+    Returns:
+        int: Tamanho atual do arquivo parcial.
+    """
+    try:
+        return os.path.getsize(caminho_parte)
+    except FileNotFoundError:
+        return 0
+
+def iniciar_upload(entrega_id, tamanho, sha256, tipo):
+    """
+    Abre uma sessão de upload de foto de prova.
+
+    Args:
+        entrega_id (UUID): ID da entrega (existência já verificada pelo chamador).
+        tamanho (int): Tamanho total do arquivo, em bytes.
+        sha256 (str): Hash SHA-256 do arquivo, em hexadecimal.
+        tipo (str): Tipo MIME da imagem (image/jpeg, image/png ou image/webp).
+
+    Returns:
+        dict: Estado do upload ('upload_id', 'recebido', 'tamanho', 'concluido').
+
+    Raises:
+        ValueError: Se tamanho, hash ou tipo forem inválidos.
+    """
+    limite = current_app.config.get('FOTO_TAMANHO_MAXIMO', 20 * 1024 * 1024)
+    if not isinstance(tamanho, int) or not 0 < tamanho <= limite:
+        raise ValueError(f"O tamanho da foto deve estar entre 1 e {limite} bytes.")
+    if not isinstance(sha256, str) or not re.fullmatch(r'[0-9a-fA-F]{64}', sha256):
+        raise ValueError("O hash SHA-256 deve ter 64 caracteres hexadecimais.")
+    if tipo not in TIPOS_FOTO:
+        raise ValueError(f"Tipo de foto inválido. Valores permitidos: {', '.join(TIPOS_FOTO)}.")
+
+    _remover_expiradas()
+    upload_id = uuid.uuid4().hex
+    caminho_sessao, caminho_parte = _caminhos(upload_id)
+    open(caminho_parte, 'wb').close()
+    with open(caminho_sessao, 'w', encoding='utf-8') as arquivo:
+        json.dump({'entrega_id': str(entrega_id), 'tamanho': tamanho, 'sha256': sha256.lower(), 'tipo': tipo}, arquivo)
+    return {'upload_id': upload_id, 'recebido': 0, 'tamanho': tamanho, 'concluido': False}
+
+def estado_upload(upload_id, entrega_id):
+    """
+    Informa quantos bytes de um upload já foram recebidos.
+
+    Args:
+        upload_id (str): ID do upload.
+        entrega_id (UUID): ID da entrega.
+
+    Returns:
+        dict: Estado do upload ('upload_id', 'recebido', 'tamanho', 'concluido').
+
+    Raises:
+        LookupError: Se o upload não existir.
+    """
+    sessao = _carregar_sessao(upload_id, entrega_id)
+    _, caminho_parte = _caminhos(upload_id)
+    return {'upload_id': upload_id, 'recebido': _recebido(caminho_parte), 'tamanho': sessao['tamanho'], 'concluido': False}
+
+def receber_parte(upload_id, entrega_id, deslocamento, fluxo):
+    """
+    Grava uma parte do upload a partir do deslocamento informado, copiando o fluxo em blocos.
+
+    Args:
+        upload_id (str): ID do upload.
+        entrega_id (UUID): ID da entrega.
+        deslocamento (int): Posição do primeiro byte da parte (deve ser igual aos bytes já recebidos).
+        fluxo: Objeto com read(n), normalmente request.stream.
+
+    Returns:
+        tuple: (estado, foto), onde 'estado' é o dicionário de estado do upload e 'foto' é uma tupla (caminho, sha256,
+               extensao) do arquivo completo e verificado, ou None se ainda faltarem bytes.
+
+    Raises:
+        LookupError: Se o upload não existir.
+        ConflitoUpload: Se o deslocamento não corresponder aos bytes já recebidos ou outra parte do mesmo upload
+            estiver sendo gravada.
+        ValueError: Se a parte ultrapassar o tamanho declarado ou o arquivo completo não conferir com o hash ou o tipo.
+
+    NOTE: Ao concluir, o arquivo verificado continua em UPLOAD_FOLDER/parciais, nomeado pelo ID do upload, e a sessão
+          é encerrada; cabe ao chamador movê-lo para o local definitivo com guardar_foto(). O nome não usa o hash:
+          dois uploads do mesmo conteúdo concluídos ao mesmo tempo gravariam no mesmo arquivo.
+    NOTE: A conferência do deslocamento, a gravação e a conclusão são feitas com uma trava exclusiva (flock) no .part,
+          válida entre processos. Duas partes com o mesmo deslocamento não se intercalam: a que não obtém a trava
+          recebe ConflitoUpload na hora, sem esperar a outra terminar.
+    """
+    sessao = _carregar_sessao(upload_id, entrega_id)
+    caminho_sessao, caminho_parte = _caminhos(upload_id)
+    try:
+        arquivo = open(caminho_parte, 'r+b')
+    except FileNotFoundError:
+        raise LookupError("Upload não encontrado.")
+
+    with arquivo:
+        try:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise ConflitoUpload("Outra parte deste upload está sendo recebida. Consulte o deslocamento e tente novamente.", _recebido(caminho_parte))
+        if not os.path.exists(caminho_sessao):
+            raise LookupError("Upload não encontrado.")
+        os.utime(caminho_sessao)
+        recebido = os.fstat(arquivo.fileno()).st_size
+        if deslocamento != recebido:
+            raise ConflitoUpload(f"Deslocamento inválido: o servidor já recebeu {recebido} bytes.", recebido)
+
+        arquivo.seek(deslocamento)
+        while True:
+            bloco = fluxo.read(TAMANHO_BLOCO)
+            if not bloco:
+                break
+            if arquivo.tell() + len(bloco) > sessao['tamanho']:
+                arquivo.truncate(deslocamento)
+                raise ValueError(f"A parte ultrapassa o tamanho declarado de {sessao['tamanho']} bytes.")
+            arquivo.write(bloco)
+        recebido = arquivo.tell()
+
+        estado = {'upload_id': upload_id, 'recebido': recebido, 'tamanho': sessao['tamanho'], 'concluido': recebido == sessao['tamanho']}
+        if not estado['concluido']:
+            return estado, None
+
+        arquivo.flush()
+        arquivo.seek(0)
+        resumo = hashlib.sha256()
+        inicio = arquivo.read(TAMANHO_BLOCO)
+        bloco = inicio
+        while bloco:
+            resumo.update(bloco)
+            bloco = arquivo.read(TAMANHO_BLOCO)
+        if resumo.hexdigest() != sessao['sha256']:
+            _remover_sessao(upload_id)
+            raise ValueError("O hash SHA-256 do arquivo recebido não confere. Reinicie o upload.")
+        if not _assinatura_confere(sessao['tipo'], inicio):
+            _remover_sessao(upload_id)
+            raise ValueError(f"O conteúdo do arquivo não corresponde ao tipo {sessao['tipo']}.")
+
+        extensao = TIPOS_FOTO[sessao['tipo']]
+        concluido = os.path.join(_pasta_parciais(), uuid.UUID(upload_id).hex + extensao)
+        os.replace(caminho_parte, concluido)
+        os.remove(caminho_sessao)
+    return estado, (concluido, sessao['sha256'], extensao)
+
+def _relativo_foto(sha256, extensao):
+    """
+    Monta o caminho endereçado por conteúdo de uma foto, relativo a UPLOAD_FOLDER.
+
+    Args:
+        sha256 (str): Hash SHA-256 da foto.
+        extensao (str): Extensão do arquivo (ex.: '.jpg').
+
+    Returns:
+        str: Caminho no formato fotos/<h[0:2]>/<h[2:4]>/<hash><extensao>.
+    """
+    return f"fotos/{sha256[:2]}/{sha256[2:4]}/{sha256}{extensao}"
+
+def guardar_foto(caminho, sha256, extensao):
+    """
+    Move uma foto concluída para o armazenamento endereçado por conteúdo em UPLOAD_FOLDER.
+
+    Args:
+        caminho (str): Caminho da foto verificada, devolvido por receber_parte().
+        sha256 (str): Hash SHA-256 da foto.
+        extensao (str): Extensão do arquivo (ex.: '.jpg').
+
+    Returns:
+        str: Caminho da foto relativo a UPLOAD_FOLDER, gravado em Entrega.foto_prova.
+
+    NOTE: Fotos idênticas têm o mesmo hash e, portanto, o mesmo caminho: se o arquivo já existir, o novo é descartado
+          e as entregas passam a compartilhar a foto e suas variantes.
+    """
+    relativo = _relativo_foto(sha256, extensao)
+    destino = os.path.join(current_app.config['UPLOAD_FOLDER'], relativo)
+    if os.path.exists(destino):
+        os.remove(caminho)
+    else:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.replace(caminho, destino)
+    return relativo
+
+def resolver_foto(identificador):
+    """
+    Localiza no disco a foto ou variante correspondente a um identificador público.
+
+    Args:
+        identificador (str): '<hash>' para a original ou '<hash>-<variante>' para uma variante.
+
+    Returns:
+        str: Caminho absoluto do arquivo, ou None se o identificador for inválido ou o arquivo não existir.
+    """
+    correspondencia = PADRAO_IDENTIFICADOR.fullmatch(identificador or '')
+    if not correspondencia:
+        return None
+    sha256, variante = correspondencia.group('hash'), correspondencia.group('variante')
+    pasta = os.path.join(current_app.config['UPLOAD_FOLDER'], 'fotos', sha256[:2], sha256[2:4])
+    if variante:
+        caminho = caminho_variante(os.path.join(pasta, sha256), variante)
+        return caminho if os.path.exists(caminho) else None
+    for extensao in TIPOS_FOTO.values():
+        caminho = os.path.join(pasta, sha256 + extensao)
+        if os.path.exists(caminho):
+            return caminho
+    return None
+
+def urls_foto(foto_prova):
+    """
+    Monta as URLs públicas da foto de prova e de suas variantes.
+
+    Args:
+        foto_prova (str): Valor de Entrega.foto_prova.
+
+    Returns:
+        dict: URLs ('original' e uma por variante), ou None se a foto não estiver no armazenamento endereçado por conteúdo.
+
+    NOTE: As variantes são geradas em segundo plano; até ficarem prontas, suas URLs respondem 404.
+    """
+    correspondencia = PADRAO_FOTO_PROVA.fullmatch(foto_prova or '')
+    if not correspondencia:
+        return None
+    sha256 = correspondencia.group('hash')
+    urls = {'original': f"/fotos/{sha256}"}
+    urls.update({variante: f"/fotos/{sha256}-{variante}" for variante in VARIANTES})
+    return urls
+
+def _obter_pool():
+    """
+    Retorna o pool de processos de fotos do processo atual, criando-o na primeira chamada.
+
+    Returns:
+        ProcessPoolExecutor: Pool com FOTO_PROCESSOS processos.
+
+    NOTE: O PID é conferido para que um processo criado por fork (ex.: workers do servidor) crie seu próprio pool
+          em vez de usar o herdado.
+    NOTE: Os processos partem do servidor de fork do multiprocessing, que importa apenas app/miniaturas.py; eles não
+          herdam a aplicação, as threads nem as conexões do processo que agenda as tarefas.
+    """
+    global _pool, _pid_pool
+    if _pool is None or _pid_pool != os.getpid():
+        contexto = multiprocessing.get_context('forkserver')
+        contexto.set_forkserver_preload(['app.miniaturas'])
+        _pool = ProcessPoolExecutor(max_workers=current_app.config.get('FOTO_PROCESSOS', 2), mp_context=contexto)
+        _pid_pool = os.getpid()
+    return _pool
+
+def _ao_concluir(futuro):
+    """
+    Atualiza os contadores do processamento quando uma tarefa termina.
+
+    Args:
+        futuro (Future): Tarefa concluída.
+    """
+    global _pendentes, _falhas
+    with _trava:
+        _pendentes -= 1
+        if futuro.cancelled() or futuro.exception() is not None:
+            _falhas += 1
+
+def agendar_variantes(foto_prova):
+    """
+    Agenda a geração das variantes de uma foto no pool de processos, sem bloquear a requisição.
+
+    Args:
+        foto_prova (str): Caminho da foto relativo a UPLOAD_FOLDER, devolvido por guardar_foto().
+
+    Returns:
+        bool: True se a tarefa foi agendada; False se a fila estiver cheia (a foto fica sem variantes até
+              'flask processar-fotos' ser executado).
+
+    Raises:
+        BrokenProcessPool: Se um processo do pool terminou abruptamente; o pool é recriado no próximo agendamento.
+        Exception: Outros erros ao enviar a tarefa ao pool.
+    """
+    global _pool, _pendentes, _recusadas, _falhas
+    limite = current_app.config.get('FOTO_FILA_MAXIMA', 100)
+    with _trava:
+        if _pendentes >= limite:
+            _recusadas += 1
+            return False
+        _pendentes += 1
+    original = os.path.join(current_app.config['UPLOAD_FOLDER'], foto_prova)
+    try:
+        futuro = _obter_pool().submit(gerar_variantes, original)
+    except Exception as e:
+        with _trava:
+            _pendentes -= 1
+            _falhas += 1
+        if isinstance(e, BrokenProcessPool):
+            _pool = None
+        raise
+    futuro.add_done_callback(_ao_concluir)
+    return True
+
+def estado_processamento():
+    """
+    Retorna os indicadores do processamento de fotos deste processo.
+
+    Returns:
+        dict: 'pendentes' (tarefas na fila ou em execução), 'limite_fila', 'processos', 'recusadas' (fila cheia)
+              e 'falhas' (tarefas que terminaram com erro).
+    """
+    with _trava:
+        return {
+            'pendentes': _pendentes,
+            'limite_fila': current_app.config.get('FOTO_FILA_MAXIMA', 100),
+            'processos': current_app.config.get('FOTO_PROCESSOS', 2),
+            'recusadas': _recusadas,
+            'falhas': _falhas,
+        }
+
+def fotos_sem_variantes():
+    """
+    Lista as fotos do armazenamento endereçado por conteúdo que ainda não têm todas as variantes.
+
+    Returns:
+        list: Caminhos absolutos das fotos originais.
+    """
+    raiz = os.path.join(current_app.config['UPLOAD_FOLDER'], 'fotos')
+    pendentes = []
+    for pasta, _, arquivos in os.walk(raiz):
+        for nome in arquivos:
+            base, extensao = os.path.splitext(nome)
+            if extensao in TIPOS_FOTO.values() and re.fullmatch(r'[0-9a-f]{64}', base):
+                original = os.path.join(pasta, nome)
+                if any(not os.path.exists(caminho_variante(original, variante)) for variante in VARIANTES):
+                    pendentes.append(original)
+    return pendentes
@@ -0,0 +1,151 @@
+"""
+Módulo: importacao.py
+Descrição: Importação de entregas em lote, compartilhada pelo endpoint /entregas/lote e pelo comando CLI 'importar-entregas'.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: As linhas são validadas em memória, a existência dos motoristas é verificada com uma única consulta,
+      os números de pedido são reservados em bloco e todas as entregas válidas são inseridas com um único
+      INSERT em lote. O commit fica a cargo do chamador, que deve executar todo o processo dentro de uma
+      única transação. As entregas criadas também são registradas no histórico de eventos (app/eventos.py).
+"""
+
+from app.db import db
+from app.models.usuarios import Usuario
+from app.models.entrega import Entrega, StatusEntrega
+from app.validadores import validar_endereco, validar_max_length
+from app.numero_pedido import obter_alocador
+from app.referencias import verificar_existentes
+from app.eventos import registrar_eventos
+import csv
+import json
+import os
+import uuid
+
+LIMITE_LINHAS_LOTE = 5000
+CAMPOS_OPCIONAIS = ('observacao', 'foto_prova', 'motivo')
+
+def validar_linha_entrega(linha):
+    """
+    Valida uma linha de importação de entrega, aplicando as mesmas regras de POST /entregas.
+
+    Args:
+        linha (dict): Dados brutos da entrega (motorista_id, endereco_entrega, nome_cliente e opcionais).
+
+    Returns:
+        dict: Dados normalizados, com motorista_id convertido para UUID e campos vazios como None.
+
+    Raises:
+        ValueError: Se algum campo for inválido ou obrigatório estiver ausente.
+    """
+    if not isinstance(linha, dict):
+        raise ValueError("Cada linha deve ser um objeto com os campos da entrega")
+    dados = {campo: (valor.strip() if isinstance(valor, str) else valor) or None for campo, valor in linha.items()}
+
+    if not dados.get('motorista_id'):
+        raise ValueError("ID do motorista é obrigatório")
+    try:
+        motorista_id = uuid.UUID(str(dados['motorista_id']))
+    except ValueError:
+        raise ValueError("ID do motorista deve ser um UUID válido")
+    if not dados.get('nome_cliente'):
+        raise ValueError("Nome do cliente é obrigatório")
+
+    validados = {
+        'motorista_id': motorista_id,
+        'endereco_entrega': validar_endereco(dados.get('endereco_entrega')),
+        'nome_cliente': validar_max_length(255)(dados['nome_cliente']),
+    }
+    for campo in CAMPOS_OPCIONAIS:
+        validados[campo] = validar_max_length(255)(dados.get(campo))
+    return validados
+
+def importar_entregas(linhas, parcial=False):
+    """
+    Valida e insere um lote de entregas na sessão atual.
+
+    Args:
+        linhas (list): Lista de dicionários com os dados das entregas.
+        parcial (bool): Se verdadeiro, insere as linhas válidas mesmo que outras tenham erros.
+
+    Returns:
+        tuple: (criadas, erros), onde 'criadas' lista {'linha', 'id', 'numero_pedido'} de cada entrega inserida
+               e 'erros' lista {'linha', 'error'} das linhas rejeitadas. Linhas são numeradas a partir de 1.
+
+    Raises:
+        RuntimeError: Se a reserva de números de pedido falhar.
+
+    NOTE: Sem 'parcial', qualquer erro impede a inserção de todo o lote (criadas fica vazia).
+    """
+    validas = []
+    erros = []
+    for indice, linha in enumerate(linhas, start=1):
+        try:
+            validas.append((indice, validar_linha_entrega(linha)))
+        except ValueError as e:
+            erros.append({"linha": indice, "error": str(e)})
+
+    existentes = verificar_existentes(Usuario, {dados['motorista_id'] for _, dados in validas})
+    aceitas = []
+    for indice, dados in validas:
+        if dados['motorista_id'] in existentes:
+            aceitas.append((indice, dados))
+        else:
+            erros.append({"linha": indice, "error": "Motorista não encontrado com o ID fornecido."})
+    erros.sort(key=lambda erro: erro['linha'])
+
+    if (erros and not parcial) or not aceitas:
+        return [], erros
+
+    numeros = obter_alocador().reservar(len(aceitas))
+    registros = []
+    criadas = []
+    for (indice, dados), numero in zip(aceitas, numeros):
+        registro = dict(dados, id=uuid.uuid4(), numero_pedido=numero, status=StatusEntrega.PENDENTE)
+        registros.append(registro)
+        criadas.append({"linha": indice, "id": str(registro['id']), "numero_pedido": numero})
+    db.session.execute(db.insert(Entrega), registros)
+    registrar_eventos([
+        {'entrega_id': registro['id'], 'motorista_id': registro['motorista_id'], 'status': StatusEntrega.PENDENTE}
+        for registro in registros
+    ])
+    return criadas, erros
+
+def ler_arquivo_entregas(caminho):
+    """
+    Lê um arquivo de importação de entregas em formato CSV ou JSON.
+
+    Args:
+        caminho (str): Caminho do arquivo (.csv ou .json).
+
+    Returns:
+        list: Lista de dicionários, um por entrega.
+
+    Raises:
+        ValueError: Se a extensão não for suportada ou o conteúdo for inválido.
+
+    NOTE: CSVs com separador ',' ou ';' são aceitos (o separador é detectado automaticamente).
+          O JSON pode ser uma lista de entregas ou um objeto com a chave 'entregas'.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.csv':
+        with open(caminho, newline='', encoding='utf-8-sig') as arquivo:
+            amostra = arquivo.read(4096)
+            arquivo.seek(0)
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=',;')
+            except csv.Error:
+                dialeto = csv.excel
+            return list(csv.DictReader(arquivo, dialect=dialeto))
+    if extensao == '.json':
+        with open(caminho, encoding='utf-8-sig') as arquivo:
+            try:
+                conteudo = json.load(arquivo)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON inválido: {str(e)}")
+        if isinstance(conteudo, dict):
+            conteudo = conteudo.get('entregas')
+        if not isinstance(conteudo, list):
+            raise ValueError("O JSON deve conter uma lista de entregas")
+        return conteudo
+    raise ValueError("Formato de arquivo não suportado. Use .csv ou .json")
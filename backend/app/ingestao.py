@@ -0,0 +1,175 @@
+"""
+Módulo: ingestao.py
+Descrição: Regras e gravação em lote das localizações enviadas por dispositivos IoT, compartilhadas entre a rota
+           POST /localizacoes/iot da API e o servidor assíncrono de ingestão (servidor_ingestao.py).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: O servidor de ingestão não cria a aplicação Flask: usa o esquema de validação e a tabela do modelo Localizacao
+      definidos aqui e em app/models/localizacao.py, para que as duas entradas aceitem e gravem os mesmos dados.
+NOTE: GravadorLotes agrupa as localizações recebidas em um único INSERT de várias linhas por transação. Cada
+      requisição aguarda a gravação do lote em que entrou, de modo que a resposta 201 continua significando que a
+      localização foi gravada.
+"""
+
+from app.esquemas import Esquema, Campo
+from app.validadores import validar_range
+from app.models.entrega import Entrega  # noqa: F401 (registra o mapeamento referenciado por Localizacao)
+from app.models.localizacao import Localizacao
+from app.leitura import COLUNAS_LOCALIZACAO, LocalizacaoLeitura
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+ESQUEMA_LOCALIZACAO_IOT = Esquema(
+    latitude=Campo(tipo=validar_range(-90, 90), obrigatorio=True, mensagem='Latitude é obrigatória'),
+    longitude=Campo(tipo=validar_range(-180, 180), obrigatorio=True, mensagem='Longitude é obrigatória')
+)
+
+MENSAGEM_RECEBIDA = "Localização recebida com sucesso."
+
+def url_assincrona(url):
+    """
+    Converte a URL do banco de dados da API para o driver assíncrono (asyncpg).
+
+    Args:
+        url (str): URL do banco (ex.: DATABASE_URL).
+
+    Returns:
+        str: URL com o driver 'postgresql+asyncpg'; URLs de outros bancos ou já assíncronas são mantidas.
+    """
+    url = make_url(url)
+    if url.drivername in ('postgres', 'postgresql', 'postgresql+psycopg2'):
+        url = url.set(drivername='postgresql+asyncpg')
+    return url.render_as_string(hide_password=False)
+
+class FilaCheia(Exception):
+    """
+    Exceção levantada quando a fila de gravação atingiu o limite e a localização não pode ser aceita.
+    """
+    pass
+
+class GravadorLotes:
+    """
+    Grava localizações em lotes com um engine assíncrono do SQLAlchemy.
+
+    Args:
+        engine (AsyncEngine): Engine assíncrono.
+        gravadores (int, optional): Lotes gravados simultaneamente (cada um usa uma conexão do pool).
+        lote_maximo (int, optional): Localizações por INSERT.
+        espera (float, optional): Segundos que um lote incompleto aguarda novas localizações antes de ser gravado.
+        fila_maxima (int, optional): Localizações aguardando gravação; acima disso, gravar() levanta FilaCheia.
+
+    NOTE: Enquanto um lote é gravado, as localizações seguintes se acumulam na fila e formam o próximo lote; 'espera'
+          só atrasa a gravação quando o volume é baixo.
+    """
+
+    def __init__(self, engine, gravadores=4, lote_maximo=500, espera=0.02, fila_maxima=10000):
+        self._engine = engine
+        self._gravadores = gravadores
+        self._lote_maximo = lote_maximo
+        self._espera = espera
+        self._fila = asyncio.Queue(maxsize=fila_maxima)
+        self._tarefas = []
+        self._insercao = insert(Localizacao.__table__).returning(*COLUNAS_LOCALIZACAO, sort_by_parameter_order=True)
+
+    def iniciar(self):
+        """
+        Inicia as tarefas de gravação no loop de eventos atual.
+        """
+        self._tarefas = [asyncio.create_task(self._executar()) for _ in range(self._gravadores)]
+
+    async def fechar(self):
+        """
+        Grava as localizações pendentes, encerra as tarefas de gravação e fecha o pool de conexões.
+        """
+        await self._fila.join()
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        await self._engine.dispose()
+
+    @property
+    def pendentes(self):
+        """
+        int: Localizações aguardando gravação.
+        """
+        return self._fila.qsize()
+
+    async def gravar(self, valores):
+        """
+        Grava uma localização, aguardando a gravação do lote em que ela entrar.
+
+        Args:
+            valores (dict): Colunas da localização (ex.: latitude e longitude).
+
+        Returns:
+            dict: Representação JSON da localização gravada (Localizacao.json()).
+
+        Raises:
+            FilaCheia: Se a fila de gravação estiver cheia.
+            Exception: Erro do banco de dados ao gravar a localização.
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self._fila.put_nowait((valores, futuro))
+        except asyncio.QueueFull:
+            raise FilaCheia("Fila de gravação cheia.")
+        return await futuro
+
+    def _retirar(self, lote):
+        """
+        Move para o lote as localizações já disponíveis na fila, até o tamanho máximo.
+
+        Args:
+            lote (list): Lote em formação.
+        """
+        while len(lote) < self._lote_maximo:
+            try:
+                lote.append(self._fila.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _executar(self):
+        """
+        Forma e grava lotes continuamente.
+        """
+        while True:
+            lote = [await self._fila.get()]
+            self._retirar(lote)
+            if len(lote) < self._lote_maximo and self._espera > 0:
+                await asyncio.sleep(self._espera)
+                self._retirar(lote)
+            try:
+                await self._gravar_lote(lote)
+            finally:
+                for _ in lote:
+                    self._fila.task_done()
+
+    async def _gravar_lote(self, lote):
+        """
+        Grava um lote em uma transação e entrega a cada requisição a sua localização ou o erro.
+
+        Args:
+            lote (list): Pares (valores, futuro).
+
+        NOTE: Se o lote falhar, as localizações são gravadas uma a uma, para que apenas as inválidas recebam o erro.
+        """
+        try:
+            async with self._engine.begin() as conexao:
+                linhas = (await conexao.execute(self._insercao, [valores for valores, _ in lote])).all()
+        except Exception as e:
+            if len(lote) > 1:
+                for item in lote:
+                    await self._gravar_lote([item])
+                return
+            logger.warning("Falha ao gravar localização: %s", e)
+            if not lote[0][1].done():
+                lote[0][1].set_exception(e)
+            return
+        for (_, futuro), linha in zip(lote, linhas):
+            if not futuro.done():
+                futuro.set_result(LocalizacaoLeitura(linha).json())
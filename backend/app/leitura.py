@@ -0,0 +1,118 @@
+"""
+Módulo: leitura.py
+Descrição: Consultas somente leitura de entregas e localizações por colunas, sem instanciar os modelos do ORM.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: As rotas GET apenas serializam os registros lidos. Carregá-los como Entrega/Localizacao inclui cada objeto no
+      identity map da sessão, com estado de instrumentação e relacionamentos preparados para alterações que nunca
+      ocorrem. Aqui as consultas selecionam as colunas das tabelas e cada linha é copiada para um objeto com
+      __slots__, sem vínculo com a sessão.
+NOTE: Os objetos de leitura têm os mesmos atributos das colunas e reutilizam o json() dos modelos, de modo que as
+      respostas são idênticas às obtidas com os objetos do ORM. Rotas que alteram registros continuam usando o ORM.
+"""
+
+from app.db import db
+from app.models.entrega import Entrega
+from app.models.localizacao import Localizacao
+
+class EntregaLeitura:
+    """
+    Entrega lida por colunas, somente leitura.
+
+    Args:
+        linha (Row): Linha com as colunas de COLUNAS_ENTREGA, na mesma ordem de __slots__.
+    """
+    __slots__ = ('id', 'motorista_id', 'endereco_entrega', 'numero_pedido', 'status', 'nome_cliente', 'nome_recebido',
+                 'observacao', 'foto_prova', 'motivo', 'versao', 'criado_em', 'atualizado_em')
+
+    def __init__(self, linha):
+        (self.id, self.motorista_id, self.endereco_entrega, self.numero_pedido, self.status, self.nome_cliente,
+         self.nome_recebido, self.observacao, self.foto_prova, self.motivo, self.versao, self.criado_em,
+         self.atualizado_em) = linha
+
+    # Entrega.json() apenas lê os atributos das colunas.
+    json = Entrega.json
+
+class LocalizacaoLeitura:
+    """
+    Localização lida por colunas, somente leitura.
+
+    Args:
+        linha (Row): Linha com as colunas de COLUNAS_LOCALIZACAO, na mesma ordem de __slots__.
+    """
+    __slots__ = ('id', 'entrega_id', 'motorista_id', 'latitude', 'longitude', 'data_hora', 'criado_em', 'atualizado_em')
+
+    def __init__(self, linha):
+        (self.id, self.entrega_id, self.motorista_id, self.latitude, self.longitude, self.data_hora, self.criado_em,
+         self.atualizado_em) = linha
+
+    # Localizacao.json() apenas lê os atributos das colunas.
+    json = Localizacao.json
+
+COLUNAS_ENTREGA = tuple(Entrega.__table__.c[nome] for nome in EntregaLeitura.__slots__)
+COLUNAS_LOCALIZACAO = tuple(Localizacao.__table__.c[nome] for nome in LocalizacaoLeitura.__slots__)
+
+def _consulta(colunas, filtros):
+    """
+    Monta a consulta das colunas de uma tabela com filtros de igualdade.
+
+    Args:
+        colunas (tuple): Colunas selecionadas (COLUNAS_ENTREGA ou COLUNAS_LOCALIZACAO).
+        filtros (dict): Valores exigidos, pelo nome da coluna.
+
+    Returns:
+        Select: Consulta das colunas.
+    """
+    tabela = colunas[0].table
+    return db.select(*colunas).where(*(tabela.c[nome] == valor for nome, valor in filtros.items()))
+
+def listar_entregas(**filtros):
+    """
+    Lista as entregas que atendem aos filtros.
+
+    Args:
+        **filtros: Valores exigidos, pelo nome da coluna (ex.: motorista_id=...). Sem filtros, lista todas.
+
+    Returns:
+        list: Objetos EntregaLeitura.
+    """
+    return [EntregaLeitura(linha) for linha in db.session.execute(_consulta(COLUNAS_ENTREGA, filtros))]
+
+def obter_entrega(**filtros):
+    """
+    Recupera uma entrega pelos filtros informados (ex.: id=... ou numero_pedido=...).
+
+    Args:
+        **filtros: Valores exigidos, pelo nome da coluna.
+
+    Returns:
+        EntregaLeitura: Entrega encontrada, ou None.
+    """
+    linha = db.session.execute(_consulta(COLUNAS_ENTREGA, filtros).limit(1)).first()
+    return EntregaLeitura(linha) if linha is not None else None
+
+def listar_localizacoes(**filtros):
+    """
+    Lista as localizações que atendem aos filtros.
+
+    Args:
+        **filtros: Valores exigidos, pelo nome da coluna (ex.: entrega_id=...). Sem filtros, lista todas.
+
+    Returns:
+        list: Objetos LocalizacaoLeitura.
+    """
+    return [LocalizacaoLeitura(linha) for linha in db.session.execute(_consulta(COLUNAS_LOCALIZACAO, filtros))]
+
+def obter_localizacao(**filtros):
+    """
+    Recupera uma localização pelos filtros informados (ex.: id=...).
+
+    Args:
+        **filtros: Valores exigidos, pelo nome da coluna.
+
+    Returns:
+        LocalizacaoLeitura: Localização encontrada, ou None.
+    """
+    linha = db.session.execute(_consulta(COLUNAS_LOCALIZACAO, filtros).limit(1)).first()
+    return LocalizacaoLeitura(linha) if linha is not None else None
@@ -0,0 +1,115 @@
+"""
+Módulo: limites.py
+Descrição: Limites de requisições por rota, identificados pelo usuário autenticado ou pelo dispositivo IoT em vez do IP.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Cada requisição é contada para o usuário do JWT ('usuario:<id>'), para o dispositivo informado no header
+      X-Dispositivo-Id ('dispositivo:<id>') ou, na falta de ambos, para o IP ('ip:<endereco>'). O token só é usado
+      depois de validado, para que tokens forjados não escapem dos limites.
+NOTE: Atrás do proxy reverso, o IP é o do cliente apenas se o proxy estiver em PROXIES_CONFIAVEIS (app/proxy.py);
+      caso contrário, todas as requisições são contadas para o IP do proxy.
+NOTE: Os contadores ficam em RATELIMIT_STORAGE_URI. O padrão 'memory://' conta por processo; com mais de um processo,
+      use um armazenamento compartilhado (ex.: 'redis://localhost:6379') para que o limite não dependa da
+      quantidade de workers. A estratégia padrão, 'sliding-window-counter', guarda dois contadores por chave e
+      suaviza a virada da janela sem registrar cada requisição.
+"""
+
+from flask import request, current_app, jsonify
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+import re
+
+PADRAO_DISPOSITIVO = re.compile(r'[A-Za-z0-9_.:-]{1,64}')
+
+def chave_usuario():
+    """
+    Identifica a requisição pelo usuário do JWT, se houver um token válido.
+
+    Returns:
+        str: 'usuario:<id>', ou None se a requisição não tiver token válido.
+    """
+    try:
+        verify_jwt_in_request(optional=True)
+    except (JWTExtendedException, PyJWTError):
+        return None
+    identidade = get_jwt_identity()
+    return f"usuario:{identidade}" if identidade else None
+
+def chave_dispositivo():
+    """
+    Identifica a requisição pelo dispositivo informado no header X-Dispositivo-Id.
+
+    Returns:
+        str: 'dispositivo:<id>', ou None se o header estiver ausente ou for inválido.
+    """
+    dispositivo = request.headers.get('X-Dispositivo-Id', '')
+    return f"dispositivo:{dispositivo}" if PADRAO_DISPOSITIVO.fullmatch(dispositivo) else None
+
+def chave_ip():
+    """
+    Identifica a requisição pelo IP de origem.
+
+    Returns:
+        str: 'ip:<endereco>'.
+    """
+    return f"ip:{get_remote_address()}"
+
+def chave_limite():
+    """
+    Identifica a requisição para a contagem dos limites: usuário, dispositivo ou IP, nessa ordem.
+
+    Returns:
+        str: Chave da contagem.
+    """
+    return chave_usuario() or chave_dispositivo() or chave_ip()
+
+def _limite(nome):
+    """
+    Cria uma função que lê um limite da configuração no momento da requisição.
+
+    Args:
+        nome (str): Chave da configuração (ex.: 'LIMITE_LOGIN').
+
+    Returns:
+        Callable: Função sem argumentos que retorna o limite (ex.: '10 per minute').
+    """
+    return lambda: current_app.config[nome]
+
+def limite_excedido(limite):
+    """
+    Monta a resposta das requisições que excederam um limite.
+
+    Args:
+        limite (RequestLimit): Limite excedido, informado pelo Flask-Limiter.
+
+    Returns:
+        Response: JSON com 'error' e 'status' falso (status 429).
+
+    NOTE: A resposta é montada aqui, e não por um handler de RateLimitExceeded, porque o Flask-RESTful e o handler
+          genérico de Exception da aplicação formatariam o erro de outra forma (ou como 500).
+    """
+    resposta = jsonify({"error": f"Limite de requisições excedido ({limite.limit}). Tente novamente mais tarde.", "status": False})
+    resposta.status_code = 429
+    return resposta
+
+limiter = Limiter(key_func=chave_limite, default_limits=[_limite('LIMITE_PADRAO')], on_breach=limite_excedido)
+
+# Faixas por rota, aplicadas às classes de Resource via 'decorators'.
+LIMITES_LOGIN = [limiter.limit(_limite('LIMITE_LOGIN'), key_func=chave_ip)]
+LIMITES_IOT = [
+    limiter.limit(_limite('LIMITE_IOT'), key_func=lambda: chave_dispositivo() or chave_ip()),
+    limiter.limit(_limite('LIMITE_IOT_IP'), key_func=chave_ip, scope='iot-ip'),
+]
+
+def init_limites(app):
+    """
+    Ativa os limites de requisições na aplicação.
+
+    Args:
+        app (Flask): Aplicação Flask.
+    """
+    limiter.init_app(app)
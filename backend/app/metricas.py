@@ -0,0 +1,254 @@
+"""
+Módulo: metricas.py
+Descrição: Métricas da API no formato de texto do Prometheus (GET /metrics): requisições, latência e tamanhos por
+           recurso e método, requisições em andamento, consultas ao banco por requisição e localizações IoT recebidas.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Os rótulos são o nome da classe do Resource e o método HTTP, nunca a URL, para que a quantidade de séries não
+      cresça com os IDs das rotas. As séries de cada par (recurso, método) são resolvidas uma vez e reaproveitadas,
+      de modo que a coleta custa poucos microssegundos por requisição (ver benchmarks/metricas.py).
+NOTE: Com vários processos (flask serve), defina PROMETHEUS_MULTIPROC_DIR com uma pasta dedicada antes de iniciar o
+      servidor: cada worker grava as suas métricas em arquivos dessa pasta e /metrics soma as de todos. Sem ela, cada
+      worker responde apenas com as próprias métricas.
+"""
+
+from flask import request, g, current_app, has_request_context
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+import glob
+import hmac
+import os
+import time
+
+ROTULOS = ['recurso', 'metodo']
+
+REQUISICOES = Counter('api_requisicoes', 'Requisições atendidas, por código de resposta.', ROTULOS + ['codigo'])
+DURACAO = Histogram(
+    'api_requisicao_duracao_segundos', 'Tempo de atendimento das requisições.', ROTULOS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+EM_ANDAMENTO = Gauge('api_requisicoes_em_andamento', 'Requisições sendo atendidas.', ROTULOS, multiprocess_mode='livesum')
+TAMANHO_REQUISICAO = Histogram(
+    'api_requisicao_tamanho_bytes', 'Tamanho do corpo das requisições.', ROTULOS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+TAMANHO_RESPOSTA = Histogram(
+    'api_resposta_tamanho_bytes', 'Tamanho do corpo das respostas (após a compressão).', ROTULOS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+CONSULTAS = Histogram(
+    'api_consultas_banco_por_requisicao', 'Comandos SQL executados por requisição.', ROTULOS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+LOCALIZACOES_IOT = Counter(
+    'localizacoes_iot', 'Localizações enviadas por dispositivos IoT, por resultado.', ['origem', 'resultado']
+)
+
+class _Series:
+    """
+    Séries de um par (recurso, método), resolvidas uma única vez.
+
+    Args:
+        recurso (str): Nome da classe do Resource.
+        metodo (str): Método HTTP.
+        iot (bool): Se o recurso recebe localizações IoT (atributo 'contar_localizacoes_iot' do Resource).
+    """
+
+    __slots__ = ('recurso', 'metodo', 'iot', 'duracao', 'em_andamento', 'tamanho_requisicao', 'tamanho_resposta', 'consultas', 'codigos')
+
+    def __init__(self, recurso, metodo, iot):
+        self.recurso = recurso
+        self.metodo = metodo
+        self.iot = iot
+        self.duracao = DURACAO.labels(recurso, metodo)
+        self.em_andamento = EM_ANDAMENTO.labels(recurso, metodo)
+        self.tamanho_requisicao = TAMANHO_REQUISICAO.labels(recurso, metodo)
+        self.tamanho_resposta = TAMANHO_RESPOSTA.labels(recurso, metodo)
+        self.consultas = CONSULTAS.labels(recurso, metodo)
+        self.codigos = {}
+
+    def requisicoes(self, codigo):
+        """
+        Retorna o contador de requisições de um código de resposta.
+
+        Args:
+            codigo (int): Código HTTP.
+
+        Returns:
+            Counter: Série do contador.
+        """
+        contador = self.codigos.get(codigo)
+        if contador is None:
+            contador = self.codigos[codigo] = REQUISICOES.labels(self.recurso, self.metodo, str(codigo))
+        return contador
+
+_series = {}
+
+def _series_requisicao():
+    """
+    Retorna as séries da requisição atual.
+
+    Returns:
+        _Series: Séries do recurso e método da requisição ('nenhum' se a URL não corresponde a uma rota).
+    """
+    chave = (request.endpoint, request.method)
+    series = _series.get(chave)
+    if series is None:
+        visao = current_app.view_functions.get(request.endpoint)
+        classe = getattr(visao, 'view_class', None)
+        recurso = classe.__name__ if classe is not None else (request.endpoint or 'nenhum')
+        series = _series[chave] = _Series(recurso, request.method, getattr(classe, 'contar_localizacoes_iot', False))
+    return series
+
+def resultado_iot(codigo):
+    """
+    Classifica a resposta a uma localização IoT.
+
+    Args:
+        codigo (int): Código HTTP da resposta.
+
+    Returns:
+        str: 'aceita', 'limitada' (429), 'sobrecarga' (503), 'rejeitada' (demais 4xx) ou 'erro'.
+    """
+    if codigo == 201:
+        return 'aceita'
+    if codigo == 429:
+        return 'limitada'
+    if codigo == 503:
+        return 'sobrecarga'
+    return 'rejeitada' if 400 <= codigo < 500 else 'erro'
+
+def contar_localizacao_iot(origem, codigo):
+    """
+    Conta uma localização IoT recebida.
+
+    Args:
+        origem (str): 'api' ou 'ingestao' (servidor_ingestao.py).
+        codigo (int): Código HTTP da resposta.
+    """
+    LOCALIZACOES_IOT.labels(origem, resultado_iot(codigo)).inc()
+
+def _iniciar_requisicao():
+    """
+    Hook before_request: marca o início da requisição e a conta como em andamento.
+    """
+    series = _series_requisicao()
+    series.em_andamento.inc()
+    g.metricas = series
+    g.metricas_inicio = time.perf_counter()
+    g.metricas_consultas = 0
+
+def _registrar_resposta(resposta):
+    """
+    Hook after_request: registra código, duração, tamanhos e consultas da requisição.
+
+    Args:
+        resposta (Response): Resposta final.
+
+    Returns:
+        Response: A mesma resposta.
+
+    NOTE: Respostas em streaming não têm tamanho conhecido e não entram no histograma de tamanho das respostas.
+    """
+    series = g.get('metricas')
+    if series is None:
+        return resposta
+    series.requisicoes(resposta.status_code).inc()
+    series.duracao.observe(time.perf_counter() - g.metricas_inicio)
+    series.consultas.observe(g.metricas_consultas)
+    series.tamanho_requisicao.observe(request.content_length or 0)
+    if resposta.content_length is not None:
+        series.tamanho_resposta.observe(resposta.content_length)
+    if series.iot:
+        contar_localizacao_iot('api', resposta.status_code)
+    return resposta
+
+def _encerrar_requisicao(excecao):
+    """
+    Hook teardown_request: retira a requisição das que estão em andamento.
+
+    Args:
+        excecao (Exception): Exceção não tratada, se houver.
+    """
+    series = g.pop('metricas', None)
+    if series is not None:
+        series.em_andamento.dec()
+
+def _contar_consulta(conexao, cursor, sql, parametros, contexto, executemany):
+    """
+    Listener before_cursor_execute: conta os comandos SQL da requisição atual.
+    """
+    if has_request_context() and 'metricas_consultas' in g:
+        g.metricas_consultas += 1
+
+def autorizado(autorizacao, token):
+    """
+    Verifica o header Authorization de quem coleta as métricas (API e servidor de ingestão).
+
+    Args:
+        autorizacao (str): Valor do header Authorization (ou None).
+        token (str): METRICAS_TOKEN; se vazio ou None, a coleta não exige token.
+
+    Returns:
+        bool: True se o token não é exigido ou se o header é 'Bearer <token>'.
+    """
+    return not token or hmac.compare_digest((autorizacao or '').encode(), f"Bearer {token}".encode())
+
+def gerar_metricas():
+    """
+    Gera o texto das métricas no formato do Prometheus.
+
+    Returns:
+        tuple: (corpo em bytes, Content-Type).
+
+    NOTE: Com PROMETHEUS_MULTIPROC_DIR, soma as métricas gravadas por todos os processos.
+    """
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return generate_latest(registro), CONTENT_TYPE_LATEST
+
+def limpar_metricas_multiprocesso():
+    """
+    Remove os arquivos de métricas de execuções anteriores em PROMETHEUS_MULTIPROC_DIR.
+
+    NOTE: Chamada pelo processo mestre do servidor antes da criação dos workers (app/servidor.py).
+    """
+    pasta = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if pasta:
+        for arquivo in glob.glob(os.path.join(pasta, '*.db')):
+            os.remove(arquivo)
+
+def encerrar_processo_metricas(pid):
+    """
+    Marca um processo encerrado, para que os seus indicadores 'livesum' deixem de ser somados.
+
+    Args:
+        pid (int): PID do processo encerrado.
+    """
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
+
+def init_metricas(app, db):
+    """
+    Ativa a coleta das métricas na aplicação, se METRICAS_ATIVAS.
+
+    Args:
+        app (Flask): Aplicação, já com o Flask-SQLAlchemy inicializado.
+        db (SQLAlchemy): Extensão do Flask-SQLAlchemy (as consultas são contadas em todos os engines).
+
+    NOTE: Deve ser chamada antes das demais extensões: o before_request roda antes dos que podem encerrar a
+          requisição (ex.: limites) e o after_request depois da compressão, medindo o tamanho final da resposta.
+    """
+    if not app.config.get('METRICAS_ATIVAS', True):
+        return
+    app.before_request(_iniciar_requisicao)
+    app.after_request(_registrar_resposta)
+    app.teardown_request(_encerrar_requisicao)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _contar_consulta)
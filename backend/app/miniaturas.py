@@ -0,0 +1,65 @@
+"""
+Módulo: miniaturas.py
+Descrição: Geração das variantes reduzidas das fotos de prova (miniatura e versão web), executada nos processos do pool de fotos.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Este módulo não importa Flask nem o banco de dados, para que os processos do pool (app/fotos.py), criados pelo
+      método 'forkserver' com apenas este módulo pré-carregado, sejam leves.
+      As variantes são gravadas em arquivos temporários e renomeadas ao final, de modo que um leitor nunca vê uma
+      variante incompleta.
+NOTE: O Pillow só é importado na primeira geração de variantes, para não pesar na inicialização da API, que importa
+      este módulo apenas pelos nomes e caminhos das variantes.
+"""
+
+import os
+
+# Nome da variante -> (lado maior em pixels, qualidade JPEG).
+VARIANTES = {
+    'miniatura': (320, 75),
+    'web': (1280, 82),
+}
+
+def caminho_variante(original, variante):
+    """
+    Retorna o caminho da variante de uma foto original.
+
+    Args:
+        original (str): Caminho da foto original (<hash>.<ext>).
+        variante (str): Nome da variante (chave de VARIANTES).
+
+    Returns:
+        str: Caminho da variante (<hash>-<variante>.jpg), na mesma pasta da original.
+    """
+    base = os.path.splitext(original)[0]
+    return f"{base}-{variante}.jpg"
+
+def gerar_variantes(original):
+    """
+    Gera as variantes ainda inexistentes de uma foto.
+
+    Args:
+        original (str): Caminho da foto original.
+
+    Returns:
+        list: Nomes das variantes geradas nesta chamada.
+
+    NOTE: Para JPEG, Image.draft() faz o decodificador reduzir a imagem durante a leitura (escala 1/2, 1/4 ou 1/8),
+          o que evita decodificar a foto inteira da câmera para produzir a miniatura.
+    """
+    from PIL import Image, ImageOps
+    pendentes = {nome: medidas for nome, medidas in VARIANTES.items() if not os.path.exists(caminho_variante(original, nome))}
+    geradas = []
+    for nome, (lado, qualidade) in sorted(pendentes.items(), key=lambda item: -item[1][0]):
+        with Image.open(original) as imagem:
+            imagem.draft('RGB', (lado, lado))
+            imagem = ImageOps.exif_transpose(imagem)
+            if imagem.mode != 'RGB':
+                imagem = imagem.convert('RGB')
+            imagem.thumbnail((lado, lado), Image.Resampling.LANCZOS)
+            destino = caminho_variante(original, nome)
+            temporario = f"{destino}.{os.getpid()}.tmp"
+            imagem.save(temporario, 'JPEG', quality=qualidade, optimize=True, progressive=True)
+            os.replace(temporario, destino)
+        geradas.append(nome)
+    return geradas
@@ -12,6 +12,8 @@ from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
 from app.models.usuarios import Usuario
+from app.referencias import existe
+from app.fotos import urls_foto
 
 class StatusEntrega(enum.Enum):
     """
@@ -23,6 +25,40 @@ class StatusEntrega(enum.Enum):
     CANCELADA = "cancelada"
     NAO_ENTREGUE = "nao_entregue"
 
+    def predecessores(self):
+        """
+        Retorna os status a partir dos quais é permitido mudar para este status.
+
+        Returns:
+            tuple: Status de origem permitidos, conforme TRANSICOES_STATUS.
+        """
+        return tuple(origem for origem, destinos in TRANSICOES_STATUS.items() if self in destinos)
+
+    def pode_mudar_para(self, destino):
+        """
+        Verifica se a transição deste status para o status de destino é permitida.
+
+        Args:
+            destino (StatusEntrega): Status de destino.
+
+        Returns:
+            bool: True se a transição é permitida.
+        """
+        return destino in TRANSICOES_STATUS[self]
+
+# Transições permitidas: status atual -> status de destino. 'entregue' é final; 'cancelada' só pode ser reaberta.
+# Pedir o status atual não é uma transição e é aceito sem alterar a entrega (ver app/transicoes.py).
+TRANSICOES_STATUS = {
+    StatusEntrega.PENDENTE: frozenset({StatusEntrega.EM_ROTA, StatusEntrega.ENTREGUE, StatusEntrega.NAO_ENTREGUE, StatusEntrega.CANCELADA}),
+    StatusEntrega.EM_ROTA: frozenset({StatusEntrega.PENDENTE, StatusEntrega.ENTREGUE, StatusEntrega.NAO_ENTREGUE, StatusEntrega.CANCELADA}),
+    StatusEntrega.NAO_ENTREGUE: frozenset({StatusEntrega.PENDENTE, StatusEntrega.EM_ROTA, StatusEntrega.CANCELADA}),
+    StatusEntrega.CANCELADA: frozenset({StatusEntrega.PENDENTE}),
+    StatusEntrega.ENTREGUE: frozenset(),
+}
+
+# Sequência usada pelo alocador de números de pedido (app/numero_pedido.py).
+numero_pedido_seq = db.Sequence('numero_pedido_seq', metadata=db.metadata)
+
 class Entrega(db.Model):
     """
     Modelo SQLAlchemy para a tabela 'entrega'.
@@ -40,6 +76,7 @@ class Entrega(db.Model):
         observacao (String): Observações (opcional).
         foto_prova (String): Caminho da foto de prova (opcional).
         motivo (String): Motivo para status não entregue ou cancelado (opcional).
+        versao (Integer): Versão do registro, incrementada a cada alteração (controle de concorrência otimista).
         criado_em (DateTime): Timestamp de criação.
         atualizado_em (DateTime): Timestamp de atualização.
     """
@@ -55,12 +92,15 @@ class Entrega(db.Model):
     observacao = db.Column(db.String(255), nullable=True)
     foto_prova = db.Column(db.String(255), nullable=True)
     motivo = db.Column(db.String(255), nullable=True)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     criado_em = db.Column(db.DateTime, default=db.func.current_timestamp())
     atualizado_em = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
     localizacoes = db.relationship("Localizacao", back_populates="entrega")
     motorista = db.relationship("Usuario", back_populates="entregas")
 
+    __mapper_args__ = {"version_id_col": versao}
+
     def __init__(self, **kwargs):
         """
         Inicializa uma nova instância de Entrega.
@@ -70,9 +110,11 @@ class Entrega(db.Model):
 
         Raises:
             ValueError: Se o motorista_id fornecido não corresponder a um motorista existente no banco de dados.
+
+        NOTE: A verificação usa o cache de referências da requisição, evitando nova consulta quando a rota já validou o motorista.
         """
         super().__init__(**kwargs)
-        if not Usuario.query.get(self.motorista_id):
+        if not existe(Usuario, self.motorista_id):
             raise ValueError("Motorista não encontrado")
 
     def json(self):
@@ -80,21 +122,25 @@ class Entrega(db.Model):
         Converte o objeto Entrega para um dicionário JSON.
 
         Returns:
-            dict: Representação JSON do objeto, incluindo status e campos opcionais.
+            dict: Representação JSON do objeto, incluindo status, campos opcionais e as URLs da foto de prova e de suas variantes.
+
+        NOTE: UUIDs, datas e o status são devolvidos sem conversão; a serialização fica com app/representacao.py.
         """
         return {
-            "id": str(self.id),
-            "motorista_id": str(self.motorista_id),
+            "id": self.id,
+            "motorista_id": self.motorista_id,
             "endereco_entrega": self.endereco_entrega,
             "numero_pedido": self.numero_pedido,
-            "status": self.status.value,
+            "status": self.status,
             "nome_cliente": self.nome_cliente,
             "nome_recebido": self.nome_recebido,
             "observacao": self.observacao,
             "foto_prova": self.foto_prova,
+            "fotos": urls_foto(self.foto_prova),
             "motivo": self.motivo,
-            "criado_em": str(self.criado_em),
-            "atualizado_em": str(self.atualizado_em)
+            "versao": self.versao,
+            "criado_em": self.criado_em,
+            "atualizado_em": self.atualizado_em
         }
 
     def __repr__(self):
@@ -0,0 +1,74 @@
+"""
+Módulo: evento.py
+Descrição: Define os modelos do histórico de status de entregas e dos contadores materializados por motorista e por dia.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: A tabela 'entrega_evento' é somente de inserção: cada criação ou mudança de status de uma entrega gera uma linha,
+      que nunca é alterada. As tabelas não têm chave estrangeira para 'entrega' nem para 'usuario', para que o
+      histórico e as estatísticas sejam preservados quando uma entrega ou um motorista for deletado.
+"""
+
+from app.db import db
+from app.models.entrega import StatusEntrega
+from sqlalchemy.dialects.postgresql import UUID
+
+class EntregaEvento(db.Model):
+    """
+    Modelo SQLAlchemy para a tabela 'entrega_evento'.
+
+    Esta classe representa uma mudança de status de uma entrega (inclusive a criação, com status 'pendente').
+
+    Attributes:
+        id (BigInteger): Identificador sequencial do evento (ordem de gravação).
+        entrega_id (UUID): ID da entrega.
+        motorista_id (UUID): ID do motorista da entrega no momento do evento.
+        status (Enum): Status assumido pela entrega.
+        motivo (String): Motivo informado na mudança (opcional).
+        criado_em (DateTime): Timestamp do evento.
+    """
+    __tablename__ = 'entrega_evento'
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    entrega_id = db.Column(UUID(as_uuid=True), nullable=False, index=True)
+    motorista_id = db.Column(UUID(as_uuid=True), nullable=False)
+    status = db.Column(db.Enum(StatusEntrega, name='statusentrega'), nullable=False)
+    motivo = db.Column(db.String(255), nullable=True)
+    criado_em = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+
+    def json(self):
+        """
+        Converte o objeto EntregaEvento para um dicionário JSON.
+
+        Returns:
+            dict: Representação JSON do evento.
+        """
+        return {
+            "id": self.id,
+            "entrega_id": self.entrega_id,
+            "motorista_id": self.motorista_id,
+            "status": self.status,
+            "motivo": self.motivo,
+            "criado_em": self.criado_em
+        }
+
+class ContadorEntrega(db.Model):
+    """
+    Modelo SQLAlchemy para a tabela 'entrega_contador'.
+
+    Esta classe representa quantas entregas de um motorista passaram para um status em um dia.
+
+    Attributes:
+        dia (Date): Dia dos eventos contabilizados.
+        motorista_id (UUID): ID do motorista.
+        status (Enum): Status assumido pelas entregas.
+        quantidade (Integer): Quantidade de eventos com esse status no dia.
+
+    NOTE: A chave primária (dia, motorista_id, status) atende diretamente às consultas de /entregas/estatisticas.
+    """
+    __tablename__ = 'entrega_contador'
+
+    dia = db.Column(db.Date, primary_key=True)
+    motorista_id = db.Column(UUID(as_uuid=True), primary_key=True)
+    status = db.Column(db.Enum(StatusEntrega, name='statusentrega'), primary_key=True)
+    quantidade = db.Column(db.Integer, nullable=False, default=0, server_default='0')
@@ -0,0 +1,31 @@
+"""
+Módulo: idempotencia.py
+Descrição: Define o modelo das chaves de idempotência usadas pela sincronização de mutações offline (/sync).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Cada chave é única por usuário e guarda o resultado da mutação aplicada, devolvido sem reaplicar a mutação
+      quando o aplicativo reenviar a mesma chave antes de 'expira_em'.
+"""
+
+from app.db import db
+from sqlalchemy.dialects.postgresql import UUID
+
+class ChaveIdempotencia(db.Model):
+    """
+    Modelo SQLAlchemy para a tabela 'chave_idempotencia'.
+
+    Attributes:
+        usuario_id (UUID): ID do usuário que enviou a mutação.
+        chave (String): Chave de idempotência gerada pelo aplicativo.
+        resultado (JSON): Resultado da mutação, devolvido nas repetições.
+        criado_em (DateTime): Timestamp do primeiro recebimento da chave.
+        expira_em (DateTime): Timestamp a partir do qual a chave pode ser descartada e reutilizada.
+    """
+    __tablename__ = 'chave_idempotencia'
+
+    usuario_id = db.Column(UUID(as_uuid=True), primary_key=True)
+    chave = db.Column(db.String(64), primary_key=True)
+    resultado = db.Column(db.JSON, nullable=True)
+    criado_em = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+    expira_em = db.Column(db.DateTime, nullable=False, index=True)
@@ -47,15 +47,16 @@ class Localizacao(db.Model):
         Converte o objeto Localizacao para um dicionário JSON.
 
         Returns:
-            dict: Representação JSON do objeto, incluindo coordenadas e timestamps.
+            dict: Representação JSON do objeto, incluindo coordenadas (Decimal) e timestamps (datetime), convertidos
+                  apenas na serialização da resposta.
         """
         return {
-            "id": str(self.id),
-            "entrega_id": str(self.entrega_id) if self.entrega_id else None,
-            "motorista_id": str(self.motorista_id) if self.motorista_id else None,
-            "latitude": float(self.latitude),
-            "longitude": float(self.longitude),
-            "data_hora": str(self.data_hora),
-            "criado_em": str(self.criado_em),
-            "atualizado_em": str(self.atualizado_em)
+            "id": self.id,
+            "entrega_id": self.entrega_id,
+            "motorista_id": self.motorista_id,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "data_hora": self.data_hora,
+            "criado_em": self.criado_em,
+            "atualizado_em": self.atualizado_em
         }
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Módulo: token_revogado.py
+Descrição: Define o modelo dos tokens JWT revogados por logout, compartilhados entre todos os processos da aplicação.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Cada registro vale até a expiração do próprio token ('expira_em'); depois disso o token já seria recusado
+      pelo JWT e o registro pode ser removido.
+"""
+
+from app.db import db
+
+class TokenRevogado(db.Model):
+    """
+    Modelo SQLAlchemy para a tabela 'token_revogado'.
+
+    Attributes:
+        jti (String): Identificador único do token JWT.
+        expira_em (DateTime): Expiração do token (UTC), a partir da qual o registro é descartável.
+    """
+    __tablename__ = 'token_revogado'
+
+    jti = db.Column(db.String(64), primary_key=True)
+    expira_em = db.Column(db.DateTime, nullable=False, index=True)
@@ -27,6 +27,9 @@ class Usuario(db.Model):
         atualizado_em (DateTime): Timestamp de atualização.
     """
     __tablename__ = 'usuario'
+    __table_args__ = (
+        db.Index('uq_usuario_cnh_placa_veiculo', 'cnh', 'placa_veiculo', unique=True),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nome = db.Column(db.String(255), nullable=False)
@@ -47,13 +50,13 @@ class Usuario(db.Model):
             dict: Representação JSON do objeto, incluindo dados do motorista.
         """
         return {
-            "id": str(self.id),
+            "id": self.id,
             "nome": self.nome,
             "placa_veiculo": self.placa_veiculo,
             "cnh": self.cnh,
             "telefone": self.telefone,
-            "criado_em": str(self.criado_em),
-            "atualizado_em": str(self.atualizado_em)
+            "criado_em": self.criado_em,
+            "atualizado_em": self.atualizado_em
         }
 
     def __repr__(self):
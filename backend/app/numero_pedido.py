@@ -0,0 +1,185 @@
+"""
+Módulo: numero_pedido.py
+Descrição: Alocador de números de pedido únicos a partir de uma sequência do banco de dados e de uma permutação com chave.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Cada valor da sequência 'numero_pedido_seq' é embaralhado por uma rede de Feistel sobre o espaço base 36
+      de 6 caracteres (36^6 códigos). Como a permutação é bijetora, valores distintos da sequência sempre geram
+      códigos distintos: não há consultas de verificação nem novas tentativas por colisão.
+NOTE: A chave (NUMERO_PEDIDO_CHAVE) é obrigatória e própria deste alocador, para que a rotação de SECRET_KEY não a
+      altere. Ela não deve ser alterada depois que houver pedidos emitidos, pois uma nova chave gera outra permutação
+      e pode repetir códigos já usados.
+NOTE: Pedidos antigos, gerados aleatoriamente antes deste alocador, podem coincidir com um código novo (probabilidade
+      desprezível). Nesse caso a restrição UNIQUE rejeita a inserção e a próxima tentativa do cliente usa outro valor.
+"""
+
+from app.db import db
+from app.models.entrega import numero_pedido_seq
+from flask import current_app
+import hashlib
+import string
+
+ALFABETO = string.digits + string.ascii_uppercase
+TAMANHO = 6
+METADE = len(ALFABETO) ** (TAMANHO // 2)
+ESPACO = METADE * METADE
+RODADAS = 4
+
+class AlocadorNumeroPedido:
+    """
+    Gera números de pedido de 6 caracteres alfanuméricos maiúsculos, únicos e de aparência não sequencial.
+
+    Attributes:
+        chave (bytes): Chave secreta da permutação.
+        rodadas (int): Número de rodadas da rede de Feistel.
+    """
+
+    def __init__(self, chave, rodadas=RODADAS):
+        """
+        Inicializa o alocador.
+
+        Args:
+            chave (str | bytes): Chave secreta da permutação.
+            rodadas (int, optional): Número de rodadas da rede de Feistel.
+
+        Raises:
+            ValueError: Se a chave for vazia.
+        """
+        if not chave:
+            raise ValueError("A chave do alocador de números de pedido não pode ser vazia")
+        if isinstance(chave, str):
+            chave = chave.encode('utf-8')
+        self.chave = hashlib.blake2b(chave, digest_size=32).digest()
+        self.rodadas = rodadas
+
+    def _rodada(self, indice, valor):
+        """
+        Função de rodada da rede de Feistel.
+
+        Args:
+            indice (int): Índice da rodada.
+            valor (int): Metade direita do estado, em [0, METADE).
+
+        Returns:
+            int: Valor pseudoaleatório em [0, METADE).
+        """
+        resumo = hashlib.blake2b(valor.to_bytes(4, 'big'), key=self.chave, digest_size=8,
+                                 person=b'rodada%d' % indice).digest()
+        return int.from_bytes(resumo, 'big') % METADE
+
+    def permutar(self, valor):
+        """
+        Aplica a permutação com chave sobre o espaço [0, 36^6).
+
+        Args:
+            valor (int): Valor de entrada.
+
+        Returns:
+            int: Valor permutado.
+        """
+        esquerda, direita = divmod(valor, METADE)
+        for indice in range(self.rodadas):
+            esquerda, direita = direita, (esquerda + self._rodada(indice, direita)) % METADE
+        return esquerda * METADE + direita
+
+    def inverter(self, valor):
+        """
+        Desfaz a permutação aplicada por permutar().
+
+        Args:
+            valor (int): Valor permutado.
+
+        Returns:
+            int: Valor original.
+        """
+        esquerda, direita = divmod(valor, METADE)
+        for indice in reversed(range(self.rodadas)):
+            esquerda, direita = (direita - self._rodada(indice, esquerda)) % METADE, esquerda
+        return esquerda * METADE + direita
+
+    def codificar(self, valor):
+        """
+        Converte um valor da sequência no número de pedido correspondente.
+
+        Args:
+            valor (int): Valor da sequência do banco de dados.
+
+        Returns:
+            str: Número de pedido com 6 caracteres alfanuméricos maiúsculos.
+
+        Raises:
+            RuntimeError: Se o valor exceder o espaço de números de pedido disponíveis.
+        """
+        if not 0 <= valor < ESPACO:
+            raise RuntimeError("Espaço de números de pedido esgotado.")
+        valor = self.permutar(valor)
+        caracteres = []
+        for _ in range(TAMANHO):
+            valor, resto = divmod(valor, len(ALFABETO))
+            caracteres.append(ALFABETO[resto])
+        return ''.join(reversed(caracteres))
+
+    def decodificar(self, numero_pedido):
+        """
+        Recupera o valor da sequência que originou um número de pedido.
+
+        Args:
+            numero_pedido (str): Número de pedido com 6 caracteres alfanuméricos maiúsculos.
+
+        Returns:
+            int: Valor da sequência.
+
+        Raises:
+            ValueError: Se o número de pedido tiver formato inválido.
+        """
+        if len(numero_pedido) != TAMANHO or any(c not in ALFABETO for c in numero_pedido):
+            raise ValueError("Número do pedido deve ter exatamente 6 caracteres alfanuméricos maiúsculos.")
+        valor = 0
+        for caractere in numero_pedido:
+            valor = valor * len(ALFABETO) + ALFABETO.index(caractere)
+        return self.inverter(valor)
+
+    def reservar(self, quantidade):
+        """
+        Reserva um bloco de números de pedido com uma única chamada à sequência.
+
+        Args:
+            quantidade (int): Quantidade de números a reservar.
+
+        Returns:
+            list: Números de pedido únicos, na ordem em que foram reservados.
+
+        Raises:
+            RuntimeError: Se o espaço de números de pedido estiver esgotado.
+
+        NOTE: Valores reservados e não utilizados (ex.: rollback) são descartados, como em qualquer sequência.
+        """
+        if quantidade <= 0:
+            return []
+        valores = db.session.execute(
+            db.select(numero_pedido_seq.next_value()).select_from(db.func.generate_series(1, quantidade))
+        ).scalars()
+        return [self.codificar(valor) for valor in valores]
+
+    def proximo(self):
+        """
+        Reserva um único número de pedido.
+
+        Returns:
+            str: Número de pedido único.
+        """
+        return self.reservar(1)[0]
+
+def obter_alocador():
+    """
+    Retorna o alocador de números de pedido da aplicação atual, criando-o na primeira chamada.
+
+    Returns:
+        AlocadorNumeroPedido: Alocador configurado com NUMERO_PEDIDO_CHAVE.
+    """
+    alocador = current_app.extensions.get('numero_pedido')
+    if alocador is None:
+        alocador = AlocadorNumeroPedido(current_app.config['NUMERO_PEDIDO_CHAVE'])
+        current_app.extensions['numero_pedido'] = alocador
+    return alocador
@@ -0,0 +1,186 @@
+"""
+Módulo: perfil_sql.py
+Descrição: Perfil opcional dos comandos SQL de cada requisição (PERFIL_SQL=1): quantidade e tempo das consultas,
+           detecção de comandos repetidos (padrão N+1), registro das consultas lentas com os parâmetros e, no
+           PostgreSQL, o plano de execução (EXPLAIN ANALYZE) delas.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Desativado, nenhum listener é registrado e não há custo. Ativado, o resumo de cada requisição vai no header
+      X-Perfil-SQL (ex.: 'consultas=12; tempo_ms=8.4; repetidas=1') e os alertas vão para o logger 'app.perfil_sql'.
+NOTE: Um comando é considerado repetido quando o mesmo SQL (com parâmetros diferentes) é executado ao menos
+      PERFIL_SQL_REPETICOES vezes na requisição, o sinal típico de um relacionamento carregado item a item.
+NOTE: Os parâmetros das consultas lentas são registrados no log e podem conter dados pessoais: ative em
+      desenvolvimento e homologação, ou por tempo limitado em produção. PERFIL_SQL_EXPLAIN executa novamente as
+      consultas lentas (apenas SELECT) com EXPLAIN ANALYZE, dentro de um savepoint, dobrando o custo delas.
+"""
+
+from flask import request, g, current_app, has_app_context, has_request_context
+from collections import Counter
+from sqlalchemy import event
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+LIMITE_PARAMETROS_LOG = 500
+
+class PerfilRequisicao:
+    """
+    Comandos SQL executados durante uma requisição.
+    """
+
+    __slots__ = ('consultas', 'tempo', 'comandos')
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo = 0.0
+        self.comandos = Counter()
+
+    def repetidos(self, minimo):
+        """
+        Retorna os comandos executados ao menos 'minimo' vezes.
+
+        Args:
+            minimo (int): Execuções a partir das quais um comando é considerado repetido.
+
+        Returns:
+            list: Pares (SQL, execuções), do mais executado para o menos executado.
+        """
+        return [(sql, vezes) for sql, vezes in self.comandos.most_common() if vezes >= minimo]
+
+def _inicio_comando(conexao, cursor, sql, parametros, contexto, executemany):
+    """
+    Listener before_cursor_execute: marca o início do comando.
+    """
+    conexao.info.setdefault('perfil_sql_inicio', []).append(time.perf_counter())
+
+def _fim_comando(conexao, cursor, sql, parametros, contexto, executemany):
+    """
+    Listener after_cursor_execute: contabiliza o comando na requisição e registra as consultas lentas.
+    """
+    duracao = time.perf_counter() - conexao.info['perfil_sql_inicio'].pop()
+    if not has_app_context():
+        return
+    origem = "comando fora de requisição"
+    if has_request_context():
+        origem = f"{request.method} {request.path}"
+        perfil = g.get('perfil_sql')
+        if perfil is not None:
+            perfil.consultas += 1
+            perfil.tempo += duracao
+            perfil.comandos[sql] += 1
+    config = current_app.config
+    if duracao * 1000 >= config['PERFIL_SQL_LENTA_MS']:
+        _registrar_lenta(conexao, cursor, sql, parametros, executemany, duracao, origem, config['PERFIL_SQL_EXPLAIN'])
+
+def _falha_comando(contexto):
+    """
+    Listener handle_error: descarta a marca de início do comando que falhou.
+
+    Args:
+        contexto (ExceptionContext): Contexto do erro.
+    """
+    if contexto.connection is not None and contexto.connection.info.get('perfil_sql_inicio'):
+        contexto.connection.info['perfil_sql_inicio'].pop()
+
+def _registrar_lenta(conexao, cursor, sql, parametros, executemany, duracao, origem, explicar):
+    """
+    Registra no log uma consulta lenta, com os parâmetros e, se pedido, o plano de execução.
+
+    Args:
+        conexao (Connection): Conexão do SQLAlchemy.
+        cursor: Cursor DBAPI que executou o comando.
+        sql (str): Comando executado.
+        parametros: Parâmetros do comando.
+        executemany (bool): Se o comando foi executado para vários conjuntos de parâmetros.
+        duracao (float): Segundos de execução.
+        origem (str): Requisição (método e caminho) ou contexto da execução.
+        explicar (bool): Se o plano de execução deve ser obtido com EXPLAIN ANALYZE.
+    """
+    texto_parametros = repr(parametros)
+    if len(texto_parametros) > LIMITE_PARAMETROS_LOG:
+        texto_parametros = f"{texto_parametros[:LIMITE_PARAMETROS_LOG]}..."
+    plano = None
+    if explicar and not executemany and conexao.dialect.name == 'postgresql' and sql.lstrip()[:6].upper() == 'SELECT':
+        plano = _explicar(cursor, sql, parametros)
+    logger.warning(
+        "Consulta lenta (%.1f ms) em %s: %s | parâmetros: %s%s",
+        duracao * 1000, origem, sql, texto_parametros, f"\n{plano}" if plano else ""
+    )
+
+def _explicar(cursor, sql, parametros):
+    """
+    Obtém o plano de execução de uma consulta com EXPLAIN ANALYZE, na mesma conexão e transação.
+
+    Args:
+        cursor: Cursor DBAPI que executou a consulta.
+        sql (str): Consulta.
+        parametros: Parâmetros da consulta.
+
+    Returns:
+        str: Plano de execução, ou a mensagem do erro que impediu obtê-lo.
+
+    NOTE: O savepoint garante que uma falha do EXPLAIN não invalide a transação da requisição.
+    """
+    explicacao = cursor.connection.cursor()
+    try:
+        explicacao.execute("SAVEPOINT perfil_sql")
+        try:
+            explicacao.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", parametros)
+            plano = "\n".join(linha[0] for linha in explicacao.fetchall())
+            explicacao.execute("RELEASE SAVEPOINT perfil_sql")
+            return plano
+        except Exception as e:
+            explicacao.execute("ROLLBACK TO SAVEPOINT perfil_sql")
+            return f"EXPLAIN indisponível: {str(e)}"
+    except Exception as e:
+        return f"EXPLAIN indisponível: {str(e)}"
+    finally:
+        explicacao.close()
+
+def _iniciar_requisicao():
+    """
+    Hook before_request: inicia o perfil da requisição.
+    """
+    g.perfil_sql = PerfilRequisicao()
+
+def _resumir_requisicao(resposta):
+    """
+    Hook after_request: informa o resumo no header X-Perfil-SQL e alerta sobre comandos repetidos.
+
+    Args:
+        resposta (Response): Resposta da requisição.
+
+    Returns:
+        Response: A mesma resposta, com o header X-Perfil-SQL.
+    """
+    perfil = g.get('perfil_sql')
+    if perfil is None:
+        return resposta
+    repetidos = perfil.repetidos(current_app.config['PERFIL_SQL_REPETICOES'])
+    resposta.headers['X-Perfil-SQL'] = (
+        f"consultas={perfil.consultas}; tempo_ms={perfil.tempo * 1000:.1f}; repetidas={len(repetidos)}"
+    )
+    for sql, vezes in repetidos:
+        logger.warning("Possível N+1 em %s %s (%s): %d execuções de: %s", request.method, request.path,
+                       request.endpoint, vezes, sql)
+    return resposta
+
+def init_perfil_sql(app, db):
+    """
+    Ativa o perfil dos comandos SQL na aplicação, se PERFIL_SQL.
+
+    Args:
+        app (Flask): Aplicação, já com o Flask-SQLAlchemy inicializado.
+        db (SQLAlchemy): Extensão do Flask-SQLAlchemy (todos os engines são monitorados, inclusive as réplicas).
+    """
+    if not app.config.get('PERFIL_SQL'):
+        return
+    app.before_request(_iniciar_requisicao)
+    app.after_request(_resumir_requisicao)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _inicio_comando)
+            event.listen(engine, 'after_cursor_execute', _fim_comando)
+            event.listen(engine, 'handle_error', _falha_comando)
@@ -0,0 +1,84 @@
+"""
+Módulo: perfis.py
+Descrição: Cache por processo dos dados de perfil dos usuários, usado pelas rotas de sessão e consulta de usuário.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: As entradas valem por PERFIL_CACHE_TTL segundos (0 desativa) e o cache é limitado a PERFIL_CACHE_MAX usuários.
+      UsuarioResource.put e UsuarioResource.delete invalidam a entrada do usuário após o commit; em outros processos
+      a entrada expira pelo TTL, que por isso deve ser curto.
+"""
+
+from app.db import db
+from app.models.usuarios import Usuario
+from flask import current_app
+import threading
+import time
+import uuid
+
+_cache = {}
+_trava = threading.Lock()
+
+def obter_perfil(user_id):
+    """
+    Retorna os dados de perfil de um usuário, consultando o banco apenas se não estiverem em cache.
+
+    Args:
+        user_id (str | UUID): ID do usuário.
+
+    Returns:
+        dict: Representação JSON do usuário (Usuario.json()), ou None se o usuário não existir.
+
+    Raises:
+        ValueError: Se o ID não for um UUID válido.
+    """
+    user_id = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
+    ttl = current_app.config.get('PERFIL_CACHE_TTL', 30)
+    agora = time.monotonic()
+    entrada = _cache.get(user_id)
+    if entrada is not None and entrada[0] > agora:
+        return dict(entrada[1])
+
+    usuario = db.session.get(Usuario, user_id)
+    if usuario is None:
+        return None
+    perfil = usuario.json()
+    if ttl > 0:
+        _guardar(user_id, perfil, agora + ttl)
+    return dict(perfil)
+
+def _guardar(user_id, perfil, expira_em):
+    """
+    Registra o perfil de um usuário no cache.
+
+    Args:
+        user_id (UUID): ID do usuário.
+        perfil (dict): Representação JSON do usuário.
+        expira_em (float): Instante (time.monotonic) em que a entrada expira.
+
+    NOTE: Ao atingir PERFIL_CACHE_MAX, as entradas expiradas são descartadas e, se ainda assim não houver espaço,
+          o cache é esvaziado.
+    """
+    limite = current_app.config.get('PERFIL_CACHE_MAX', 10000)
+    with _trava:
+        if len(_cache) >= limite:
+            agora = time.monotonic()
+            for chave in [chave for chave, (validade, _) in _cache.items() if validade <= agora]:
+                del _cache[chave]
+            if len(_cache) >= limite:
+                _cache.clear()
+        _cache[user_id] = (expira_em, perfil)
+
+def invalidar_perfil(user_id):
+    """
+    Remove o perfil de um usuário do cache.
+
+    Args:
+        user_id (str | UUID): ID do usuário.
+    """
+    try:
+        user_id = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
+    except ValueError:
+        return
+    with _trava:
+        _cache.pop(user_id, None)
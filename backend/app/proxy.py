@@ -0,0 +1,112 @@
+"""
+Módulo: proxy.py
+Descrição: Identificação do IP do cliente atrás do proxy reverso pelo header X-Forwarded-For, aceito apenas quando a
+           conexão vem de um proxy confiável (PROXIES_CONFIAVEIS).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Sem PROXIES_CONFIAVEIS, o header é ignorado e o IP do cliente é o da conexão. Atrás do proxy, isso faria todos
+      os clientes compartilharem os limites por IP (e, sem X-Dispositivo-Id válido, também o limite por dispositivo)
+      com o endereço do proxy.
+NOTE: O X-Forwarded-For é lido da direita para a esquerda: cada proxy confiável acrescenta o endereço de quem se
+      conectou a ele, e o primeiro endereço que não é de um proxy confiável é o do cliente. Os endereços à esquerda
+      dele foram informados pelo próprio cliente e não são usados.
+"""
+
+from ipaddress import ip_address, ip_network
+
+def redes_confiaveis(valor):
+    """
+    Interpreta a lista de proxies confiáveis.
+
+    Args:
+        valor (str): Endereços ou redes (CIDR) separados por vírgula (ex.: '127.0.0.1,10.0.0.0/8').
+
+    Returns:
+        tuple: Redes (IPv4Network/IPv6Network); vazia se 'valor' for vazio ou None.
+
+    Raises:
+        ValueError: Se algum endereço ou rede for inválido.
+    """
+    try:
+        return tuple(ip_network(item.strip(), strict=False) for item in (valor or '').split(',') if item.strip())
+    except ValueError as e:
+        raise ValueError(f"PROXIES_CONFIAVEIS inválida: {str(e)}")
+
+def _confiavel(endereco, redes):
+    """
+    Verifica se um endereço pertence a um proxy confiável.
+
+    Args:
+        endereco (str): Endereço IP.
+        redes (tuple): Redes confiáveis.
+
+    Returns:
+        bool: True se o endereço é válido e pertence a alguma das redes.
+    """
+    try:
+        ip = ip_address(endereco)
+    except ValueError:
+        return False
+    return any(ip in rede for rede in redes)
+
+def ip_cliente(remoto, encaminhado, redes):
+    """
+    Determina o IP do cliente a partir do endereço da conexão e do header X-Forwarded-For.
+
+    Args:
+        remoto (str): Endereço da conexão.
+        encaminhado (str): Valor do header X-Forwarded-For (ou None).
+        redes (tuple): Redes dos proxies confiáveis (ver redes_confiaveis()).
+
+    Returns:
+        str: IP do cliente; o próprio 'remoto' se ele não for um proxy confiável ou o header estiver ausente.
+    """
+    cliente = remoto
+    if not encaminhado or not _confiavel(remoto, redes):
+        return cliente
+    for endereco in reversed(encaminhado.split(',')):
+        endereco = endereco.strip()
+        try:
+            ip_address(endereco)
+        except ValueError:
+            break
+        cliente = endereco
+        if not _confiavel(endereco, redes):
+            break
+    return cliente
+
+class ProxyConfiavel:
+    """
+    Middleware WSGI que substitui REMOTE_ADDR pelo IP do cliente informado pelos proxies confiáveis.
+
+    Args:
+        wsgi_app (Callable): Aplicação WSGI original.
+        redes (tuple): Redes dos proxies confiáveis.
+
+    NOTE: Equivalente ao ProxyFix do Werkzeug para o X-Forwarded-For, mas a confiança é dada pelo endereço do proxy,
+          e não pela quantidade de proxies. O endereço original fica em 'app.proxy.remote_addr' no environ.
+    """
+
+    def __init__(self, wsgi_app, redes):
+        self.wsgi_app = wsgi_app
+        self.redes = redes
+
+    def __call__(self, environ, start_response):
+        remoto = environ.get('REMOTE_ADDR')
+        environ['app.proxy.remote_addr'] = remoto
+        environ['REMOTE_ADDR'] = ip_cliente(remoto, environ.get('HTTP_X_FORWARDED_FOR'), self.redes)
+        return self.wsgi_app(environ, start_response)
+
+def init_proxy(app):
+    """
+    Passa a identificar o cliente pelo X-Forwarded-For dos proxies em PROXIES_CONFIAVEIS.
+
+    Args:
+        app (Flask): Aplicação Flask.
+
+    NOTE: request.remote_addr, e por consequência os limites por IP (app/limites.py), passam a usar o IP do cliente.
+    """
+    redes = app.config['PROXIES_CONFIAVEIS']
+    if redes:
+        app.wsgi_app = ProxyConfiavel(app.wsgi_app, redes)
@@ -0,0 +1,156 @@
+"""
+Módulo: referencias.py
+Descrição: Verificação de existência de registros referenciados (chaves estrangeiras) com cache por requisição e cache opcional por processo.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: O cache por requisição (flask.g) garante no máximo uma consulta de validação por entidade e ID em cada requisição,
+      mesmo que rota e modelo verifiquem o mesmo ID (ex.: EntregaResource.post e Entrega.__init__).
+NOTE: O cache por processo guarda apenas IDs existentes, por REFERENCIAS_CACHE_TTL segundos (0 desativa, padrão).
+      Deleções feitas pelo ORM invalidam o cache local; em outros processos a entrada expira pelo TTL e a chave
+      estrangeira do banco continua rejeitando referências inválidas.
+"""
+
+from app.db import db
+from flask import g, current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+import threading
+import time
+import uuid
+
+_cache_processo = {}
+_trava = threading.Lock()
+
+def _normalizar_id(valor):
+    """
+    Converte um ID para UUID.
+
+    Args:
+        valor (str | UUID): ID a converter.
+
+    Returns:
+        UUID: ID convertido, ou None se o valor não for um UUID válido.
+    """
+    if isinstance(valor, uuid.UUID):
+        return valor
+    try:
+        return uuid.UUID(str(valor))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+def _cache_requisicao(tabela):
+    """
+    Retorna o cache de existência da requisição atual para uma tabela.
+
+    Args:
+        tabela (str): Nome da tabela.
+
+    Returns:
+        dict: Mapeamento ID -> existe (bool).
+    """
+    if '_referencias' not in g:
+        g._referencias = {}
+    return g._referencias.setdefault(tabela, {})
+
+def verificar_existentes(modelo, ids):
+    """
+    Verifica quais IDs de um modelo existem no banco, com no máximo uma consulta para os IDs ainda não conhecidos.
+
+    Args:
+        modelo (db.Model): Classe do modelo referenciado (ex.: Usuario, Entrega).
+        ids (iterable): IDs a verificar (str ou UUID).
+
+    Returns:
+        set: IDs (UUID) que existem. IDs em formato inválido são tratados como inexistentes.
+    """
+    tabela = modelo.__tablename__
+    cache = _cache_requisicao(tabela)
+    ttl = current_app.config.get('REFERENCIAS_CACHE_TTL', 0)
+    normalizados = {normalizado for normalizado in map(_normalizar_id, ids) if normalizado is not None}
+    pendentes = [id_ for id_ in normalizados if id_ not in cache]
+
+    if pendentes and ttl > 0:
+        agora = time.monotonic()
+        for id_ in list(pendentes):
+            expira_em = _cache_processo.get((tabela, id_))
+            if expira_em is not None and expira_em > agora:
+                cache[id_] = True
+                pendentes.remove(id_)
+
+    if pendentes:
+        encontrados = set(db.session.execute(
+            db.select(modelo.id).where(modelo.id.in_(pendentes))
+        ).scalars())
+        for id_ in pendentes:
+            cache[id_] = id_ in encontrados
+        if ttl > 0 and encontrados:
+            _guardar_processo(tabela, encontrados, ttl)
+
+    return {id_ for id_ in normalizados if cache[id_]}
+
+def existe(modelo, id_):
+    """
+    Verifica se um registro existe, usando os caches de referência.
+
+    Args:
+        modelo (db.Model): Classe do modelo referenciado.
+        id_ (str | UUID): ID do registro.
+
+    Returns:
+        bool: True se o registro existe, False caso contrário (inclusive para IDs em formato inválido).
+    """
+    return bool(verificar_existentes(modelo, [id_]))
+
+def _guardar_processo(tabela, ids, ttl):
+    """
+    Registra IDs existentes no cache por processo.
+
+    Args:
+        tabela (str): Nome da tabela.
+        ids (iterable): IDs existentes.
+        ttl (float): Tempo de vida das entradas, em segundos.
+
+    NOTE: O cache é limitado por REFERENCIAS_CACHE_MAX; ao atingir o limite, entradas expiradas são descartadas
+          e, se ainda assim não houver espaço, o cache é esvaziado.
+    """
+    limite = current_app.config.get('REFERENCIAS_CACHE_MAX', 10000)
+    agora = time.monotonic()
+    with _trava:
+        if len(_cache_processo) >= limite:
+            for chave in [chave for chave, expira_em in _cache_processo.items() if expira_em <= agora]:
+                del _cache_processo[chave]
+            if len(_cache_processo) >= limite:
+                _cache_processo.clear()
+        for id_ in ids:
+            _cache_processo[(tabela, id_)] = agora + ttl
+
+def invalidar(tabela, id_):
+    """
+    Remove um ID dos caches de referência.
+
+    Args:
+        tabela (str): Nome da tabela.
+        id_ (str | UUID): ID do registro.
+    """
+    id_ = _normalizar_id(id_)
+    with _trava:
+        _cache_processo.pop((tabela, id_), None)
+    if has_app_context() and '_referencias' in g:
+        g._referencias.get(tabela, {}).pop(id_, None)
+
+@event.listens_for(Mapper, 'after_delete')
+def _ao_deletar(mapper, connection, alvo):
+    """
+    Invalida os caches quando um registro é deletado pelo ORM (inclusive por cascade).
+    """
+    if hasattr(alvo, 'id'):
+        invalidar(mapper.local_table.name, alvo.id)
+
+@event.listens_for(Mapper, 'after_insert')
+def _ao_inserir(mapper, connection, alvo):
+    """
+    Descarta resultados negativos da requisição quando o registro é criado nela mesma.
+    """
+    if hasattr(alvo, 'id') and has_app_context() and '_referencias' in g:
+        g._referencias.get(mapper.local_table.name, {}).pop(_normalizar_id(alvo.id), None)
@@ -0,0 +1,250 @@
+"""
+Módulo: replicas.py
+Descrição: Roteamento das consultas de leitura para réplicas do banco de dados (DATABASE_REPLICA_URLS).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Cada réplica é registrada como um bind do Flask-SQLAlchemy ('replica_0', 'replica_1', ...), com as mesmas opções
+      de engine e pool do primário. Nenhum modelo é associado a esses binds e os seus metadados são descartados, de
+      modo que create_all(), drop_all() e as migrações continuam atuando apenas no primário.
+NOTE: Só vão para as réplicas as consultas de métodos marcados com o decorador somente_leitura e apenas enquanto a
+      sessão da requisição não tiver gravado nada: após o primeiro flush, todas as consultas da requisição voltam ao
+      primário (leitura após escrita). As réplicas são usadas em rodízio, uma por sessão: todas as leituras de uma
+      requisição vão para a mesma réplica e veem o mesmo estado da replicação.
+NOTE: Com BANCO_POOL_PRE_PING, cada conexão é testada antes do uso. Uma réplica que falhar ao conectar (ou perder a
+      conexão) fica fora do rodízio por REPLICA_QUARENTENA segundos, e a leitura que falhou é repetida no primário.
+      Ao fim da quarentena, a réplica só volta ao rodízio depois de responder a uma verificação ('SELECT 1'); sem
+      réplicas disponíveis, as leituras vão para o primário. A replicação é assíncrona: uma leitura em outra
+      requisição logo após uma gravação pode não ver a alteração ainda.
+NOTE: Para testar localmente com dois PostgreSQL (primário e réplica em streaming), ver db/replicas_locais.sh.
+"""
+
+from flask import g, current_app, has_app_context
+from flask_sqlalchemy.session import Session
+from functools import wraps
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+import itertools
+import threading
+import time
+
+PREFIXO_BIND = 'replica_'
+
+def binds_replicas(urls):
+    """
+    Monta os binds do Flask-SQLAlchemy para as réplicas.
+
+    Args:
+        urls (str): URLs das réplicas separadas por vírgula (DATABASE_REPLICA_URLS), ou None.
+
+    Returns:
+        dict: Bind por chave ('replica_0', ...), vazio se não houver réplicas.
+    """
+    urls = [url.strip() for url in (urls or '').split(',') if url.strip()]
+    return {f"{PREFIXO_BIND}{indice}": url for indice, url in enumerate(urls)}
+
+class Replicas:
+    """
+    Rodízio e estado de disponibilidade das réplicas de uma aplicação.
+
+    Args:
+        chaves (list): Chaves dos binds das réplicas.
+        quarentena (float): Segundos que uma réplica com falha fica fora do rodízio.
+    """
+
+    def __init__(self, chaves, quarentena):
+        self.chaves = chaves
+        self.quarentena = quarentena
+        self._rodizio = itertools.count()
+        self._indisponivel_ate = {}
+        self._trava = threading.Lock()
+
+    def escolher(self, engines):
+        """
+        Escolhe a próxima réplica disponível do rodízio.
+
+        Args:
+            engines (dict): Engines do Flask-SQLAlchemy, por chave de bind.
+
+        Returns:
+            str: Chave do bind da réplica, ou None se nenhuma estiver disponível.
+
+        NOTE: Uma réplica cuja quarentena terminou é verificada antes de voltar ao rodízio (ver verificar()).
+        """
+        if not self.chaves:
+            return None
+        inicio = next(self._rodizio)
+        for deslocamento in range(len(self.chaves)):
+            chave = self.chaves[(inicio + deslocamento) % len(self.chaves)]
+            if self.disponivel(chave) and (chave not in self._indisponivel_ate or self.verificar(chave, engines[chave])):
+                return chave
+        return None
+
+    def verificar(self, chave, engine):
+        """
+        Verifica se uma réplica que estava em quarentena voltou a responder.
+
+        Args:
+            chave (str): Chave do bind da réplica.
+            engine (Engine): Engine da réplica.
+
+        Returns:
+            bool: True se a réplica respondeu e voltou ao rodízio; False se continua (ou outra requisição já a está
+                  verificando) fora dele.
+
+        NOTE: A quarentena é renovada antes da verificação, de modo que apenas uma requisição por vez a faz.
+        """
+        with self._trava:
+            if not self.disponivel(chave) or chave not in self._indisponivel_ate:
+                return chave not in self._indisponivel_ate
+            self._indisponivel_ate[chave] = time.monotonic() + self.quarentena
+        try:
+            with engine.connect() as conexao:
+                conexao.execute(text('SELECT 1'))
+        except Exception:
+            self.marcar_indisponivel(chave)
+            return False
+        with self._trava:
+            self._indisponivel_ate.pop(chave, None)
+        return True
+
+    def marcar_indisponivel(self, chave):
+        """
+        Retira uma réplica do rodízio pelo tempo de quarentena.
+
+        Args:
+            chave (str): Chave do bind da réplica.
+        """
+        with self._trava:
+            self._indisponivel_ate[chave] = time.monotonic() + self.quarentena
+
+    def disponivel(self, chave):
+        """
+        Indica se uma réplica está no rodízio.
+
+        Args:
+            chave (str): Chave do bind da réplica.
+
+        Returns:
+            bool: True se a réplica não estiver em quarentena.
+        """
+        return self._indisponivel_ate.get(chave, 0) <= time.monotonic()
+
+class SessaoRoteada(Session):
+    """
+    Sessão do Flask-SQLAlchemy que envia as leituras dos métodos somente_leitura para as réplicas.
+
+    NOTE: A réplica escolhida fica em info['replica'] e é usada em todas as leituras da sessão. None indica que a
+          sessão lê do primário (sem réplicas disponíveis ou após uma falha da réplica).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """
+        Escolhe o engine de uma operação: a réplica da sessão, para leituras em métodos somente_leitura de requisições
+        que ainda não gravaram nada, ou o engine padrão do Flask-SQLAlchemy.
+
+        Returns:
+            Engine: Engine escolhido.
+        """
+        if (bind is None and not self._flushing and not self.info.get('gravou') and has_app_context()
+                and g.get('somente_leitura')):
+            replicas = current_app.extensions.get('replicas')
+            if replicas is not None:
+                if 'replica' not in self.info:
+                    self.info['replica'] = replicas.escolher(self._db.engines)
+                chave = self.info['replica']
+                if chave is not None and replicas.disponivel(chave):
+                    return self._db.engines[chave]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _repetir_no_primario(self, metodo, *args, **kwargs):
+        """
+        Executa uma operação da sessão e, se ela falhar porque a réplica da sessão caiu, a repete no primário.
+
+        Args:
+            metodo (Callable): Método da classe base (execute, scalar ou scalars).
+
+        Returns:
+            Resultado do método.
+
+        Raises:
+            DBAPIError: Se a falha não for de uma réplica retirada do rodízio, ou se a repetição também falhar.
+
+        NOTE: A repetição só ocorre em sessões que ainda não gravaram nada, para que o rollback não descarte alterações.
+        """
+        try:
+            return metodo(*args, **kwargs)
+        except DBAPIError:
+            chave = self.info.get('replica')
+            replicas = current_app.extensions.get('replicas') if has_app_context() else None
+            if chave is None or replicas is None or replicas.disponivel(chave) or self.info.get('gravou'):
+                raise
+            self.rollback()
+            self.info['replica'] = None
+            return metodo(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        return self._repetir_no_primario(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._repetir_no_primario(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        return self._repetir_no_primario(super().scalars, *args, **kwargs)
+
+@event.listens_for(SessaoRoteada, 'before_flush')
+def _registrar_gravacao(sessao, contexto, instancias):
+    """
+    Marca a sessão como tendo gravado, para que as consultas seguintes da requisição usem o primário.
+    """
+    sessao.info['gravou'] = True
+
+def somente_leitura(funcao):
+    """
+    Decorador de métodos de Resource cujas consultas podem ser atendidas pelas réplicas.
+
+    Args:
+        funcao (Callable): Método do Resource.
+
+    Returns:
+        Callable: Método decorado.
+    """
+    @wraps(funcao)
+    def envolvida(*args, **kwargs):
+        g.somente_leitura = True
+        return funcao(*args, **kwargs)
+    return envolvida
+
+def estado_replicas():
+    """
+    Retorna as réplicas configuradas e a disponibilidade de cada uma neste processo.
+
+    Returns:
+        dict: Disponibilidade (bool) por chave de bind.
+    """
+    replicas = current_app.extensions.get('replicas')
+    if replicas is None:
+        return {}
+    return {chave: replicas.disponivel(chave) for chave in replicas.chaves}
+
+def init_replicas(app, db):
+    """
+    Registra as réplicas configuradas em SQLALCHEMY_BINDS e monitora as falhas de conexão de cada uma.
+
+    Args:
+        app (Flask): Aplicação, já com o Flask-SQLAlchemy inicializado.
+        db (SQLAlchemy): Extensão do Flask-SQLAlchemy.
+    """
+    chaves = [chave for chave in app.config.get('SQLALCHEMY_BINDS', {}) if chave.startswith(PREFIXO_BIND)]
+    replicas = Replicas(chaves, app.config.get('REPLICA_QUARENTENA', 30))
+    app.extensions['replicas'] = replicas
+    if not chaves:
+        return
+    for chave in chaves:
+        db.metadatas.pop(chave, None)
+    with app.app_context():
+        for chave in chaves:
+            def falha(contexto, chave=chave):
+                if contexto.is_disconnect or contexto.connection is None:
+                    replicas.marcar_indisponivel(chave)
+            event.listen(db.engines[chave], 'handle_error', falha)
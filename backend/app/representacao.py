@@ -0,0 +1,117 @@
+"""
+Módulo: representacao.py
+Descrição: Serialização JSON das respostas da API com orjson.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: O orjson serializa nativamente UUID, datetime, date e Enum (pelo valor); Decimal é convertido para float.
+      Por isso os métodos json() dos modelos retornam os valores das colunas sem convertê-los para str.
+NOTE: O mesmo serializador é usado pelo Flask-RESTful (representação 'application/json'), por jsonify() (provedor
+      JSON da aplicação) e pelas colunas db.JSON (json_serializer do engine, ver app/db.py).
+"""
+
+from flask import make_response
+from flask.json.provider import JSONProvider
+from decimal import Decimal
+import orjson
+
+OPCOES = orjson.OPT_NON_STR_KEYS
+
+def _padrao(valor):
+    """
+    Converte os tipos que o orjson não serializa nativamente.
+
+    Args:
+        valor: Valor não suportado.
+
+    Returns:
+        Valor serializável.
+
+    Raises:
+        TypeError: Se o tipo não for suportado.
+    """
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    raise TypeError(f"Tipo {type(valor).__name__} não é serializável em JSON")
+
+def dumps(dados):
+    """
+    Serializa um valor em JSON.
+
+    Args:
+        dados: Valor a serializar.
+
+    Returns:
+        bytes: JSON em UTF-8.
+    """
+    return orjson.dumps(dados, default=_padrao, option=OPCOES)
+
+def dumps_texto(dados):
+    """
+    Serializa um valor em JSON, como texto.
+
+    Args:
+        dados: Valor a serializar.
+
+    Returns:
+        str: JSON.
+    """
+    return dumps(dados).decode()
+
+def saida_json(dados, codigo, headers=None):
+    """
+    Representação 'application/json' do Flask-RESTful.
+
+    Args:
+        dados: Corpo retornado pelo Resource.
+        codigo (int): Código HTTP.
+        headers (dict, optional): Headers adicionais.
+
+    Returns:
+        Response: Resposta com o corpo serializado.
+    """
+    resposta = make_response(dumps(dados), codigo)
+    resposta.headers['Content-Type'] = 'application/json'
+    resposta.headers.extend(headers or {})
+    return resposta
+
+class ProvedorJSON(JSONProvider):
+    """
+    Provedor JSON do Flask baseado em orjson, usado por jsonify() e request.get_json().
+    """
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serializa um valor em JSON.
+
+        Args:
+            obj: Valor a serializar.
+
+        Returns:
+            str: JSON.
+        """
+        return dumps_texto(obj)
+
+    def loads(self, s, **kwargs):
+        """
+        Interpreta um documento JSON.
+
+        Args:
+            s (str | bytes): Documento JSON.
+
+        Returns:
+            Valor interpretado.
+        """
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Cria uma resposta JSON, como jsonify().
+
+        Returns:
+            Response: Resposta com o corpo serializado.
+        """
+        dados = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(dados), mimetype='application/json')
@@ -11,144 +11,40 @@ TODO: Implementar logging de erros para monitoramento em produção.
 
 from app.db import db
 from app.models.usuarios import Usuario
-from app.models.entrega import Entrega, StatusEntrega
+from app.models.entrega import Entrega
 from app.models.localizacao import Localizacao
-from flask_restful import Resource, reqparse
+from flask_restful import Resource
 from flask_jwt_extended import jwt_required, create_access_token, get_jwt_identity, get_jwt
 from werkzeug.utils import secure_filename
 import uuid
 from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 from datetime import datetime
 from app.utils import check_if_token_in_blacklist, add_to_blacklist
+from app.limites import LIMITES_LOGIN, LIMITES_IOT
+from app.compressao import nivel_compressao
 import os
-import secrets
-import string
-from flask import request, current_app
+from flask import request, current_app, send_file
 from flask_babel import gettext
+from app.esquemas import Esquema, Campo
+from app.validadores import validar_cnh, validar_placa, validar_endereco, validar_max_length, validar_range, validar_data, validar_uuid
+from app.importacao import importar_entregas, LIMITE_LINHAS_LOTE
+from app.numero_pedido import obter_alocador
+from app.referencias import existe
+from app.perfis import obter_perfil, invalidar_perfil
+from app.eventos import registrar_eventos, consultar_estatisticas
+from app.fotos import iniciar_upload, estado_upload, receber_parte, guardar_foto, agendar_variantes, estado_processamento, resolver_foto, ConflitoUpload
+from app.sincronizacao import aplicar_mutacoes, LIMITE_MUTACOES_SYNC
+from app.ingestao import ESQUEMA_LOCALIZACAO_IOT
+from app.conexoes import estatisticas_pool
+from app.replicas import somente_leitura, estado_replicas
+from app.metricas import gerar_metricas, autorizado
+from app.leitura import listar_entregas, obter_entrega, listar_localizacoes, obter_localizacao
+from app.busca import validar_termo, buscar_entregas, POR_PAGINA_PADRAO, POR_PAGINA_MAXIMO
+from app.transicoes import interpretar_status, validar_campos_status, transicionar_status, atualizar_status_lote, ConflitoStatus, LIMITE_ENTREGAS_LOTE
+import mimetypes
 import re
-
-def gerar_numero_pedido():
-    """
-    Gera um código de rastreamento aleatório com 6 caracteres (letras e números, maiúsculas).
-
-    Returns:
-        str: Código de rastreamento gerado único.
-
-    Raises:
-        RuntimeError: Se não for possível gerar um número único após várias tentativas.
-
-    NOTE: Garante unicidade verificando no banco de dados.
-    TODO: Limitar o número de tentativas para evitar loops infinitos em cenários de alta concorrência.
-    """
-    tentativas = 0
-    max_tentativas = 100
-    while tentativas < max_tentativas:
-        numero = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))
-        if not Entrega.query.filter_by(numero_pedido=numero).first():
-            return numero
-        tentativas += 1
-    raise RuntimeError("Não foi possível gerar um número de pedido único após várias tentativas.")
-
-def validar_cnh(value):
-    """
-    Valida o formato da CNH.
-
-    Args:
-        value (str): Valor da CNH a validar.
-
-    Returns:
-        str: Valor validado.
-
-    Raises:
-        ValueError: Se o formato for inválido ou o valor for vazio.
-    """
-    if not value:
-        raise ValueError("CNH não pode ser vazia")
-    if not re.fullmatch(r'^\d{11}$', value):
-        raise ValueError("CNH deve ter exatamente 11 dígitos numéricos")
-    return value
-
-def validar_placa(value):
-    """
-    Valida o formato da placa de veículo.
-
-    Args:
-        value (str): Valor da placa a validar.
-
-    Returns:
-        str: Valor validado.
-
-    Raises:
-        ValueError: Se o formato for inválido ou o valor for vazio.
-    """
-    if not value:
-        raise ValueError("Placa não pode ser vazia")
-    if not re.match(r'^[A-Za-z]{3}-[0-9]{4}$', value):
-        raise ValueError("Placa deve seguir o formato XXX-1234")
-    return value.upper()
-
-def validar_endereco(value):
-    """
-    Valida o comprimento do endereço de entrega.
-
-    Args:
-        value (str): Valor do endereço a validar.
-
-    Returns:
-        str: Valor validado.
-
-    Raises:
-        ValueError: Se o comprimento exceder o limite ou for vazio.
-    """
-    if not value:
-        raise ValueError("Endereço de entrega não pode ser vazio")
-    if len(value) > 255:
-        raise ValueError("Endereço de entrega deve ter no máximo 255 caracteres")
-    return value
-
-def validar_max_length(max_length):
-    """
-    Cria um validador para comprimento máximo de string.
-
-    Args:
-        max_length (int): Comprimento máximo permitido.
-
-    Returns:
-        function: Função validadora.
-    """
-    def validator(value):
-        if value is not None:
-            if not isinstance(value, str):
-                raise ValueError("Valor deve ser uma string")
-            if len(value) > max_length:
-                raise ValueError(f"O valor deve ter no máximo {max_length} caracteres")
-        return value
-    return validator
-
-def validar_range(min_value=None, max_value=None):
-    """
-    Cria um validador para faixa numérica.
-
-    Args:
-        min_value (float, optional): Valor mínimo.
-        max_value (float, optional): Valor máximo.
-
-    Returns:
-        function: Função validadora.
-    """
-    def validator(value):
-        if value is None:
-            return value
-        try:
-            num = float(value)
-        except ValueError:
-            raise ValueError("Valor deve ser um número válido")
-        if min_value is not None and num < min_value:
-            raise ValueError(f"O valor mínimo permitido é {min_value}")
-        if max_value is not None and num > max_value:
-            raise ValueError(f"O valor máximo permitido é {max_value}")
-        return num
-    return validator
+import time
 
 class Ping(Resource):
     def get(self):
@@ -161,9 +57,11 @@ class Ping(Resource):
         return {"pong": True, "message": gettext("API está no ar com sucesso."), "status": True}, 200
 
 class LoginResource(Resource):
-    args = reqparse.RequestParser()
-    args.add_argument('cnh', type=validar_cnh, required=True, help='CNH deve ter 11 dígitos')
-    args.add_argument('placa_veiculo', type=validar_placa, required=True, help='Placa inválida')
+    decorators = LIMITES_LOGIN
+    esquema = Esquema(
+        cnh=Campo(tipo=validar_cnh, obrigatorio=True, mensagem='CNH deve ter 11 dígitos'),
+        placa_veiculo=Campo(tipo=validar_placa, obrigatorio=True, mensagem='Placa inválida')
+    )
 
     def post(self):
         """
@@ -186,11 +84,12 @@ class LoginResource(Resource):
             Exception: Para erros internos gerais.
 
         NOTE: Este endpoint não exige autenticação prévia.
-        TODO: Implementar limite de tentativas de login para prevenir ataques de força bruta.
+        NOTE: A busca por (cnh, placa_veiculo) usa o índice único uq_usuario_cnh_placa_veiculo.
+        NOTE: Tentativas limitadas por IP a LIMITE_LOGIN (ver app/limites.py), para dificultar ataques de força bruta.
         TODO: Adicionar suporte a autenticação multi-fator em futuras versões.
         """
         try:
-            dados = LoginResource.args.parse_args()
+            dados = LoginResource.esquema.validar()
             usuario = Usuario.query.filter_by(cnh=dados['cnh'], placa_veiculo=dados['placa_veiculo']).first()
             if not usuario:
                 return {"error": gettext("Credenciais inválidas. Verifique CNH e placa."), "status": False}, 401
@@ -229,7 +128,7 @@ class LogoutResource(Resource):
             jwt_data = get_jwt()
             if 'jti' not in jwt_data:
                 return {"error": "Token JWT inválido: 'jti' não encontrado.", "status": False}, 400
-            add_to_blacklist(jwt_data['jti'])
+            add_to_blacklist(jwt_data['jti'], jwt_data.get('exp'))
             return {"message": gettext("Logout realizado com sucesso."), "status": True}, 200
         except KeyError as e:
             return {"error": f"Erro no token: {str(e)}", "status": False}, 400
@@ -240,10 +139,10 @@ class SessionResource(Resource):
     @jwt_required()
     def get(self):
         """
-        Valida o token JWT atual, retorna os dados do usuário logado e renova o token estendendo seu tempo de expiração.
+        Valida o token JWT atual, retorna os dados do usuário logado e renova o token quando estiver perto de expirar.
 
         Returns:
-            tuple: JSON com dados do usuário, novo token de acesso, mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com dados do usuário, token de acesso, indicador 'renovado', mensagem de sucesso e 'status' verdadeiro (status 200).
             tuple: JSON com 'error' e 'status' falso (status 404) se o usuário não for encontrado.
             tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
 
@@ -251,31 +150,39 @@ class SessionResource(Resource):
             Exception: Erros gerais (tratados pelo errorhandler global).
 
         NOTE: O token é validado automaticamente pelo @jwt_required(), incluindo verificação de blacklist e expiração.
-              Um novo token é gerado para renovar a sessão, mantendo o identity do usuário.
+              Um novo token só é assinado quando faltarem menos de SESSAO_RENOVACAO segundos para a expiração do atual;
+              caso contrário, o próprio token recebido é devolvido em 'access_token'.
+        NOTE: Os dados do usuário vêm do cache de perfis (app/perfis.py).
         """
         try:
             user_id = get_jwt_identity()
-            user = Usuario.query.get(user_id)
-            if not user:
+            perfil = obter_perfil(user_id)
+            if not perfil:
                 return {"error": gettext("Usuário não encontrado."), "status": False}, 404
 
-            new_token = create_access_token(identity=user_id)
+            renovar = get_jwt()['exp'] - time.time() < current_app.config.get('SESSAO_RENOVACAO', 86400)
+            if renovar:
+                token = create_access_token(identity=user_id)
+            else:
+                token = request.headers['Authorization'].split()[-1]
 
             return {
-                "Usuario": user.json(),
-                "access_token": new_token,
-                "message": gettext("Sessão válida e renovada com sucesso."),
+                "Usuario": perfil,
+                "access_token": token,
+                "renovado": renovar,
+                "message": gettext("Sessão válida e renovada com sucesso.") if renovar else gettext("Sessão válida."),
                 "status": True
             }, 200
         except Exception as e:
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
 
 class UsuarioResource(Resource):
-    args = reqparse.RequestParser()
-    args.add_argument('nome', type=validar_max_length(255), required=True, help='Nome é obrigatório e deve ter no máximo 255 caracteres')
-    args.add_argument('placa_veiculo', type=validar_placa, required=True, help='Placa inválida')
-    args.add_argument('cnh', type=validar_cnh, required=True, help='CNH deve ter 11 dígitos')
-    args.add_argument('telefone', type=validar_max_length(11), required=True, help='Telefone deve ter no máximo 11 dígitos')
+    esquema = Esquema(
+        nome=Campo(tipo=validar_max_length(255), obrigatorio=True, mensagem='Nome é obrigatório e deve ter no máximo 255 caracteres'),
+        placa_veiculo=Campo(tipo=validar_placa, obrigatorio=True, mensagem='Placa inválida'),
+        cnh=Campo(tipo=validar_cnh, obrigatorio=True, mensagem='CNH deve ter 11 dígitos'),
+        telefone=Campo(tipo=validar_max_length(11), obrigatorio=True, mensagem='Telefone deve ter no máximo 11 dígitos')
+    )
 
     def post(self):
         """
@@ -302,7 +209,7 @@ class UsuarioResource(Resource):
         NOTE: Não requer autenticação para criação de usuário (cadastro inicial).
         """
         try:
-            dados = UsuarioResource.args.parse_args()
+            dados = UsuarioResource.esquema.validar()
             usuario = Usuario(**dados)
             db.session.add(usuario)
             db.session.commit()
@@ -344,11 +251,11 @@ class UsuarioResource(Resource):
         """
         try:
             if user_id:
-                usuario = Usuario.query.get(user_id)
-                if not usuario:
+                perfil = obter_perfil(user_id)
+                if not perfil:
                     return {"error": f"Usuário com ID {user_id} não encontrado.", "status": False}, 404
                 return {
-                    "Usuario": usuario.json(),
+                    "Usuario": perfil,
                     "message": gettext("Usuário encontrado com sucesso."),
                     "status": True
                 }, 200
@@ -391,7 +298,7 @@ class UsuarioResource(Resource):
             usuario = Usuario.query.get(user_id)
             if not usuario:
                 return {"error": f"Usuário com ID {user_id} não encontrado.", "status": False}, 404
-            dados = UsuarioResource.args.parse_args()
+            dados = UsuarioResource.esquema.validar()
             atualizacoes = 0
             for campo, valor in dados.items():
                 if valor is not None:
@@ -400,6 +307,7 @@ class UsuarioResource(Resource):
             if atualizacoes == 0:
                 return {"error": "Nenhum campo fornecido para atualização.", "status": False}, 400
             db.session.commit()
+            invalidar_perfil(user_id)
             return {
                 "Usuario": usuario.json(),
                 "message": gettext("Usuário atualizado com sucesso."),
@@ -440,6 +348,7 @@ class UsuarioResource(Resource):
                 return {"error": f"Usuário com ID {user_id} não encontrado.", "status": False}, 404
             db.session.delete(usuario)
             db.session.commit()
+            invalidar_perfil(user_id)
             return {"message": gettext("Usuário deletado com sucesso."), "status": True}, 200
         except IntegrityError as e:
             db.session.rollback()
@@ -449,13 +358,14 @@ class UsuarioResource(Resource):
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
 
 class EntregaResource(Resource):
-    args = reqparse.RequestParser()
-    args.add_argument('motorista_id', type=str, required=True, help='ID do motorista é obrigatório')
-    args.add_argument('endereco_entrega', type=validar_endereco, required=True, help='Endereço inválido')
-    args.add_argument('nome_cliente', type=validar_max_length(255), required=True, help='Nome do cliente é obrigatório')
-    args.add_argument('observacao', type=validar_max_length(255), required=False, help='Observação inválida')
-    args.add_argument('foto_prova', type=validar_max_length(255), required=False, help='Foto de prova inválida')
-    args.add_argument('motivo', type=validar_max_length(255), required=False, help='Motivo inválido')
+    esquema = Esquema(
+        motorista_id=Campo(obrigatorio=True, mensagem='ID do motorista é obrigatório'),
+        endereco_entrega=Campo(tipo=validar_endereco, obrigatorio=True, mensagem='Endereço inválido'),
+        nome_cliente=Campo(tipo=validar_max_length(255), obrigatorio=True, mensagem='Nome do cliente é obrigatório'),
+        observacao=Campo(tipo=validar_max_length(255), mensagem='Observação inválida'),
+        foto_prova=Campo(tipo=validar_max_length(255), mensagem='Foto de prova inválida'),
+        motivo=Campo(tipo=validar_max_length(255), mensagem='Motivo inválido')
+    )
 
     @jwt_required()
     def post(self):
@@ -482,15 +392,18 @@ class EntregaResource(Resource):
             RuntimeError: Se falhar na geração do número de pedido.
             Exception: Erros gerais.
 
-        NOTE: Gera número de pedido único automaticamente.
+        NOTE: Gera número de pedido único automaticamente a partir da sequência do banco (ver app/numero_pedido.py).
+              A criação é registrada no histórico de eventos e nos contadores diários (ver app/eventos.py).
         """
         try:
-            dados = EntregaResource.args.parse_args()
-            if not Usuario.query.get(dados['motorista_id']):
+            dados = EntregaResource.esquema.validar()
+            if not existe(Usuario, dados['motorista_id']):
                 raise ValueError("Motorista não encontrado com o ID fornecido.")
-            dados['numero_pedido'] = gerar_numero_pedido()
+            dados['numero_pedido'] = obter_alocador().proximo()
             entrega = Entrega(**dados)
             db.session.add(entrega)
+            db.session.flush()
+            registrar_eventos([{'entrega_id': entrega.id, 'motorista_id': entrega.motorista_id, 'status': entrega.status, 'motivo': entrega.motivo}])
             db.session.commit()
             return {
                 "Entrega": entrega.json(),
@@ -511,6 +424,7 @@ class EntregaResource(Resource):
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
 
     @jwt_required()
+    @somente_leitura
     def get(self, entrega_id=None):
         """
         Lista todas as entregas ou recupera uma entrega específica.
@@ -527,10 +441,11 @@ class EntregaResource(Resource):
             Exception: Para erros internos.
 
         NOTE: Para listagem, retorna vazio se não houver entregas.
+        NOTE: Lê as colunas sem instanciar o modelo do ORM (ver app/leitura.py).
         """
         try:
             if entrega_id:
-                entrega = Entrega.query.get(entrega_id)
+                entrega = obter_entrega(id=entrega_id)
                 if not entrega:
                     return {"error": f"Entrega com ID {entrega_id} não encontrada.", "status": False}, 404
                 return {
@@ -539,7 +454,7 @@ class EntregaResource(Resource):
                     "status": True
                 }, 200
             else:
-                entregas = Entrega.query.all()
+                entregas = listar_entregas()
                 if not entregas:
                     return {"message": "Nenhuma entrega encontrada.", "status": True, "Entregas": []}, 200
                 return {
@@ -563,22 +478,24 @@ class EntregaResource(Resource):
             tuple: JSON com dados atualizados, mensagem de sucesso e 'status' verdadeiro (status 200).
             tuple: JSON com 'error' e 'status' falso (status 404) se não encontrada.
             tuple: JSON com 'error' e 'status' falso (status 400) se dados inválidos, sem atualizações ou integridade violada.
+            tuple: JSON com 'error' e 'status' falso (status 409) se a entrega foi alterada por outra requisição durante a atualização.
             tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
 
         Raises:
             ValueError: Se dados forem inválidos ou motorista não existir.
             IntegrityError: Violação de integridade.
+            StaleDataError: Se a versão da entrega mudou entre a leitura e a gravação.
             Exception: Erros gerais.
         """
         try:
             entrega = Entrega.query.get(entrega_id)
             if not entrega:
                 return {"error": f"Entrega com ID {entrega_id} não encontrada.", "status": False}, 404
-            dados = EntregaResource.args.parse_args()
+            dados = EntregaResource.esquema.validar()
             atualizacoes = 0
             for campo, valor in dados.items():
                 if valor is not None:
-                    if campo == 'motorista_id' and not Usuario.query.get(valor):
+                    if campo == 'motorista_id' and not existe(Usuario, valor):
                         raise ValueError("Motorista não encontrado com o ID fornecido para atualização.")
                     setattr(entrega, campo, valor)
                     atualizacoes += 1
@@ -596,6 +513,9 @@ class EntregaResource(Resource):
         except IntegrityError as e:
             db.session.rollback()
             return {"error": f"Violação de integridade durante atualização: {str(e)}", "status": False}, 400
+        except StaleDataError:
+            db.session.rollback()
+            return {"error": "A entrega foi alterada por outra requisição. Recarregue e tente novamente.", "status": False}, 409
         except Exception as e:
             db.session.rollback()
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
@@ -634,8 +554,337 @@ class EntregaResource(Resource):
             db.session.rollback()
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
 
+class EntregaLoteResource(Resource):
+    @jwt_required()
+    def post(self):
+        """
+        Cria várias entregas em uma única transação.
+
+        Args:
+            JSON Body:
+                entregas (list): Lista de entregas, cada uma com os mesmos campos de POST /entregas.
+                parcial (bool, optional): Se verdadeiro, importa as linhas válidas mesmo havendo linhas com erro.
+
+        Returns:
+            tuple: JSON com as entregas criadas (linha, id, numero_pedido), erros por linha, mensagem de sucesso e 'status' verdadeiro (status 201).
+            tuple: JSON com 'error', erros por linha e 'status' falso (status 400) se o lote for inválido ou houver linhas com erro sem 'parcial'.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            IntegrityError: Violação de integridade.
+            RuntimeError: Se falhar na reserva dos números de pedido.
+            Exception: Erros gerais.
+
+        NOTE: Os motoristas são verificados com uma única consulta e os números de pedido são reservados em bloco.
+        """
+        try:
+            corpo = request.get_json(silent=True) or {}
+            linhas = corpo.get('entregas')
+            if not isinstance(linhas, list) or not linhas:
+                return {"error": "O campo 'entregas' deve ser uma lista não vazia.", "status": False}, 400
+            if len(linhas) > LIMITE_LINHAS_LOTE:
+                return {"error": f"O lote deve ter no máximo {LIMITE_LINHAS_LOTE} entregas.", "status": False}, 400
+            criadas, erros = importar_entregas(linhas, parcial=bool(corpo.get('parcial')))
+            if not criadas:
+                db.session.rollback()
+                return {
+                    "error": f"Dados inválidos em {len(erros)} linha(s). Nenhuma entrega foi importada.",
+                    "Erros": erros,
+                    "status": False
+                }, 400
+            db.session.commit()
+            return {
+                "Entregas": criadas,
+                "Erros": erros,
+                "message": gettext("Entregas importadas com sucesso."),
+                "status": True
+            }, 201
+        except IntegrityError as e:
+            db.session.rollback()
+            return {"error": f"Violação de integridade: {str(e)}", "status": False}, 400
+        except RuntimeError as e:
+            db.session.rollback()
+            return {"error": f"Erro na geração do número de pedido: {str(e)}", "status": False}, 500
+        except Exception as e:
+            db.session.rollback()
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class EntregaFotoResource(Resource):
+    @jwt_required()
+    def post(self, entrega_id):
+        """
+        Abre uma sessão de upload da foto de prova de uma entrega.
+
+        Args:
+            entrega_id (str): ID da entrega.
+            JSON Body:
+                tamanho (int): Tamanho do arquivo, em bytes.
+                sha256 (str): Hash SHA-256 do arquivo, em hexadecimal.
+                tipo (str): Tipo da imagem (image/jpeg, image/png ou image/webp).
+
+        Returns:
+            tuple: JSON com o estado do upload (upload_id, recebido, tamanho, concluido), mensagem de sucesso e 'status' verdadeiro (status 201).
+            tuple: JSON com 'error' e 'status' falso (status 404) se a entrega não existir.
+            tuple: JSON com 'error' e 'status' falso (status 400) se os dados forem inválidos.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            ValueError: Se tamanho, hash ou tipo forem inválidos.
+            Exception: Erros gerais.
+
+        NOTE: Os bytes são enviados depois com PATCH /entregas/<id>/foto/<upload_id> (ver app/fotos.py).
+        """
+        try:
+            if not existe(Entrega, entrega_id):
+                return {"error": f"Entrega com ID {entrega_id} não encontrada.", "status": False}, 404
+            corpo = request.get_json(silent=True) or {}
+            estado = iniciar_upload(entrega_id, corpo.get('tamanho'), corpo.get('sha256'), corpo.get('tipo'))
+            return {
+                "Upload": estado,
+                "message": gettext("Upload iniciado com sucesso."),
+                "status": True
+            }, 201
+        except ValueError as e:
+            return {"error": f"Dados inválidos: {str(e)}", "status": False}, 400
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+    @jwt_required()
+    def get(self, entrega_id, upload_id):
+        """
+        Informa quantos bytes de um upload já foram recebidos, para retomar o envio.
+
+        Args:
+            entrega_id (str): ID da entrega.
+            upload_id (str): ID do upload.
+
+        Returns:
+            tuple: JSON com o estado do upload, mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com 'error' e 'status' falso (status 404) se o upload não existir ou já tiver sido concluído.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            LookupError: Se o upload não existir.
+            Exception: Erros gerais.
+        """
+        try:
+            return {
+                "Upload": estado_upload(upload_id, entrega_id),
+                "message": gettext("Upload encontrado com sucesso."),
+                "status": True
+            }, 200
+        except LookupError as e:
+            return {"error": str(e), "status": False}, 404
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+    @jwt_required()
+    def patch(self, entrega_id, upload_id):
+        """
+        Recebe uma parte da foto, gravada a partir do deslocamento informado no header 'Upload-Offset'.
+
+        Args:
+            entrega_id (str): ID da entrega.
+            upload_id (str): ID do upload.
+            Headers:
+                Upload-Offset (int): Posição do primeiro byte enviado (igual aos bytes já recebidos).
+            Body: Bytes da parte (application/offset+octet-stream ou application/octet-stream).
+
+        Returns:
+            tuple: JSON com o estado do upload, mensagem de sucesso e 'status' verdadeiro (status 200). Na última parte,
+                   inclui a entrega com 'foto_prova' e as URLs em 'fotos' atualizados.
+            tuple: JSON com 'error' e 'status' falso (status 400) se o header faltar, a parte exceder o tamanho ou o hash não conferir.
+            tuple: JSON com 'error' e 'status' falso (status 404) se o upload ou a entrega não existirem.
+            tuple: JSON com 'error', 'recebido' e 'status' falso (status 409) se o deslocamento não corresponder aos bytes recebidos
+                   ou outra parte do mesmo upload estiver sendo gravada.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            ValueError: Se a parte for inválida ou o arquivo não conferir com o hash.
+            LookupError: Se o upload não existir.
+            ConflitoUpload: Se o deslocamento estiver incorreto.
+            Exception: Erros gerais.
+
+        NOTE: O corpo é copiado para o disco em blocos, sem ser carregado na memória. Cada parte é limitada por
+              MAX_CONTENT_LENGTH; fotos maiores devem ser enviadas em várias partes.
+        NOTE: Concluído o upload, a miniatura e a versão web são geradas em segundo plano; suas URLs respondem 404
+              até ficarem prontas. Se o agendamento falhar, a foto é mantida e o erro vai para o log; as variantes
+              são geradas depois por 'flask processar-fotos'.
+        NOTE: A foto é associada à entrega sem conferir 'versao' (que é incrementada), pois a sessão de upload termina
+              com a última parte e não haveria como reenviá-la após um conflito.
+        """
+        try:
+            deslocamento = request.headers.get('Upload-Offset', type=int)
+            if deslocamento is None:
+                return {"error": "O header 'Upload-Offset' é obrigatório e deve ser um número inteiro.", "status": False}, 400
+            estado, foto = receber_parte(upload_id, entrega_id, deslocamento, request.stream)
+            if foto is None:
+                return {
+                    "Upload": estado,
+                    "message": gettext("Parte recebida com sucesso."),
+                    "status": True
+                }, 200
+            if not existe(Entrega, entrega_id):
+                os.remove(foto[0])
+                return {"error": f"Entrega com ID {entrega_id} não encontrada.", "status": False}, 404
+            # Sem conferir a versão: a sessão de upload já foi encerrada e a parte final não pode ser reenviada, então
+            # uma mudança concorrente (ex.: de status) não deve impedir a foto de ser associada à entrega.
+            entrega = db.session.execute(
+                db.update(Entrega).where(Entrega.id == entrega_id)
+                .values(foto_prova=guardar_foto(*foto), versao=Entrega.versao + 1).returning(Entrega),
+                execution_options={'synchronize_session': False, 'populate_existing': True}
+            ).scalar_one_or_none()
+            if entrega is None:
+                db.session.rollback()
+                return {"error": f"Entrega com ID {entrega_id} não encontrada.", "status": False}, 404
+            db.session.commit()
+            try:
+                agendar_variantes(entrega.foto_prova)
+            except Exception:
+                # A foto já foi gravada: as variantes ficam para 'flask processar-fotos'.
+                current_app.logger.exception("Falha ao agendar as variantes de %s", entrega.foto_prova)
+            return {
+                "Upload": estado,
+                "Entrega": entrega.json(),
+                "message": gettext("Foto de prova enviada com sucesso."),
+                "status": True
+            }, 200
+        except ConflitoUpload as e:
+            return {"error": str(e), "recebido": e.recebido, "status": False}, 409
+        except LookupError as e:
+            return {"error": str(e), "status": False}, 404
+        except ValueError as e:
+            return {"error": f"Dados inválidos: {str(e)}", "status": False}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class FotoResource(Resource):
+    CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+    @jwt_required()
+    def get(self, identificador):
+        """
+        Serve uma foto de prova ou uma de suas variantes.
+
+        Args:
+            identificador (str): '<hash>' para a original ou '<hash>-miniatura' / '<hash>-web' para as variantes.
+            Headers:
+                Range (str, optional): Intervalo de bytes desejado (ex.: 'bytes=0-1023').
+                If-None-Match (str, optional): ETag já armazenado pelo cliente.
+
+        Returns:
+            Response: Arquivo (status 200), parte dele (status 206) ou resposta vazia (status 304) se o ETag conferir.
+            tuple: JSON com 'error' e 'status' falso (status 404) se a foto não existir ou a variante ainda não estiver pronta.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            Exception: Erros gerais.
+
+        NOTE: Os arquivos são endereçados pelo conteúdo e nunca mudam, por isso o identificador é usado como ETag forte
+              e a resposta pode ser guardada pelo cliente indefinidamente. O corpo é entregue como arquivo ao servidor
+              WSGI, que o envia com sendfile() sem passar pelo Python. Com FOTO_X_ACCEL_PREFIX definido, o envio é
+              delegado ao nginx pelo header X-Accel-Redirect.
+        """
+        try:
+            caminho = resolver_foto(identificador)
+            if caminho is None:
+                return {"error": "Foto não encontrada.", "status": False}, 404
+            prefixo = current_app.config.get('FOTO_X_ACCEL_PREFIX')
+            if prefixo:
+                relativo = os.path.relpath(caminho, current_app.config['UPLOAD_FOLDER']).replace(os.sep, '/')
+                resposta = current_app.response_class(mimetype=mimetypes.guess_type(caminho)[0])
+                resposta.headers['X-Accel-Redirect'] = f"{prefixo.rstrip('/')}/{relativo}"
+            else:
+                resposta = send_file(caminho, conditional=True, etag=identificador, max_age=31536000)
+                resposta.accept_ranges = 'bytes'
+            resposta.set_etag(identificador)
+            resposta.headers['Cache-Control'] = self.CACHE_CONTROL
+            return resposta
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class FotoProcessamentoResource(Resource):
+    @jwt_required()
+    def get(self):
+        """
+        Informa a fila de geração das variantes das fotos de prova no processo que atendeu a requisição.
+
+        Returns:
+            tuple: JSON com os indicadores do processamento, mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            Exception: Erros gerais.
+        """
+        try:
+            return {
+                "Processamento": estado_processamento(),
+                "message": gettext("Processamento de fotos consultado com sucesso."),
+                "status": True
+            }, 200
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class PoolBancoResource(Resource):
+    @jwt_required()
+    def get(self):
+        """
+        Informa a ocupação e os tempos de espera do pool de conexões com o banco no processo que atendeu a requisição.
+
+        Returns:
+            tuple: JSON com as estatísticas do pool do primário e de cada réplica (com a disponibilidade no rodízio),
+                   mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            Exception: Erros gerais.
+        """
+        try:
+            return {
+                "Pool": estatisticas_pool(db.engine),
+                "Replicas": {
+                    chave: {"disponivel": disponivel, **estatisticas_pool(db.engines[chave])}
+                    for chave, disponivel in estado_replicas().items()
+                },
+                "message": gettext("Pool de conexões consultado com sucesso."),
+                "status": True
+            }, 200
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class MetricasResource(Resource):
+    def get(self):
+        """
+        Exporta as métricas da API no formato de texto do Prometheus (ver app/metricas.py).
+
+        Headers:
+            Authorization (str): 'Bearer <METRICAS_TOKEN>', obrigatório apenas se METRICAS_TOKEN estiver definido.
+
+        Returns:
+            Response: Métricas em texto (status 200).
+            tuple: JSON com 'error' e 'status' falso (status 401) se o token for exigido e não conferir.
+            tuple: JSON com 'error' e 'status' falso (status 404) se as métricas estiverem desativadas.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            Exception: Erros gerais.
+
+        NOTE: O coletor do Prometheus não usa o JWT dos usuários; sem METRICAS_TOKEN, restrinja a rota no proxy.
+        """
+        try:
+            if not current_app.config.get('METRICAS_ATIVAS', True):
+                return {"error": "Métricas desativadas.", "status": False}, 404
+            if not autorizado(request.headers.get('Authorization'), current_app.config.get('METRICAS_TOKEN')):
+                return {"error": "Token de métricas inválido.", "status": False}, 401
+            corpo, tipo = gerar_metricas()
+            return current_app.response_class(corpo, mimetype=None, content_type=tipo)
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
 class EntregaPorNumeroResource(Resource):
     @jwt_required()
+    @somente_leitura
     def get(self, numero_pedido):
         """
         Recupera uma entrega pelo número do pedido.
@@ -658,7 +907,7 @@ class EntregaPorNumeroResource(Resource):
         try:
             if not re.match(r'^[A-Z0-9]{6}$', numero_pedido):
                 raise ValueError("Número do pedido deve ter exatamente 6 caracteres alfanuméricos maiúsculos.")
-            entrega = Entrega.query.filter_by(numero_pedido=numero_pedido).first()
+            entrega = obter_entrega(numero_pedido=numero_pedido)
             if not entrega:
                 return {"error": f"Entrega com número {numero_pedido} não encontrada.", "status": False}, 404
             return {
@@ -673,6 +922,7 @@ class EntregaPorNumeroResource(Resource):
 
 class EntregaPorMotoristaResource(Resource):
     @jwt_required()
+    @somente_leitura
     def get(self, motorista_id):
         """
         Lista entregas por motorista.
@@ -691,9 +941,9 @@ class EntregaPorMotoristaResource(Resource):
         NOTE: Verifica se o motorista existe antes de listar.
         """
         try:
-            if not Usuario.query.get(motorista_id):
+            if not existe(Usuario, motorista_id):
                 return {"error": f"Motorista com ID {motorista_id} não encontrado.", "status": False}, 404
-            entregas = Entrega.query.filter_by(motorista_id=motorista_id).all()
+            entregas = listar_entregas(motorista_id=motorista_id)
             if not entregas:
                 return {"error": f"Nenhuma entrega encontrada para o motorista {motorista_id}.", "status": False}, 404
             return {
@@ -705,10 +955,12 @@ class EntregaPorMotoristaResource(Resource):
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
 
 class EntregaStatusResource(Resource):
-    args = reqparse.RequestParser()
-    args.add_argument('status', type=str, required=True, help='Status é obrigatório')
-    args.add_argument('nome_recebido', type=validar_max_length(255), required=False, help='Nome recebido inválido')
-    args.add_argument('motivo', type=validar_max_length(255), required=False, help='Motivo inválido')
+    esquema = Esquema(
+        status=Campo(obrigatorio=True, mensagem='Status é obrigatório'),
+        nome_recebido=Campo(tipo=validar_max_length(255), mensagem='Nome recebido inválido'),
+        motivo=Campo(tipo=validar_max_length(255), mensagem='Motivo inválido'),
+        versao=Campo(tipo=int, mensagem='Versão deve ser um número inteiro')
+    )
 
     @jwt_required()
     def put(self, entrega_id):
@@ -721,45 +973,110 @@ class EntregaStatusResource(Resource):
                 status (str): Novo status da entrega (pendente, em_rota, entregue, cancelada, nao_entregue).
                 nome_recebido (str, optional): Nome da pessoa que recebeu (obrigatório se status=entregue).
                 motivo (str, optional): Motivo (obrigatório se status=cancelada ou nao_entregue).
+                versao (int, optional): Versão da entrega conhecida pelo cliente (controle de concorrência otimista).
 
         Returns:
             tuple: JSON com dados atualizados, mensagem de sucesso e 'status' verdadeiro (status 200).
             tuple: JSON com 'error' e 'status' falso (status 404) se entrega não encontrada.
+            tuple: JSON com 'error' e 'status' falso (status 409) se a transição não for permitida ou a versão estiver desatualizada.
             tuple: JSON com 'error' e 'status' falso (status 400) se dados inválidos, status inválido ou campos obrigatórios faltando.
             tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
 
         Raises:
             ValueError: Se status for inválido ou campos obrigatórios faltarem.
+            LookupError: Se a entrega não existir.
+            ConflitoStatus: Se a transição não for permitida ou a versão não conferir.
             Exception: Erros gerais.
 
-        NOTE: Valida campos condicionais com base no status.
+        NOTE: Valida campos condicionais com base no status. A mudança é feita com um único UPDATE condicional
+              (ver app/transicoes.py), sem carregar a entrega antes. Repetir o status atual retorna 200 sem alterar
+              a entrega (nem a versão).
         """
         try:
-            entrega = Entrega.query.get(entrega_id)
-            if not entrega:
-                return {"error": f"Entrega com ID {entrega_id} não encontrada.", "status": False}, 404
-            dados = EntregaStatusResource.args.parse_args()
+            dados = EntregaStatusResource.esquema.validar()
             try:
-                novo_status = StatusEntrega(dados['status'].lower())
-            except ValueError:
-                return {"error": f"Status inválido: {dados['status']}. Valores permitidos: pendente, em_rota, entregue, cancelada, nao_entregue.", "status": False}, 400
-
-            if novo_status == StatusEntrega.ENTREGUE and not dados.get('nome_recebido'):
-                raise ValueError("Nome recebido é obrigatório para status 'entregue'.")
-            if novo_status in [StatusEntrega.CANCELADA, StatusEntrega.NAO_ENTREGUE] and not dados.get('motivo'):
-                raise ValueError("Motivo é obrigatório para status 'cancelada' ou 'nao_entregue'.")
-
-            entrega.status = novo_status
-            if dados['nome_recebido'] is not None:
-                entrega.nome_recebido = dados['nome_recebido']
-            if dados['motivo'] is not None:
-                entrega.motivo = dados['motivo']
+                novo_status = interpretar_status(dados['status'])
+            except ValueError as e:
+                return {"error": str(e), "status": False}, 400
+
+            validar_campos_status(novo_status, dados.get('nome_recebido'), dados.get('motivo'))
+
+            entrega = transicionar_status(entrega_id, novo_status, dados['nome_recebido'], dados['motivo'], dados['versao'])
+            resposta = entrega.json()
             db.session.commit()
             return {
-                "Entrega": entrega.json(),
+                "Entrega": resposta,
                 "message": gettext("Status da entrega atualizado com sucesso."),
                 "status": True
             }, 200
+        except LookupError as e:
+            db.session.rollback()
+            return {"error": str(e), "status": False}, 404
+        except ConflitoStatus as e:
+            db.session.rollback()
+            return {"error": str(e), "status": False}, 409
+        except ValueError as e:
+            db.session.rollback()
+            return {"error": f"Dados inválidos: {str(e)}", "status": False}, 400
+        except DataError as e:
+            db.session.rollback()
+            return {"error": f"Erro de dados: {str(e)}", "status": False}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class EntregaStatusLoteResource(Resource):
+    esquema = Esquema(
+        ids=Campo(obrigatorio=True, lista=True, mensagem='Lista de IDs das entregas é obrigatória'),
+        status=Campo(obrigatorio=True, mensagem='Status é obrigatório'),
+        nome_recebido=Campo(tipo=validar_max_length(255), mensagem='Nome recebido inválido'),
+        motivo=Campo(tipo=validar_max_length(255), mensagem='Motivo inválido')
+    )
+
+    @jwt_required()
+    def put(self):
+        """
+        Atualiza o status de várias entregas de uma vez (ex.: saída do depósito para 'em_rota').
+
+        Args:
+            JSON Body:
+                ids (list): IDs das entregas.
+                status (str): Novo status aplicado a todas (pendente, em_rota, entregue, cancelada, nao_entregue).
+                nome_recebido (str, optional): Nome da pessoa que recebeu (obrigatório se status=entregue).
+                motivo (str, optional): Motivo (obrigatório se status=cancelada ou nao_entregue).
+
+        Returns:
+            tuple: JSON com o resultado por entrega, total atualizado, mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com 'error' e 'status' falso (status 400) se dados inválidos, status inválido ou campos obrigatórios faltando.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            ValueError: Se status for inválido ou campos obrigatórios faltarem.
+            Exception: Erros gerais.
+
+        NOTE: Aplica as mesmas regras condicionais de PUT /entregas/<id>/status em um único UPDATE e uma única transação.
+        """
+        try:
+            dados = EntregaStatusLoteResource.esquema.validar()
+            if not dados['ids']:
+                return {"error": "A lista de IDs das entregas não pode ser vazia.", "status": False}, 400
+            if len(dados['ids']) > LIMITE_ENTREGAS_LOTE:
+                return {"error": f"O lote deve ter no máximo {LIMITE_ENTREGAS_LOTE} entregas.", "status": False}, 400
+            try:
+                novo_status = interpretar_status(dados['status'])
+            except ValueError as e:
+                return {"error": str(e), "status": False}, 400
+
+            validar_campos_status(novo_status, dados.get('nome_recebido'), dados.get('motivo'))
+
+            resultados = atualizar_status_lote(dados['ids'], novo_status, dados['nome_recebido'], dados['motivo'])
+            db.session.commit()
+            return {
+                "Resultados": resultados,
+                "atualizadas": sum(1 for resultado in resultados if resultado['status'] and not resultado.get('inalterada')),
+                "message": gettext("Status das entregas atualizado com sucesso."),
+                "status": True
+            }, 200
         except ValueError as e:
             db.session.rollback()
             return {"error": f"Dados inválidos: {str(e)}", "status": False}, 400
@@ -770,15 +1087,110 @@ class EntregaStatusResource(Resource):
             db.session.rollback()
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
 
+class EntregaBuscaResource(Resource):
+    esquema = Esquema(
+        q=Campo(obrigatorio=True, origem='query', mensagem='Termo de busca é obrigatório'),
+        pagina=Campo(tipo=int, padrao=1, origem='query', mensagem='Página deve ser um número inteiro'),
+        por_pagina=Campo(tipo=int, padrao=POR_PAGINA_PADRAO, origem='query', mensagem='Quantidade por página deve ser um número inteiro')
+    )
+
+    @jwt_required()
+    @somente_leitura
+    def get(self):
+        """
+        Busca entregas pelo nome do cliente ou pelo endereço de entrega.
+
+        Args:
+            Query String:
+                q (str): Termo de busca (mínimo de 3 caracteres), sem diferenciar maiúsculas nem acentos.
+                pagina (int, optional): Página desejada, a partir de 1. Padrão: 1.
+                por_pagina (int, optional): Entregas por página (1 a 100). Padrão: 20.
+
+        Returns:
+            tuple: JSON com as entregas encontradas em ordem de relevância, dados de paginação, mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com 'error' e 'status' falso (status 400) se o termo ou a paginação forem inválidos.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            ValueError: Se o termo ou a paginação forem inválidos.
+            Exception: Erros gerais.
+
+        NOTE: Usa os índices de trigramas criados pela migração de busca (ver app/busca.py).
+        """
+        try:
+            dados = EntregaBuscaResource.esquema.validar()
+            termo = validar_termo(dados['q'])
+            if dados['pagina'] < 1:
+                raise ValueError("A página deve ser maior ou igual a 1.")
+            if not 1 <= dados['por_pagina'] <= POR_PAGINA_MAXIMO:
+                raise ValueError(f"A quantidade por página deve estar entre 1 e {POR_PAGINA_MAXIMO}.")
+            entregas, tem_proxima = buscar_entregas(termo, dados['pagina'], dados['por_pagina'])
+            return {
+                "Entregas": [e.json() for e in entregas],
+                "pagina": dados['pagina'],
+                "por_pagina": dados['por_pagina'],
+                "proxima_pagina": tem_proxima,
+                "message": gettext("Busca realizada com sucesso."),
+                "status": True
+            }, 200
+        except ValueError as e:
+            return {"error": f"Dados inválidos: {str(e)}", "status": False}, 400
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class EntregaEstatisticasResource(Resource):
+    esquema = Esquema(
+        data=Campo(tipo=validar_data, origem='query', mensagem='Data deve estar no formato AAAA-MM-DD'),
+        motorista_id=Campo(tipo=validar_uuid, origem='query', mensagem='ID do motorista deve ser um UUID válido')
+    )
+
+    @jwt_required()
+    @somente_leitura
+    def get(self):
+        """
+        Retorna, para um dia, quantas entregas de cada motorista passaram para cada status.
+
+        Args:
+            Query String:
+                data (str, optional): Dia consultado no formato AAAA-MM-DD. Padrão: dia atual.
+                motorista_id (str, optional): Restringe o resultado a um motorista.
+
+        Returns:
+            tuple: JSON com as contagens por motorista, mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com 'error' e 'status' falso (status 400) se os parâmetros forem inválidos.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            ValueError: Se os parâmetros forem inválidos.
+            Exception: Erros gerais.
+
+        NOTE: Lê os contadores materializados em 'entrega_contador' (ver app/eventos.py), sem varrer a tabela de entregas.
+              Parâmetros inválidos são rejeitados pelo esquema com status 400 antes da consulta.
+        """
+        try:
+            dados = EntregaEstatisticasResource.esquema.validar()
+            dia, motoristas = consultar_estatisticas(dados['data'], dados['motorista_id'])
+            return {
+                "Estatisticas": {"data": dia.isoformat(), "motoristas": motoristas},
+                "message": gettext("Estatísticas consultadas com sucesso."),
+                "status": True
+            }, 200
+        except ValueError as e:
+            return {"error": f"Dados inválidos: {str(e)}", "status": False}, 400
+        except Exception as e:
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
 class LocalizacaoResource(Resource):
-    args = reqparse.RequestParser()
-    args.add_argument('entrega_id', type=str, required=False, help='ID da entrega')
-    args.add_argument('motorista_id', type=str, required=False, help='ID do motorista')
-    args.add_argument('latitude', type=validar_range(-90, 90), required=True, help='Latitude inválida')
-    args.add_argument('longitude', type=validar_range(-180, 180), required=True, help='Longitude inválida')
-    args.add_argument('data_hora', type=str, required=False, help='Data e hora no formato ISO')
+    esquema = Esquema(
+        entrega_id=Campo(mensagem='ID da entrega'),
+        motorista_id=Campo(mensagem='ID do motorista'),
+        latitude=Campo(tipo=validar_range(-90, 90), obrigatorio=True, mensagem='Latitude inválida'),
+        longitude=Campo(tipo=validar_range(-180, 180), obrigatorio=True, mensagem='Longitude inválida'),
+        data_hora=Campo(mensagem='Data e hora no formato ISO')
+    )
 
     @jwt_required()
+    @somente_leitura
     def get(self, loc_id=None):
         """
         Lista todas as localizações ou recupera uma específica.
@@ -795,10 +1207,11 @@ class LocalizacaoResource(Resource):
             Exception: Para erros internos.
 
         NOTE: Para listagem, retorna vazio se não houver localizações.
+        NOTE: Lê as colunas sem instanciar o modelo do ORM (ver app/leitura.py).
         """
         try:
             if loc_id:
-                localizacao = Localizacao.query.get(loc_id)
+                localizacao = obter_localizacao(id=loc_id)
                 if not localizacao:
                     return {"error": f"Localização com ID {loc_id} não encontrada.", "status": False}, 404
                 return {
@@ -807,7 +1220,7 @@ class LocalizacaoResource(Resource):
                     "status": True
                 }, 200
             else:
-                localizacoes = Localizacao.query.all()
+                localizacoes = listar_localizacoes()
                 if not localizacoes:
                     return {"message": "Nenhuma localização encontrada.", "status": True, "Localizacoes": []}, 200
                 return {
@@ -842,10 +1255,10 @@ class LocalizacaoResource(Resource):
             Exception: Erros gerais.
         """
         try:
-            dados = LocalizacaoResource.args.parse_args()
-            if dados['entrega_id'] and not Entrega.query.get(dados['entrega_id']):
+            dados = LocalizacaoResource.esquema.validar()
+            if dados['entrega_id'] and not existe(Entrega, dados['entrega_id']):
                 raise ValueError("Entrega não encontrada com o ID fornecido.")
-            if dados['motorista_id'] and not Usuario.query.get(dados['motorista_id']):
+            if dados['motorista_id'] and not existe(Usuario, dados['motorista_id']):
                 raise ValueError("Motorista não encontrado com o ID fornecido.")
             if dados['data_hora']:
                 try:
@@ -896,13 +1309,13 @@ class LocalizacaoResource(Resource):
             localizacao = Localizacao.query.get(loc_id)
             if not localizacao:
                 return {"error": f"Localização com ID {loc_id} não encontrada.", "status": False}, 404
-            dados = LocalizacaoResource.args.parse_args()
+            dados = LocalizacaoResource.esquema.validar()
             atualizacoes = 0
             for campo, valor in dados.items():
                 if valor is not None:
-                    if campo == 'entrega_id' and not Entrega.query.get(valor):
+                    if campo == 'entrega_id' and not existe(Entrega, valor):
                         raise ValueError("Entrega não encontrada com o ID fornecido para atualização.")
-                    if campo == 'motorista_id' and not Usuario.query.get(valor):
+                    if campo == 'motorista_id' and not existe(Usuario, valor):
                         raise ValueError("Motorista não encontrado com o ID fornecido para atualização.")
                     if campo == 'data_hora':
                         try:
@@ -963,9 +1376,9 @@ class LocalizacaoResource(Resource):
             return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
 
 class LocalizacaoIoTResource(Resource):
-    args = reqparse.RequestParser()
-    args.add_argument('latitude', type=validar_range(-90, 90), required=True, help='Latitude é obrigatória')
-    args.add_argument('longitude', type=validar_range(-180, 180), required=True, help='Longitude é obrigatória')
+    decorators = LIMITES_IOT
+    contar_localizacoes_iot = True
+    esquema = ESQUEMA_LOCALIZACAO_IOT
 
     def post(self):
         """
@@ -987,10 +1400,12 @@ class LocalizacaoIoTResource(Resource):
             Exception: Erros gerais.
 
         NOTE: Endpoint público para dispositivos IoT. Considerar autenticação básica em produção.
+        NOTE: Com muitos dispositivos conectados, a rota pode ser atendida pelo servidor assíncrono de ingestão
+              (servidor_ingestao.py), que usa o mesmo esquema e grava em lotes.
         TODO: Adicionar validação de origem do request para segurança.
         """
         try:
-            dados = LocalizacaoIoTResource.args.parse_args()
+            dados = LocalizacaoIoTResource.esquema.validar()
             localizacao = Localizacao(latitude=dados['latitude'], longitude=dados['longitude'])
             db.session.add(localizacao)
             db.session.commit()
@@ -1014,6 +1429,8 @@ class LocalizacaoIoTResource(Resource):
 
 class LocalizacaoEntregaResource(Resource):
     @jwt_required()
+    @somente_leitura
+    @nivel_compressao(brotli=6)
     def get(self, entrega_id):
         """
         Lista localizações por entrega.
@@ -1030,11 +1447,12 @@ class LocalizacaoEntregaResource(Resource):
             Exception: Erros gerais.
 
         NOTE: Verifica existência da entrega antes de listar.
+        NOTE: Comprimida com brotli em nível maior que o padrão: as trilhas são as maiores respostas da API.
         """
         try:
-            if not Entrega.query.get(entrega_id):
+            if not existe(Entrega, entrega_id):
                 return {"error": f"Entrega com ID {entrega_id} não encontrada.", "status": False}, 404
-            localizacoes = Localizacao.query.filter_by(entrega_id=entrega_id).all()
+            localizacoes = listar_localizacoes(entrega_id=entrega_id)
             if not localizacoes:
                 return {"error": "Nenhuma localização encontrada para esta entrega.", "status": False}, 404
             return {
@@ -1047,6 +1465,8 @@ class LocalizacaoEntregaResource(Resource):
 
 class LocalizacaoMotoristaResource(Resource):
     @jwt_required()
+    @somente_leitura
+    @nivel_compressao(brotli=6)
     def get(self, motorista_id):
         """
         Lista localizações por motorista.
@@ -1063,11 +1483,12 @@ class LocalizacaoMotoristaResource(Resource):
             Exception: Erros gerais.
 
         NOTE: Verifica existência do motorista antes de listar.
+        NOTE: Comprimida com brotli em nível maior que o padrão: as trilhas são as maiores respostas da API.
         """
         try:
-            if not Usuario.query.get(motorista_id):
+            if not existe(Usuario, motorista_id):
                 return {"error": f"Motorista com ID {motorista_id} não encontrado.", "status": False}, 404
-            localizacoes = Localizacao.query.filter_by(motorista_id=motorista_id).all()
+            localizacoes = listar_localizacoes(motorista_id=motorista_id)
             if not localizacoes:
                 return {"error": "Nenhuma localização encontrada para este motorista.", "status": False}, 404
             return {
@@ -1076,4 +1497,47 @@ class LocalizacaoMotoristaResource(Resource):
                 "status": True
             }, 200
         except Exception as e:
-            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
\ No newline at end of file
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
+
+class SincronizacaoResource(Resource):
+    @jwt_required()
+    def post(self):
+        """
+        Aplica um lote ordenado de mutações enfileiradas pelo aplicativo enquanto estava sem conexão.
+
+        Args:
+            JSON Body:
+                mutacoes (list): Mutações, cada uma com 'chave' (chave de idempotência gerada pelo aplicativo),
+                    'tipo' ('status', 'observacao' ou 'localizacao') e os campos do tipo, iguais aos de
+                    PUT /entregas/<id>/status, da observação de PUT /entregas/<id> e de POST /localizacoes.
+
+        Returns:
+            tuple: JSON com o resultado de cada mutação, totais, mensagem de sucesso e 'status' verdadeiro (status 200).
+            tuple: JSON com 'error' e 'status' falso (status 400) se o lote for inválido.
+            tuple: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+
+        Raises:
+            Exception: Erros gerais.
+
+        NOTE: Todo o lote é aplicado em uma única transação; mutações com chave já recebida não são reaplicadas
+              e devolvem o resultado original (ver app/sincronizacao.py).
+        """
+        try:
+            corpo = request.get_json(silent=True) or {}
+            mutacoes = corpo.get('mutacoes')
+            if not isinstance(mutacoes, list) or not mutacoes:
+                return {"error": "O campo 'mutacoes' deve ser uma lista não vazia.", "status": False}, 400
+            if len(mutacoes) > LIMITE_MUTACOES_SYNC:
+                return {"error": f"O lote deve ter no máximo {LIMITE_MUTACOES_SYNC} mutações.", "status": False}, 400
+            resultados = aplicar_mutacoes(get_jwt_identity(), mutacoes)
+            db.session.commit()
+            return {
+                "Resultados": resultados,
+                "aplicadas": sum(1 for resultado in resultados if resultado['status'] and not resultado['duplicada']),
+                "duplicadas": sum(1 for resultado in resultados if resultado['duplicada']),
+                "message": gettext("Sincronização concluída com sucesso."),
+                "status": True
+            }, 200
+        except Exception as e:
+            db.session.rollback()
+            return {"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500
@@ -0,0 +1,119 @@
+"""
+Módulo: servidor.py
+Descrição: Servidor de produção da API (gunicorn), com processos de trabalho criados a partir da aplicação já carregada.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: A aplicação é carregada uma única vez no processo mestre e os workers são criados por fork. Módulos, rotas e
+      configurações ficam em páginas compartilhadas (copy-on-write); antes do primeiro fork os objetos existentes são
+      congelados (gc.freeze) para que a coleta de lixo dos workers não toque nessas páginas e as copie.
+NOTE: Conexões abertas no mestre durante o carregamento não podem ser usadas pelos workers: cada worker descarta os
+      pools herdados (primário e réplicas) logo após o fork e abre as suas próprias conexões.
+NOTE: Cada worker é reciclado após SERVIDOR_MAX_REQUESTS requisições (com variação aleatória de até
+      SERVIDOR_MAX_REQUESTS_JITTER, para que não reiniciem todos juntos), limitando o crescimento de memória.
+NOTE: Sinais do processo mestre (PID em SERVIDOR_PIDFILE, se definido): HUP recria os workers sem derrubar conexões em
+      andamento; TTIN/TTOU aumentam/diminuem a quantidade de workers; TERM encerra aguardando as requisições por até
+      SERVIDOR_GRACEFUL_TIMEOUT segundos. Para carregar código novo, envie USR2 (inicia um novo mestre com o código
+      atual) e depois TERM ao mestre antigo.
+NOTE: Com PROMETHEUS_MULTIPROC_DIR, o mestre apaga as métricas da execução anterior antes de criar os workers, e
+      cada worker encerrado é marcado como morto para que as suas requisições em andamento deixem de ser somadas.
+"""
+
+from gunicorn.app.base import BaseApplication
+from app.metricas import limpar_metricas_multiprocesso, encerrar_processo_metricas
+import gc
+import multiprocessing
+import os
+
+def opcoes_padrao():
+    """
+    Lê as opções do servidor das variáveis de ambiente.
+
+    Returns:
+        dict: Opções do gunicorn (bind, workers, threads, max_requests, ...).
+    """
+    return {
+        'bind': os.getenv('SERVIDOR_BIND', '0.0.0.0:5000'),
+        'workers': int(os.getenv('SERVIDOR_WORKERS', str(multiprocessing.cpu_count() * 2 + 1))),
+        'threads': int(os.getenv('SERVIDOR_THREADS', '4')),
+        'max_requests': int(os.getenv('SERVIDOR_MAX_REQUESTS', '1000')),
+        'max_requests_jitter': int(os.getenv('SERVIDOR_MAX_REQUESTS_JITTER', '100')),
+        'timeout': int(os.getenv('SERVIDOR_TIMEOUT', '30')),
+        'graceful_timeout': int(os.getenv('SERVIDOR_GRACEFUL_TIMEOUT', '30')),
+        'keepalive': int(os.getenv('SERVIDOR_KEEPALIVE', '5')),
+        'pidfile': os.getenv('SERVIDOR_PIDFILE'),
+    }
+
+def _congelar_objetos(servidor):
+    """
+    Hook when_ready: limpa as métricas anteriores e congela os objetos do mestre antes da criação dos workers.
+
+    Args:
+        servidor (Arbiter): Processo mestre do gunicorn.
+    """
+    limpar_metricas_multiprocesso()
+    gc.collect()
+    gc.freeze()
+
+def _encerrar_worker(servidor, worker):
+    """
+    Hook child_exit: marca nas métricas o worker encerrado.
+
+    Args:
+        servidor (Arbiter): Processo mestre do gunicorn.
+        worker (Worker): Worker encerrado.
+    """
+    encerrar_processo_metricas(worker.pid)
+
+def _descartar_conexoes(aplicacao):
+    """
+    Cria o hook post_fork que descarta, no worker, as conexões herdadas do mestre.
+
+    Args:
+        aplicacao (Flask): Aplicação carregada no mestre.
+
+    Returns:
+        Callable: Hook post_fork(servidor, worker).
+    """
+    def post_fork(servidor, worker):
+        from app.db import db
+        with aplicacao.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+    return post_fork
+
+class ServidorProducao(BaseApplication):
+    """
+    Aplicação gunicorn que serve uma instância já carregada da aplicação Flask.
+
+    Args:
+        aplicacao (Flask): Aplicação a servir.
+        opcoes (dict, optional): Opções do gunicorn; as não informadas vêm de opcoes_padrao().
+    """
+
+    def __init__(self, aplicacao, opcoes=None):
+        self.aplicacao = aplicacao
+        self.opcoes = {**opcoes_padrao(), **{chave: valor for chave, valor in (opcoes or {}).items() if valor is not None}}
+        super().__init__()
+
+    def load_config(self):
+        """
+        Aplica as opções ao gunicorn. Com mais de uma thread por worker, usa o worker 'gthread'.
+        """
+        self.cfg.set('preload_app', True)
+        self.cfg.set('worker_class', 'gthread' if self.opcoes['threads'] > 1 else 'sync')
+        self.cfg.set('when_ready', _congelar_objetos)
+        self.cfg.set('post_fork', _descartar_conexoes(self.aplicacao))
+        self.cfg.set('child_exit', _encerrar_worker)
+        for chave, valor in self.opcoes.items():
+            if valor is not None:
+                self.cfg.set(chave, valor)
+
+    def load(self):
+        """
+        Retorna a aplicação WSGI servida pelos workers.
+
+        Returns:
+            Flask: Aplicação.
+        """
+        return self.aplicacao
@@ -0,0 +1,245 @@
+"""
+Módulo: sincronizacao.py
+Descrição: Aplicação de lotes de mutações enfileiradas pelo aplicativo enquanto estava sem conexão (endpoint /sync).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Todas as mutações de um lote são aplicadas em ordem, em uma única transação. Cada mutação roda em um SAVEPOINT:
+      uma mutação inválida é desfeita e reportada sem impedir as demais.
+NOTE: As chaves de idempotência são reservadas com um único INSERT ... ON CONFLICT DO NOTHING antes da aplicação.
+      Chaves já existentes (inclusive as reservadas por uma requisição concorrente, que aguarda o commit da outra)
+      não são reaplicadas: o resultado gravado na primeira aplicação é devolvido. Os resultados são gravados ao final
+      com um único UPDATE em lote.
+NOTE: As chaves expiram após IDEMPOTENCIA_TTL segundos. As expiradas do usuário são removidas a cada sincronização e
+      as de todos os usuários pelo comando 'flask limpar-idempotencia'.
+"""
+
+from app.db import db
+from app.models.usuarios import Usuario
+from app.models.entrega import Entrega
+from app.models.localizacao import Localizacao
+from app.models.idempotencia import ChaveIdempotencia
+from app.referencias import existe
+from app.transicoes import interpretar_status, validar_campos_status, transicionar_status, ConflitoStatus
+from app.validadores import validar_max_length, validar_range, validar_uuid
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from datetime import datetime, timedelta
+
+LIMITE_MUTACOES_SYNC = 500
+TAMANHO_MAXIMO_CHAVE = 64
+
+def _aplicar_status(mutacao):
+    """
+    Aplica uma mudança de status com as mesmas regras de PUT /entregas/<id>/status.
+
+    Args:
+        mutacao (dict): Campos 'entrega_id', 'status' e, opcionalmente, 'nome_recebido', 'motivo' e 'versao'.
+
+    Returns:
+        tuple: (código HTTP equivalente, dados do resultado).
+    """
+    entrega_id = validar_uuid(mutacao.get('entrega_id'))
+    novo_status = interpretar_status(mutacao.get('status'))
+    nome_recebido = validar_max_length(255)(mutacao.get('nome_recebido'))
+    motivo = validar_max_length(255)(mutacao.get('motivo'))
+    validar_campos_status(novo_status, nome_recebido, motivo)
+    versao = mutacao.get('versao')
+    if versao is not None and not isinstance(versao, int):
+        raise ValueError("Versão deve ser um número inteiro")
+    entrega = transicionar_status(entrega_id, novo_status, nome_recebido, motivo, versao)
+    return 200, {"Entrega": entrega.json()}
+
+def _aplicar_observacao(mutacao):
+    """
+    Atualiza a observação de uma entrega com um único UPDATE, incrementando sua versão.
+
+    Args:
+        mutacao (dict): Campos 'entrega_id' e 'observacao'.
+
+    Returns:
+        tuple: (código HTTP equivalente, dados do resultado).
+
+    Raises:
+        LookupError: Se a entrega não existir.
+    """
+    entrega_id = validar_uuid(mutacao.get('entrega_id'))
+    observacao = validar_max_length(255)(mutacao.get('observacao'))
+    entrega = db.session.execute(
+        db.update(Entrega).where(Entrega.id == entrega_id)
+        .values(observacao=observacao, versao=Entrega.versao + 1).returning(Entrega),
+        execution_options={'synchronize_session': False, 'populate_existing': True}
+    ).scalar_one_or_none()
+    if entrega is None:
+        raise LookupError(f"Entrega com ID {entrega_id} não encontrada.")
+    return 200, {"Entrega": entrega.json()}
+
+def _aplicar_localizacao(mutacao):
+    """
+    Registra uma localização com as mesmas regras de POST /localizacoes.
+
+    Args:
+        mutacao (dict): Campos 'latitude', 'longitude' e, opcionalmente, 'entrega_id', 'motorista_id' e 'data_hora'.
+
+    Returns:
+        tuple: (código HTTP equivalente, dados do resultado).
+    """
+    if mutacao.get('latitude') is None or mutacao.get('longitude') is None:
+        raise ValueError("Latitude e longitude são obrigatórias")
+    dados = {
+        'latitude': validar_range(-90, 90)(mutacao['latitude']),
+        'longitude': validar_range(-180, 180)(mutacao['longitude']),
+        'entrega_id': validar_uuid(mutacao['entrega_id']) if mutacao.get('entrega_id') else None,
+        'motorista_id': validar_uuid(mutacao['motorista_id']) if mutacao.get('motorista_id') else None,
+    }
+    if dados['entrega_id'] and not existe(Entrega, dados['entrega_id']):
+        raise ValueError("Entrega não encontrada com o ID fornecido.")
+    if dados['motorista_id'] and not existe(Usuario, dados['motorista_id']):
+        raise ValueError("Motorista não encontrado com o ID fornecido.")
+    if mutacao.get('data_hora'):
+        try:
+            dados['data_hora'] = datetime.fromisoformat(mutacao['data_hora'])
+        except (TypeError, ValueError):
+            raise ValueError("Data e hora devem estar no formato ISO válido.")
+    localizacao = Localizacao(**dados)
+    db.session.add(localizacao)
+    db.session.flush()
+    return 201, {"Localizacao": localizacao.json()}
+
+TIPOS_MUTACAO = {
+    'status': _aplicar_status,
+    'observacao': _aplicar_observacao,
+    'localizacao': _aplicar_localizacao,
+}
+
+def _validar_chave(mutacao):
+    """
+    Valida a estrutura básica de uma mutação e retorna sua chave de idempotência.
+
+    Args:
+        mutacao: Item recebido no lote.
+
+    Returns:
+        str: Chave de idempotência.
+
+    Raises:
+        ValueError: Se o item não for um objeto, a chave for inválida ou o tipo não for suportado.
+    """
+    if not isinstance(mutacao, dict):
+        raise ValueError("Cada mutação deve ser um objeto")
+    chave = mutacao.get('chave')
+    if not isinstance(chave, str) or not 0 < len(chave) <= TAMANHO_MAXIMO_CHAVE:
+        raise ValueError(f"A chave de idempotência é obrigatória e deve ter no máximo {TAMANHO_MAXIMO_CHAVE} caracteres")
+    if mutacao.get('tipo') not in TIPOS_MUTACAO:
+        raise ValueError(f"Tipo de mutação inválido. Valores permitidos: {', '.join(TIPOS_MUTACAO)}.")
+    return chave
+
+def _reservar_chaves(usuario_id, chaves):
+    """
+    Remove as chaves expiradas do usuário e reserva as chaves recebidas.
+
+    Args:
+        usuario_id (UUID): ID do usuário.
+        chaves (list): Chaves distintas do lote.
+
+    Returns:
+        tuple: (reservadas, anteriores), onde 'reservadas' é o conjunto de chaves novas e 'anteriores' mapeia
+               cada chave já conhecida para o resultado gravado.
+    """
+    agora = db.func.current_timestamp()
+    db.session.execute(
+        db.delete(ChaveIdempotencia).where(ChaveIdempotencia.usuario_id == usuario_id, ChaveIdempotencia.expira_em <= agora)
+    )
+    if not chaves:
+        return set(), {}
+    expira_em = agora + timedelta(seconds=current_app.config.get('IDEMPOTENCIA_TTL', 86400))
+    reservadas = set(db.session.execute(
+        insert(ChaveIdempotencia)
+        .values([{'usuario_id': usuario_id, 'chave': chave, 'criado_em': agora, 'expira_em': expira_em} for chave in chaves])
+        .on_conflict_do_nothing(index_elements=[ChaveIdempotencia.usuario_id, ChaveIdempotencia.chave])
+        .returning(ChaveIdempotencia.chave)
+    ).scalars())
+
+    anteriores = {}
+    if len(reservadas) < len(chaves):
+        anteriores = {linha.chave: linha.resultado for linha in db.session.execute(
+            db.select(ChaveIdempotencia.chave, ChaveIdempotencia.resultado)
+            .where(ChaveIdempotencia.usuario_id == usuario_id, ChaveIdempotencia.chave.in_(set(chaves) - reservadas))
+        )}
+    return reservadas, anteriores
+
+def aplicar_mutacoes(usuario_id, mutacoes):
+    """
+    Aplica um lote ordenado de mutações na sessão atual, com deduplicação por chave de idempotência.
+
+    Args:
+        usuario_id (str | UUID): ID do usuário autenticado (dono das chaves).
+        mutacoes (list): Mutações com 'chave', 'tipo' ('status', 'observacao' ou 'localizacao') e os campos do tipo.
+
+    Returns:
+        list: Um resultado por mutação, na ordem recebida, com 'chave', 'tipo', 'status' (bool), 'codigo'
+              (código HTTP equivalente), 'duplicada' (bool) e os dados ou o 'error' da mutação.
+
+    NOTE: Uma chave repetida dentro do próprio lote recebe o resultado da primeira ocorrência. Mutações sem chave
+          válida são rejeitadas sem gravar chave. O commit fica a cargo do chamador.
+    """
+    usuario_id = validar_uuid(usuario_id)
+    chaves = []
+    for mutacao in mutacoes:
+        try:
+            chave = _validar_chave(mutacao)
+        except ValueError:
+            continue
+        if chave not in chaves:
+            chaves.append(chave)
+    reservadas, anteriores = _reservar_chaves(usuario_id, chaves)
+
+    resultados = []
+    novos = {}
+    for mutacao in mutacoes:
+        try:
+            chave = _validar_chave(mutacao)
+        except ValueError as e:
+            resultados.append({"chave": mutacao.get('chave') if isinstance(mutacao, dict) else None, "status": False, "codigo": 400, "duplicada": False, "error": str(e)})
+            continue
+
+        if chave in novos or chave not in reservadas:
+            anterior = novos.get(chave, anteriores.get(chave))
+            if anterior is None:
+                anterior = {"chave": chave, "tipo": mutacao['tipo'], "status": False, "codigo": 409, "error": "Mutação com esta chave ainda está em processamento."}
+            resultados.append(dict(anterior, duplicada=True))
+            continue
+
+        resultado = {"chave": chave, "tipo": mutacao['tipo']}
+        try:
+            with db.session.begin_nested():
+                codigo, dados = TIPOS_MUTACAO[mutacao['tipo']](mutacao)
+            resultado.update(dados, status=True, codigo=codigo)
+        except LookupError as e:
+            resultado.update(status=False, codigo=404, error=str(e))
+        except ConflitoStatus as e:
+            resultado.update(status=False, codigo=409, error=str(e))
+        except (ValueError, DataError, IntegrityError) as e:
+            resultado.update(status=False, codigo=400, error=f"Dados inválidos: {str(e)}")
+        novos[chave] = resultado
+        resultados.append(dict(resultado, duplicada=False))
+
+    if novos:
+        db.session.execute(db.update(ChaveIdempotencia), [
+            {'usuario_id': usuario_id, 'chave': chave, 'resultado': resultado} for chave, resultado in novos.items()
+        ])
+    return resultados
+
+def remover_chaves_expiradas():
+    """
+    Remove as chaves de idempotência expiradas de todos os usuários.
+
+    Returns:
+        int: Quantidade de chaves removidas.
+
+    NOTE: O commit fica a cargo do chamador.
+    """
+    return db.session.execute(
+        db.delete(ChaveIdempotencia).where(ChaveIdempotencia.expira_em <= db.func.current_timestamp())
+    ).rowcount
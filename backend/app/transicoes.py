@@ -0,0 +1,200 @@
+"""
+Módulo: transicoes.py
+Descrição: Regras de mudança de status de entregas, compartilhadas pela atualização individual e pela atualização em lote.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Cada mudança de status é um único UPDATE condicional (WHERE id = ? AND status IN (predecessores) [AND versao = ?])
+      com RETURNING, sem SELECT prévio. A tabela de transições fica em StatusEntrega (app/models/entrega.py) e a
+      coluna 'versao' garante controle de concorrência otimista sem bloqueio de linhas. Uma consulta adicional só é
+      feita quando o UPDATE não altera nenhuma linha, para informar o motivo (inexistente, transição ou versão).
+NOTE: Pedir o status que a entrega já tem não é uma transição: a requisição é aceita sem alterar a entrega (nem a
+      versão, o histórico e os contadores), para que o reenvio de uma mudança já aplicada (ex.: repetição após a
+      perda da resposta, ou replays de /sync) tenha o mesmo resultado da primeira vez.
+NOTE: As mudanças aplicadas são registradas no histórico 'entrega_evento' e nos contadores diários (app/eventos.py),
+      na mesma transação.
+"""
+
+from app.db import db
+from app.models.entrega import Entrega, StatusEntrega
+from app.eventos import registrar_eventos
+import uuid
+
+LIMITE_ENTREGAS_LOTE = 1000
+
+class ConflitoStatus(Exception):
+    """
+    Indica que a mudança de status não foi aplicada porque a transição não é permitida
+    a partir do status atual ou porque a entrega foi alterada por outra requisição.
+    """
+
+def interpretar_status(valor):
+    """
+    Converte o valor recebido na requisição para StatusEntrega.
+
+    Args:
+        valor (str): Status informado (ex.: 'em_rota'), sem diferenciar maiúsculas.
+
+    Returns:
+        StatusEntrega: Status correspondente.
+
+    Raises:
+        ValueError: Se o status não for um dos valores permitidos.
+    """
+    try:
+        return StatusEntrega(str(valor).lower())
+    except ValueError:
+        raise ValueError(f"Status inválido: {valor}. Valores permitidos: pendente, em_rota, entregue, cancelada, nao_entregue.")
+
+def validar_campos_status(novo_status, nome_recebido=None, motivo=None):
+    """
+    Valida os campos condicionais exigidos pelo novo status.
+
+    Args:
+        novo_status (StatusEntrega): Status de destino.
+        nome_recebido (str, optional): Nome de quem recebeu a entrega.
+        motivo (str, optional): Motivo do cancelamento ou da não entrega.
+
+    Raises:
+        ValueError: Se 'nome_recebido' faltar para 'entregue' ou 'motivo' faltar para 'cancelada'/'nao_entregue'.
+    """
+    if novo_status == StatusEntrega.ENTREGUE and not nome_recebido:
+        raise ValueError("Nome recebido é obrigatório para status 'entregue'.")
+    if novo_status in [StatusEntrega.CANCELADA, StatusEntrega.NAO_ENTREGUE] and not motivo:
+        raise ValueError("Motivo é obrigatório para status 'cancelada' ou 'nao_entregue'.")
+
+def _valores_transicao(novo_status, nome_recebido, motivo):
+    """
+    Monta os valores do UPDATE de mudança de status, incrementando a versão.
+
+    Args:
+        novo_status (StatusEntrega): Status de destino.
+        nome_recebido (str, optional): Nome de quem recebeu.
+        motivo (str, optional): Motivo.
+
+    Returns:
+        dict: Valores para db.update(Entrega).values().
+    """
+    valores = {'status': novo_status, 'versao': Entrega.versao + 1}
+    if nome_recebido is not None:
+        valores['nome_recebido'] = nome_recebido
+    if motivo is not None:
+        valores['motivo'] = motivo
+    return valores
+
+def _motivo_falha(status_atual, versao_atual, novo_status, versao):
+    """
+    Descreve por que uma mudança de status não foi aplicada a uma entrega existente.
+
+    Args:
+        status_atual (StatusEntrega): Status atual da entrega.
+        versao_atual (int): Versão atual da entrega.
+        novo_status (StatusEntrega): Status de destino solicitado.
+        versao (int, optional): Versão informada pelo cliente.
+
+    Returns:
+        str: Mensagem de erro.
+    """
+    if versao is not None and versao_atual != versao:
+        return f"A entrega foi alterada por outra requisição (versão atual: {versao_atual})."
+    return f"Transição de status não permitida: de '{status_atual.value}' para '{novo_status.value}'."
+
+def transicionar_status(entrega_id, novo_status, nome_recebido=None, motivo=None, versao=None):
+    """
+    Muda o status de uma entrega com um único UPDATE condicional na sessão atual.
+
+    Args:
+        entrega_id (str | UUID): ID da entrega.
+        novo_status (StatusEntrega): Status de destino, já validado com validar_campos_status().
+        nome_recebido (str, optional): Nome de quem recebeu.
+        motivo (str, optional): Motivo.
+        versao (int, optional): Versão esperada da entrega; se informada, a mudança só ocorre se ainda for a atual.
+
+    Returns:
+        Entrega: Entrega atualizada, com os valores retornados pelo banco, ou a entrega sem alterações se ela já
+                 estiver em 'novo_status'.
+
+    Raises:
+        LookupError: Se a entrega não existir.
+        ConflitoStatus: Se a transição não for permitida a partir do status atual ou a versão não conferir.
+
+    NOTE: O commit fica a cargo do chamador. Se a entrega já estiver em 'novo_status', a versão informada não é
+          conferida: o reenvio de uma mudança já aplicada traz a versão anterior a ela.
+    """
+    condicoes = [Entrega.id == entrega_id, Entrega.status.in_(novo_status.predecessores())]
+    if versao is not None:
+        condicoes.append(Entrega.versao == versao)
+    entrega = db.session.execute(
+        db.update(Entrega).where(*condicoes).values(**_valores_transicao(novo_status, nome_recebido, motivo)).returning(Entrega),
+        execution_options={'synchronize_session': False, 'populate_existing': True}
+    ).scalar_one_or_none()
+    if entrega is not None:
+        registrar_eventos([{'entrega_id': entrega.id, 'motorista_id': entrega.motorista_id, 'status': novo_status, 'motivo': motivo}])
+        return entrega
+
+    atual = db.session.execute(db.select(Entrega).where(Entrega.id == entrega_id)).scalar_one_or_none()
+    if atual is None:
+        raise LookupError(f"Entrega com ID {entrega_id} não encontrada.")
+    if atual.status == novo_status:
+        return atual
+    raise ConflitoStatus(_motivo_falha(atual.status, atual.versao, novo_status, versao))
+
+def atualizar_status_lote(ids, novo_status, nome_recebido=None, motivo=None):
+    """
+    Aplica o mesmo status a várias entregas com um único UPDATE na sessão atual.
+
+    Args:
+        ids (list): IDs das entregas (str ou UUID).
+        novo_status (StatusEntrega): Status de destino, já validado com validar_campos_status().
+        nome_recebido (str, optional): Nome de quem recebeu (gravado em todas as entregas, se informado).
+        motivo (str, optional): Motivo (gravado em todas as entregas, se informado).
+
+    Returns:
+        list: Um resultado por ID, na ordem recebida, com 'id', 'status' (bool), 'error' quando falhar e 'inalterada'
+              verdadeiro quando a entrega já estava em 'novo_status'.
+
+    NOTE: Só são atualizadas as entregas cujo status atual permite a transição; as que já estão em 'novo_status' são
+          aceitas sem alteração. IDs repetidos são atualizados uma única vez. O commit fica a cargo do chamador.
+    """
+    normalizados = {}
+    for valor in ids:
+        try:
+            normalizados[str(valor)] = uuid.UUID(str(valor))
+        except ValueError:
+            normalizados[str(valor)] = None
+
+    validos = {id_ for id_ in normalizados.values() if id_ is not None}
+    atualizados = set()
+    if validos:
+        linhas = db.session.execute(
+            db.update(Entrega)
+            .where(Entrega.id.in_(validos), Entrega.status.in_(novo_status.predecessores()))
+            .values(**_valores_transicao(novo_status, nome_recebido, motivo))
+            .returning(Entrega.id, Entrega.motorista_id),
+            execution_options={'synchronize_session': False}
+        ).all()
+        atualizados = {linha.id for linha in linhas}
+        registrar_eventos([
+            {'entrega_id': linha.id, 'motorista_id': linha.motorista_id, 'status': novo_status, 'motivo': motivo}
+            for linha in linhas
+        ])
+
+    recusados = {}
+    if validos - atualizados:
+        recusados = {linha.id: linha.status for linha in db.session.execute(
+            db.select(Entrega.id, Entrega.status).where(Entrega.id.in_(validos - atualizados))
+        )}
+
+    resultados = []
+    for original, id_ in normalizados.items():
+        if id_ is None:
+            resultados.append({"id": original, "status": False, "error": "ID da entrega deve ser um UUID válido."})
+        elif id_ in atualizados:
+            resultados.append({"id": original, "status": True})
+        elif recusados.get(id_) == novo_status:
+            resultados.append({"id": original, "status": True, "inalterada": True})
+        elif id_ in recusados:
+            resultados.append({"id": original, "status": False, "error": _motivo_falha(recusados[id_], None, novo_status, None)})
+        else:
+            resultados.append({"id": original, "status": False, "error": f"Entrega com ID {original} não encontrada."})
+    return resultados
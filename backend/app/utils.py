@@ -1,18 +1,243 @@
 """
 Módulo: utils.py
-Descrição: Utilitários gerais para a aplicação, incluindo a blacklist de JWT com armazenamento em memória.
+Descrição: Utilitários gerais para a aplicação, incluindo a blacklist de JWT com armazenamento configurável.
 Autor: Rafael dos Santos Giorgi
 Data: 01/10/2025
 
-NOTE: Este módulo gerencia a blacklist de tokens JWT usando um set em memória, ideal para MVP em desenvolvimento.
-TODO: Migrar para Redis ou banco de dados persistente em produção para escalabilidade.
+NOTE: A blacklist é escolhida por JWT_BLOCKLIST: 'banco' (padrão) grava os tokens revogados na tabela 'token_revogado',
+      compartilhada por todos os processos; 'memoria' mantém um dicionário no processo, adequado apenas para
+      desenvolvimento com um único processo. Em ambos, cada token fica registrado somente até a sua expiração ('exp').
+NOTE: As consultas passam por um cache local limitado a JWT_BLOCKLIST_CACHE_MAX tokens. Tokens revogados ficam em cache
+      até expirarem; tokens válidos ficam por JWT_BLOCKLIST_CACHE_TTL segundos, de modo que um logout feito em outro
+      processo leva no máximo esse tempo para valer neste. Um logout feito no próprio processo vale imediatamente.
 """
 
-token_blacklist = set()
+from app.db import db
+from app.models.token_revogado import TokenRevogado
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+from collections import OrderedDict
+from datetime import datetime, timezone
+import heapq
+import threading
+import time
 
-def add_to_blacklist(jti):
+def _datetime_utc(timestamp):
     """
-    Adiciona um token à blacklist em memória.
+    Converte um timestamp Unix em datetime UTC sem fuso, como gravado em 'token_revogado'.
+
+    Args:
+        timestamp (float): Segundos desde a época Unix.
+
+    Returns:
+        datetime: Data e hora UTC sem fuso horário.
+    """
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+class BlocklistMemoria:
+    """
+    Blacklist mantida na memória do processo.
+
+    NOTE: Os tokens expirados são descartados a cada inclusão, em ordem de expiração, mantendo a memória proporcional
+          aos tokens revogados ainda válidos.
+    """
+
+    def __init__(self):
+        self._expiracoes = {}
+        self._fila = []
+        self._trava = threading.Lock()
+
+    def adicionar(self, jti, expira_em):
+        """
+        Registra um token revogado.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+            expira_em (float): Expiração do token (timestamp Unix).
+        """
+        with self._trava:
+            self._descartar_expirados(time.time())
+            self._expiracoes[jti] = expira_em
+            heapq.heappush(self._fila, (expira_em, jti))
+
+    def remover(self, jti):
+        """
+        Remove um token da blacklist.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+        """
+        with self._trava:
+            self._expiracoes.pop(jti, None)
+
+    def contem(self, jti):
+        """
+        Verifica se um token está revogado.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+
+        Returns:
+            bool: True se o token estiver revogado e ainda não tiver expirado.
+        """
+        expira_em = self._expiracoes.get(jti)
+        return expira_em is not None and expira_em > time.time()
+
+    def _descartar_expirados(self, agora):
+        """
+        Remove os tokens expirados até 'agora'.
+
+        Args:
+            agora (float): Timestamp Unix de referência.
+        """
+        while self._fila and self._fila[0][0] <= agora:
+            expira_em, jti = heapq.heappop(self._fila)
+            if self._expiracoes.get(jti) == expira_em:
+                del self._expiracoes[jti]
+
+class BlocklistBanco:
+    """
+    Blacklist gravada na tabela 'token_revogado', compartilhada por todos os processos.
+
+    NOTE: As operações usam conexões próprias do engine, independentes da sessão da requisição: o logout é gravado
+          mesmo que a requisição não faça commit, e a verificação não abre transação na sessão.
+    """
+
+    def adicionar(self, jti, expira_em):
+        """
+        Registra um token revogado e remove os registros expirados.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+            expira_em (float): Expiração do token (timestamp Unix).
+        """
+        dialeto = {'postgresql': postgresql, 'sqlite': sqlite}.get(db.engine.dialect.name)
+        if dialeto is None:
+            raise RuntimeError(f"JWT_BLOCKLIST='banco' não suporta o banco '{db.engine.dialect.name}'.")
+        with db.engine.begin() as conexao:
+            conexao.execute(db.delete(TokenRevogado).where(TokenRevogado.expira_em <= _datetime_utc(time.time())))
+            conexao.execute(
+                dialeto.insert(TokenRevogado)
+                .values(jti=jti, expira_em=_datetime_utc(expira_em))
+                .on_conflict_do_nothing(index_elements=[TokenRevogado.jti])
+            )
+
+    def remover(self, jti):
+        """
+        Remove um token da blacklist.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+        """
+        with db.engine.begin() as conexao:
+            conexao.execute(db.delete(TokenRevogado).where(TokenRevogado.jti == jti))
+
+    def contem(self, jti):
+        """
+        Verifica se um token está revogado.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+
+        Returns:
+            bool: True se o token estiver revogado e ainda não tiver expirado.
+        """
+        with db.engine.connect() as conexao:
+            return conexao.execute(
+                db.select(TokenRevogado.jti)
+                .where(TokenRevogado.jti == jti, TokenRevogado.expira_em > _datetime_utc(time.time()))
+            ).first() is not None
+
+BLOCKLISTS = {
+    'banco': BlocklistBanco,
+    'memoria': BlocklistMemoria,
+}
+
+class _CacheBlocklist:
+    """
+    Cache local, com descarte do menos usado, das respostas da blacklist.
+
+    Args:
+        maximo (int): Quantidade máxima de tokens em cache.
+        ttl (float): Segundos durante os quais um token não revogado é considerado válido sem nova consulta.
+    """
+
+    def __init__(self, maximo, ttl):
+        self.maximo = maximo
+        self.ttl = ttl
+        self._entradas = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, jti):
+        """
+        Retorna a resposta em cache para um token.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+
+        Returns:
+            bool: Se o token está revogado, ou None se não houver resposta válida em cache.
+        """
+        with self._trava:
+            entrada = self._entradas.get(jti)
+            if entrada is None:
+                return None
+            revogado, valido_ate = entrada
+            if valido_ate <= time.time():
+                del self._entradas[jti]
+                return None
+            self._entradas.move_to_end(jti)
+            return revogado
+
+    def guardar(self, jti, revogado, valido_ate):
+        """
+        Guarda a resposta da blacklist para um token.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+            revogado (bool): Se o token está revogado.
+            valido_ate (float): Timestamp Unix até o qual a resposta vale.
+        """
+        if self.maximo <= 0:
+            return
+        with self._trava:
+            self._entradas[jti] = (revogado, valido_ate)
+            self._entradas.move_to_end(jti)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def descartar(self, jti):
+        """
+        Remove um token do cache.
+
+        Args:
+            jti (str): Identificador único do token JWT.
+        """
+        with self._trava:
+            self._entradas.pop(jti, None)
+
+def init_blocklist(app):
+    """
+    Configura a blacklist de JWT da aplicação conforme JWT_BLOCKLIST.
+
+    Args:
+        app (Flask): Aplicação Flask.
+
+    Raises:
+        ValueError: Se JWT_BLOCKLIST não for um armazenamento suportado.
+    """
+    tipo = app.config.get('JWT_BLOCKLIST', 'banco')
+    if tipo not in BLOCKLISTS:
+        raise ValueError(f"JWT_BLOCKLIST inválido. Valores permitidos: {', '.join(BLOCKLISTS)}.")
+    app.extensions['blocklist'] = BLOCKLISTS[tipo]()
+    app.extensions['blocklist_cache'] = _CacheBlocklist(
+        app.config.get('JWT_BLOCKLIST_CACHE_MAX', 10000),
+        app.config.get('JWT_BLOCKLIST_CACHE_TTL', 5.0)
+    )
+
+def _validar_jti(jti):
+    """
+    Valida o identificador de um token.
 
     Args:
         jti (str): Identificador único do token JWT.
@@ -22,11 +247,27 @@ def add_to_blacklist(jti):
     """
     if not isinstance(jti, str) or not jti:
         raise ValueError("JTI deve ser uma string não vazia")
-    token_blacklist.add(jti)
+
+def add_to_blacklist(jti, expira_em=None):
+    """
+    Adiciona um token à blacklist.
+
+    Args:
+        jti (str): Identificador único do token JWT.
+        expira_em (float, optional): Expiração do token (claim 'exp'). Padrão: agora + JWT_ACCESS_TOKEN_EXPIRES.
+
+    Raises:
+        ValueError: Se jti não for uma string válida.
+    """
+    _validar_jti(jti)
+    if expira_em is None:
+        expira_em = time.time() + current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds()
+    current_app.extensions['blocklist'].adicionar(jti, expira_em)
+    current_app.extensions['blocklist_cache'].guardar(jti, True, expira_em)
 
 def remove_from_blacklist(jti):
     """
-    Remove um token da blacklist em memória.
+    Remove um token da blacklist.
 
     Args:
         jti (str): Identificador único do token JWT.
@@ -34,13 +275,13 @@ def remove_from_blacklist(jti):
     Raises:
         ValueError: Se jti não for uma string válida.
     """
-    if not isinstance(jti, str) or not jti:
-        raise ValueError("JTI deve ser uma string não vazia")
-    token_blacklist.discard(jti)
+    _validar_jti(jti)
+    current_app.extensions['blocklist'].remover(jti)
+    current_app.extensions['blocklist_cache'].descartar(jti)
 
 def check_if_token_in_blacklist(decrypted_token):
     """
-    Verifica se o token JWT está na blacklist em memória.
+    Verifica se o token JWT está na blacklist.
 
     Args:
         decrypted_token (dict): Payload decodificado do token JWT, contendo o 'jti'.
@@ -51,9 +292,21 @@ def check_if_token_in_blacklist(decrypted_token):
     Raises:
         KeyError: Se 'jti' não estiver presente no payload.
         ValueError: Se decrypted_token não for um dicionário.
+
+    NOTE: Consulta o cache local antes do armazenamento; ver a NOTE do módulo sobre o tempo de propagação.
     """
     if not isinstance(decrypted_token, dict):
         raise ValueError("decrypted_token deve ser um dicionário")
     if 'jti' not in decrypted_token:
         raise KeyError("Token JWT inválido: 'jti' não encontrado")
-    return decrypted_token['jti'] in token_blacklist
\ No newline at end of file
+    jti = decrypted_token['jti']
+    cache = current_app.extensions['blocklist_cache']
+    revogado = cache.obter(jti)
+    if revogado is None:
+        revogado = current_app.extensions['blocklist'].contem(jti)
+        agora = time.time()
+        if revogado:
+            cache.guardar(jti, True, decrypted_token.get('exp', agora + cache.ttl))
+        else:
+            cache.guardar(jti, False, min(agora + cache.ttl, decrypted_token.get('exp', agora + cache.ttl)))
+    return revogado
@@ -0,0 +1,149 @@
+"""
+Módulo: validadores.py
+Descrição: Validadores de entrada compartilhados pelos endpoints da API e pelas rotinas de importação em lote.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Os validadores levantam ValueError com mensagens em português, usadas diretamente nas respostas de erro.
+"""
+
+import re
+import uuid
+from datetime import date
+
+def validar_cnh(value):
+    """
+    Valida o formato da CNH.
+
+    Args:
+        value (str): Valor da CNH a validar.
+
+    Returns:
+        str: Valor validado.
+
+    Raises:
+        ValueError: Se o formato for inválido ou o valor for vazio.
+    """
+    if not value:
+        raise ValueError("CNH não pode ser vazia")
+    if not re.fullmatch(r'^\d{11}$', value):
+        raise ValueError("CNH deve ter exatamente 11 dígitos numéricos")
+    return value
+
+def validar_placa(value):
+    """
+    Valida o formato da placa de veículo.
+
+    Args:
+        value (str): Valor da placa a validar.
+
+    Returns:
+        str: Valor validado.
+
+    Raises:
+        ValueError: Se o formato for inválido ou o valor for vazio.
+    """
+    if not value:
+        raise ValueError("Placa não pode ser vazia")
+    if not re.match(r'^[A-Za-z]{3}-[0-9]{4}$', value):
+        raise ValueError("Placa deve seguir o formato XXX-1234")
+    return value.upper()
+
+def validar_endereco(value):
+    """
+    Valida o comprimento do endereço de entrega.
+
+    Args:
+        value (str): Valor do endereço a validar.
+
+    Returns:
+        str: Valor validado.
+
+    Raises:
+        ValueError: Se o comprimento exceder o limite ou for vazio.
+    """
+    if not value:
+        raise ValueError("Endereço de entrega não pode ser vazio")
+    if len(value) > 255:
+        raise ValueError("Endereço de entrega deve ter no máximo 255 caracteres")
+    return value
+
+def validar_max_length(max_length):
+    """
+    Cria um validador para comprimento máximo de string.
+
+    Args:
+        max_length (int): Comprimento máximo permitido.
+
+    Returns:
+        function: Função validadora.
+    """
+    def validator(value):
+        if value is not None:
+            if not isinstance(value, str):
+                raise ValueError("Valor deve ser uma string")
+            if len(value) > max_length:
+                raise ValueError(f"O valor deve ter no máximo {max_length} caracteres")
+        return value
+    return validator
+
+def validar_range(min_value=None, max_value=None):
+    """
+    Cria um validador para faixa numérica.
+
+    Args:
+        min_value (float, optional): Valor mínimo.
+        max_value (float, optional): Valor máximo.
+
+    Returns:
+        function: Função validadora.
+    """
+    def validator(value):
+        if value is None:
+            return value
+        try:
+            num = float(value)
+        except ValueError:
+            raise ValueError("Valor deve ser um número válido")
+        if min_value is not None and num < min_value:
+            raise ValueError(f"O valor mínimo permitido é {min_value}")
+        if max_value is not None and num > max_value:
+            raise ValueError(f"O valor máximo permitido é {max_value}")
+        return num
+    return validator
+
+def validar_data(value):
+    """
+    Valida uma data no formato ISO (AAAA-MM-DD).
+
+    Args:
+        value (str): Data a validar.
+
+    Returns:
+        date: Data convertida.
+
+    Raises:
+        ValueError: Se o formato for inválido.
+    """
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError("Data deve estar no formato AAAA-MM-DD")
+
+def validar_uuid(value):
+    """
+    Valida um identificador UUID.
+
+    Args:
+        value (str): Valor a validar.
+
+    Returns:
+        UUID: Identificador convertido.
+
+    Raises:
+        ValueError: Se o valor não for um UUID válido.
+    """
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise ValueError("ID deve ser um UUID válido")
@@ -0,0 +1,110 @@
+"""
+Módulo: esquemas.py
+Descrição: Benchmark da validação de entrada dos endpoints de ingestão IoT (POST /localizacoes/iot) e de status
+           (PUT /entregas/<id>/status): reqparse do Flask-RESTful versus esquemas compilados (app/esquemas.py).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Executar a partir de backend/: python -m benchmarks.esquemas [--repeticoes 20000]
+      Não usa banco de dados nem servidor: cada medição valida o mesmo corpo JSON dentro de um contexto de requisição,
+      com os mesmos parâmetros declarados em app/routes.py.
+"""
+
+from flask import Flask
+from flask_restful import reqparse
+from app.esquemas import Esquema, Campo
+from app.validadores import validar_max_length, validar_range
+import argparse
+import time
+
+def _parsers():
+    """
+    Declara os parâmetros dos dois endpoints com o reqparse, como em app/routes.py antes dos esquemas.
+
+    Returns:
+        dict: RequestParser por endpoint.
+    """
+    iot = reqparse.RequestParser()
+    iot.add_argument('latitude', type=validar_range(-90, 90), required=True, help='Latitude é obrigatória')
+    iot.add_argument('longitude', type=validar_range(-180, 180), required=True, help='Longitude é obrigatória')
+
+    status = reqparse.RequestParser()
+    status.add_argument('status', type=str, required=True, help='Status é obrigatório')
+    status.add_argument('nome_recebido', type=validar_max_length(255), required=False, help='Nome recebido inválido')
+    status.add_argument('motivo', type=validar_max_length(255), required=False, help='Motivo inválido')
+    status.add_argument('versao', type=int, required=False, help='Versão deve ser um número inteiro')
+    return {'iot': iot, 'status': status}
+
+def _esquemas():
+    """
+    Declara os parâmetros dos dois endpoints com esquemas compilados, como em app/routes.py.
+
+    Returns:
+        dict: Esquema por endpoint.
+    """
+    return {
+        'iot': Esquema(
+            latitude=Campo(tipo=validar_range(-90, 90), obrigatorio=True, mensagem='Latitude é obrigatória'),
+            longitude=Campo(tipo=validar_range(-180, 180), obrigatorio=True, mensagem='Longitude é obrigatória')
+        ),
+        'status': Esquema(
+            status=Campo(obrigatorio=True, mensagem='Status é obrigatório'),
+            nome_recebido=Campo(tipo=validar_max_length(255), mensagem='Nome recebido inválido'),
+            motivo=Campo(tipo=validar_max_length(255), mensagem='Motivo inválido'),
+            versao=Campo(tipo=int, mensagem='Versão deve ser um número inteiro')
+        )
+    }
+
+CORPOS = {
+    'iot': {"latitude": -23.5505199, "longitude": -46.6333094},
+    'status': {"status": "entregue", "nome_recebido": "Maria da Silva", "versao": 3}
+}
+
+def _medir(app, corpo, funcao, repeticoes):
+    """
+    Mede o tempo médio de uma validação, cada uma em um novo contexto de requisição.
+
+    Args:
+        app (Flask): Aplicação usada para criar os contextos.
+        corpo (dict): Corpo JSON da requisição.
+        funcao (Callable): Validação sem argumentos.
+        repeticoes (int): Quantidade de execuções.
+
+    Returns:
+        float: Segundos por validação.
+
+    NOTE: O custo de criar o contexto de requisição é medido à parte e descontado.
+    """
+    def executar(validar):
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            with app.test_request_context(method='POST', json=corpo):
+                validar()
+        return time.perf_counter() - inicio
+
+    executar(funcao)
+    base = executar(lambda: None)
+    return max(executar(funcao) - base, 0) / repeticoes
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo por validação e o ganho de cada endpoint.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--repeticoes', type=int, default=20000, help='Validações por medição.')
+    opcoes = parser.parse_args()
+
+    app = Flask(__name__)
+    parsers, esquemas = _parsers(), _esquemas()
+
+    print(f"{opcoes.repeticoes} repetições")
+    for endpoint, corpo in CORPOS.items():
+        anterior = _medir(app, corpo, parsers[endpoint].parse_args, opcoes.repeticoes)
+        atual = _medir(app, corpo, esquemas[endpoint].validar, opcoes.repeticoes)
+        print(f"  {endpoint}")
+        print(f"    {'reqparse':<10} {anterior * 1e6:8.2f} µs/validação")
+        print(f"    {'esquema':<10} {atual * 1e6:8.2f} µs/validação")
+        print(f"    ganho: {anterior / atual:.2f}x")
+
+if __name__ == '__main__':
+    main()
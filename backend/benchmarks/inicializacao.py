@@ -0,0 +1,115 @@
+"""
+Módulo: inicializacao.py
+Descrição: Benchmark da inicialização a frio da API: importação de main.py, criação da aplicação pela fábrica
+           create_app(), primeiras requisições e um comando da CLI, cada medição em um interpretador novo.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Executar a partir de backend/: python -m benchmarks.inicializacao [--repeticoes 15]
+      Cada repetição inicia um processo Python novo, como um comando da CLI, a coleta dos testes ou um worker
+      reciclado do gunicorn. O tempo do interpretador vazio é medido à parte e descontado das medições de processo.
+NOTE: Usa um banco SQLite temporário (DATABASE_URL pode ser informada com --url); as chaves secretas, se ausentes do
+      ambiente, recebem valores fixos de teste.
+"""
+
+from statistics import median
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Executado em cada processo medido: imprime, em JSON, os segundos de cada etapa.
+_AMOSTRA = """
+import json, time
+inicio = time.perf_counter()
+import main
+importado = time.perf_counter()
+app = main.create_app()
+criado = time.perf_counter()
+cliente = app.test_client()
+cliente.get('/ping')
+ping = time.perf_counter()
+cliente.post('/usuarios/login', json={'cnh': '00000000000', 'placa_veiculo': 'AAA-0000'})
+login = time.perf_counter()
+print(json.dumps({'importacao': importado - inicio, 'fabrica': criado - importado,
+                  'primeiro_ping': ping - criado, 'primeiro_login': login - ping}))
+"""
+
+def _ambiente(url):
+    """
+    Monta o ambiente dos processos medidos.
+
+    Args:
+        url (str): URL do banco de dados.
+
+    Returns:
+        dict: Variáveis de ambiente.
+    """
+    ambiente = dict(os.environ, DATABASE_URL=url)
+    ambiente.setdefault('SECRET_KEY', 'benchmark')
+    ambiente.setdefault('JWT_SECRET_KEY', 'benchmark-jwt-benchmark-jwt-benchmark')
+    ambiente.setdefault('NUMERO_PEDIDO_CHAVE', 'benchmark')
+    return ambiente
+
+def _criar_tabelas(ambiente):
+    """
+    Cria as tabelas no banco de dados do benchmark, em um processo separado.
+
+    Args:
+        ambiente (dict): Variáveis de ambiente.
+    """
+    codigo = "import main\nfrom app.db import db\napp = main.create_app()\nwith app.app_context(): db.create_all()"
+    subprocess.run([sys.executable, '-c', codigo], env=ambiente, check=True)
+
+def _processo(comando, ambiente):
+    """
+    Executa um processo e mede o tempo total até o seu término.
+
+    Args:
+        comando (list): Comando e argumentos.
+        ambiente (dict): Variáveis de ambiente.
+
+    Returns:
+        tuple: (segundos, saída padrão).
+    """
+    inicio = time.perf_counter()
+    resultado = subprocess.run(comando, env=ambiente, check=True, capture_output=True, text=True)
+    return time.perf_counter() - inicio, resultado.stdout
+
+def main():
+    """
+    Executa o benchmark e imprime a mediana de cada etapa da inicialização.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--repeticoes', type=int, default=15, help='Processos iniciados por medição.')
+    parser.add_argument('--url', help='URL do banco de dados (padrão: SQLite temporário).')
+    opcoes = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        ambiente = _ambiente(opcoes.url or f"sqlite:///{os.path.join(pasta, 'benchmark.db')}")
+        _criar_tabelas(ambiente)
+
+        medidas = {'interpretador': [], 'importacao': [], 'fabrica': [], 'primeiro_ping': [], 'primeiro_login': [],
+                   'processo_completo': [], 'cli (flask routes)': []}
+        for _ in range(opcoes.repeticoes):
+            medidas['interpretador'].append(_processo([sys.executable, '-c', 'pass'], ambiente)[0])
+            segundos, saida = _processo([sys.executable, '-c', _AMOSTRA], ambiente)
+            medidas['processo_completo'].append(segundos)
+            for etapa, valor in json.loads(saida.strip().splitlines()[-1]).items():
+                medidas[etapa].append(valor)
+            medidas['cli (flask routes)'].append(
+                _processo([sys.executable, '-m', 'flask', '--app', 'main', 'routes'], ambiente)[0])
+
+    interpretador = median(medidas.pop('interpretador'))
+    print(f"{opcoes.repeticoes} processos por medição (medianas); interpretador vazio: {interpretador * 1000:.1f} ms")
+    for etapa, valores in medidas.items():
+        valor = median(valores)
+        if etapa in ('processo_completo', 'cli (flask routes)'):
+            valor -= interpretador
+        print(f"  {etapa:<20} {valor * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Módulo: leitura.py
+Descrição: Benchmark das listagens de localizações (GET /localizacoes/entrega/<id> e variantes): objetos do ORM
+           (Localizacao.query) versus consulta por colunas com objetos de leitura (app/leitura.py).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Executar a partir de backend/: python -m benchmarks.leitura [--quantidade 5000] [--repeticoes 20]
+      [--url sqlite://]. O padrão é um banco SQLite em memória, criado e populado pelo próprio script; com --url
+      apontando para um PostgreSQL vazio, as tabelas são criadas e removidas ao final.
+NOTE: São medidos o tempo por listagem (consulta e json() de cada registro) e o pico de memória alocada durante uma
+      listagem (tracemalloc).
+"""
+
+from flask import Flask
+from app.db import db
+from app.models.usuarios import Usuario
+from app.models.entrega import Entrega
+from app.models.localizacao import Localizacao
+from app.leitura import listar_localizacoes
+from datetime import datetime, timedelta
+from decimal import Decimal
+import argparse
+import time
+import tracemalloc
+import uuid
+
+TABELAS = [Usuario.__table__, Entrega.__table__, Localizacao.__table__]
+
+def _popular(quantidade):
+    """
+    Insere uma entrega com a quantidade informada de localizações.
+
+    Args:
+        quantidade (int): Quantidade de localizações.
+
+    Returns:
+        UUID: ID da entrega.
+    """
+    motorista_id, entrega_id = uuid.uuid4(), uuid.uuid4()
+    agora = datetime(2026, 10, 19, 8, 0, 0)
+    db.session.execute(db.insert(Usuario.__table__).values(
+        id=motorista_id, nome='Benchmark', placa_veiculo='BEN-0001', cnh='00000000000', telefone='11999999999'))
+    db.session.execute(db.insert(Entrega.__table__).values(
+        id=entrega_id, motorista_id=motorista_id, endereco_entrega='Rua A, 1', numero_pedido='BENCH1',
+        status='PENDENTE', nome_cliente='Cliente', versao=1))
+    db.session.execute(db.insert(Localizacao.__table__), [
+        {"id": uuid.uuid4(), "entrega_id": entrega_id, "motorista_id": motorista_id,
+         "latitude": Decimal('-23.5505199') + Decimal(i) / 10**6, "longitude": Decimal('-46.6333094'),
+         "data_hora": agora + timedelta(seconds=10 * i), "criado_em": agora, "atualizado_em": agora}
+        for i in range(quantidade)
+    ])
+    db.session.commit()
+    return entrega_id
+
+def _medir(funcao, repeticoes):
+    """
+    Mede o tempo médio e o pico de memória de uma listagem.
+
+    Args:
+        funcao (Callable): Listagem sem argumentos.
+        repeticoes (int): Quantidade de execuções.
+
+    Returns:
+        tuple: (segundos por listagem, pico de memória em bytes).
+
+    NOTE: A sessão é encerrada após cada execução, como ao final de uma requisição.
+    """
+    funcao()
+    db.session.remove()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+        db.session.remove()
+    segundos = (time.perf_counter() - inicio) / repeticoes
+
+    tracemalloc.start()
+    funcao()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.remove()
+    return segundos, pico
+
+def main():
+    """
+    Executa o benchmark e imprime, para cada forma de leitura, o tempo e a memória por listagem.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--quantidade', type=int, default=5000, help='Localizações da entrega listada.')
+    parser.add_argument('--repeticoes', type=int, default=20, help='Listagens por medição.')
+    parser.add_argument('--url', default='sqlite://', help='URL do banco de dados.')
+    opcoes = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = opcoes.url
+    db.init_app(app)
+
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=TABELAS)
+        try:
+            entrega_id = _popular(opcoes.quantidade)
+
+            def orm():
+                return [loc.json() for loc in Localizacao.query.filter_by(entrega_id=entrega_id).all()]
+
+            def colunas():
+                return [loc.json() for loc in listar_localizacoes(entrega_id=entrega_id)]
+
+            resultados = {'ORM': _medir(orm, opcoes.repeticoes), 'colunas': _medir(colunas, opcoes.repeticoes)}
+        finally:
+            db.session.remove()
+            db.metadata.drop_all(db.engine, tables=TABELAS)
+
+    print(f"{opcoes.quantidade} localizações por listagem, {opcoes.repeticoes} repetições")
+    for nome, (segundos, pico) in resultados.items():
+        print(f"  {nome:<8} {segundos * 1000:8.2f} ms/listagem  {segundos * 1e6 / opcoes.quantidade:6.2f} µs/registro"
+              f"  {pico / 1024:9.1f} KiB pico")
+    (orm_s, orm_pico), (col_s, col_pico) = resultados['ORM'], resultados['colunas']
+    print(f"  ganho: {orm_s / col_s:.2f}x em tempo, {orm_pico / col_pico:.2f}x em memória")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Módulo: metricas.py
+Descrição: Benchmark do custo da coleta de métricas (app/metricas.py) por requisição: a mesma rota atendida por uma
+           aplicação com METRICAS_ATIVAS=1 e por outra com METRICAS_ATIVAS=0.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Executar a partir de backend/: python -m benchmarks.metricas [--requisicoes 5000]
+      As requisições passam pelo cliente de testes do Flask (sem rede) a GET /ping, que não consulta o banco, de modo
+      que a diferença entre as duas aplicações é dominada pelos hooks de métricas. Como essa diferença é pequena
+      perto do ruído da medição, os hooks também são medidos isoladamente. As chaves secretas e o banco
+      (SQLite em memória), se ausentes do ambiente, recebem valores fixos de teste.
+"""
+
+import argparse
+import os
+import time
+
+def _aplicacao(ativas):
+    """
+    Cria uma aplicação pela fábrica de main.py com a coleta de métricas ligada ou desligada.
+
+    Args:
+        ativas (bool): Valor de METRICAS_ATIVAS.
+
+    Returns:
+        Flask: Aplicação.
+    """
+    from main import create_app
+    os.environ['METRICAS_ATIVAS'] = '1' if ativas else '0'
+    return create_app()
+
+def _medir(cliente, requisicoes):
+    """
+    Mede o tempo médio de uma requisição a GET /ping.
+
+    Args:
+        cliente (FlaskClient): Cliente de testes.
+        requisicoes (int): Quantidade de requisições.
+
+    Returns:
+        float: Segundos por requisição.
+    """
+    for _ in range(100):
+        cliente.get('/ping')
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        cliente.get('/ping')
+    return (time.perf_counter() - inicio) / requisicoes
+
+def _medir_hooks(app, repeticoes):
+    """
+    Mede o tempo dos hooks de métricas de uma requisição, chamados diretamente.
+
+    Args:
+        app (Flask): Aplicação com métricas ativas.
+        repeticoes (int): Quantidade de requisições simuladas.
+
+    Returns:
+        float: Segundos por requisição.
+    """
+    from app.metricas import _iniciar_requisicao, _registrar_resposta, _encerrar_requisicao
+    with app.test_request_context('/ping'):
+        resposta = app.response_class(b'{"pong": true}')
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            _iniciar_requisicao()
+            _registrar_resposta(resposta)
+            _encerrar_requisicao(None)
+        return (time.perf_counter() - inicio) / repeticoes
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo por requisição com e sem métricas.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--requisicoes', type=int, default=5000, help='Requisições por medição.')
+    parser.add_argument('--rodadas', type=int, default=7, help='Medições alternadas de cada aplicação (vale a menor).')
+    opcoes = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-jwt-benchmark-jwt-benchmark')
+    os.environ.setdefault('NUMERO_PEDIDO_CHAVE', 'benchmark')
+    os.environ.setdefault('LIMITE_PADRAO', '1000000000 per hour')
+    com_metricas = _aplicacao(True)
+    clientes = {'sem métricas': _aplicacao(False).test_client(), 'com métricas': com_metricas.test_client()}
+
+    resultados = {nome: [] for nome in clientes}
+    for _ in range(opcoes.rodadas):
+        for nome, cliente in clientes.items():
+            resultados[nome].append(_medir(cliente, opcoes.requisicoes))
+
+    print(f"GET /ping, {opcoes.requisicoes} requisições x {opcoes.rodadas} rodadas (menor média)")
+    for nome, medidas in resultados.items():
+        print(f"  {nome:<15} {min(medidas) * 1e6:8.1f} µs/requisição")
+    custo = min(resultados['com métricas']) - min(resultados['sem métricas'])
+    print(f"  {'diferença':<15} {custo * 1e6:8.1f} µs/requisição")
+    hooks = min(_medir_hooks(com_metricas, opcoes.requisicoes) for _ in range(opcoes.rodadas))
+    print(f"  {'hooks isolados':<15} {hooks * 1e6:8.1f} µs/requisição")
+
+if __name__ == '__main__':
+    main()
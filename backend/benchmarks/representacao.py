@@ -0,0 +1,112 @@
+"""
+Módulo: representacao.py
+Descrição: Benchmark da serialização das listas de localizações (GET /localizacoes e variantes): json da biblioteca
+           padrão com conversões em json() versus orjson com valores nativos (app/representacao.py).
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Executar a partir de backend/: python -m benchmarks.representacao [--quantidade 1000] [--repeticoes 200]
+      Não usa banco de dados: as localizações são instâncias transientes do modelo, e apenas a montagem do corpo
+      (json() dos modelos) e a serialização da resposta são medidas.
+"""
+
+from flask import Flask
+from flask_restful.representations.json import output_json
+from app.models.entrega import Entrega  # noqa: F401 (registra o mapeamento referenciado por Localizacao)
+from app.models.localizacao import Localizacao
+from app.representacao import saida_json
+from datetime import datetime, timedelta
+from decimal import Decimal
+import argparse
+import time
+import uuid
+
+def _json_anterior(localizacao):
+    """
+    Reproduz Localizacao.json() com as conversões para str/float exigidas pelo json da biblioteca padrão.
+
+    Args:
+        localizacao (Localizacao): Localização.
+
+    Returns:
+        dict: Representação com tipos nativos do JSON.
+    """
+    return {
+        "id": str(localizacao.id),
+        "entrega_id": str(localizacao.entrega_id) if localizacao.entrega_id else None,
+        "motorista_id": str(localizacao.motorista_id) if localizacao.motorista_id else None,
+        "latitude": float(localizacao.latitude),
+        "longitude": float(localizacao.longitude),
+        "data_hora": str(localizacao.data_hora),
+        "criado_em": str(localizacao.criado_em),
+        "atualizado_em": str(localizacao.atualizado_em)
+    }
+
+def _localizacoes(quantidade):
+    """
+    Cria localizações transientes com todos os campos preenchidos.
+
+    Args:
+        quantidade (int): Quantidade de localizações.
+
+    Returns:
+        list: Instâncias de Localizacao.
+    """
+    agora = datetime(2026, 10, 19, 8, 0, 0)
+    localizacoes = []
+    for i in range(quantidade):
+        momento = agora + timedelta(seconds=10 * i)
+        localizacoes.append(Localizacao(
+            id=uuid.uuid4(), entrega_id=uuid.uuid4(), motorista_id=uuid.uuid4(),
+            latitude=Decimal('-23.5505199') + Decimal(i) / 10**6, longitude=Decimal('-46.6333094'),
+            data_hora=momento, criado_em=momento, atualizado_em=momento
+        ))
+    return localizacoes
+
+def _medir(funcao, repeticoes):
+    """
+    Mede o tempo médio de uma função.
+
+    Args:
+        funcao (Callable): Função sem argumentos.
+        repeticoes (int): Quantidade de execuções.
+
+    Returns:
+        float: Segundos por execução.
+    """
+    funcao()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+def main():
+    """
+    Executa o benchmark e imprime o tempo por resposta e as respostas por segundo de cada serializador.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--quantidade', type=int, default=1000, help='Localizações por resposta.')
+    parser.add_argument('--repeticoes', type=int, default=200, help='Respostas serializadas por medição.')
+    opcoes = parser.parse_args()
+
+    localizacoes = _localizacoes(opcoes.quantidade)
+    app = Flask(__name__)
+
+    def anterior():
+        corpo = {"Localizacoes": [_json_anterior(loc) for loc in localizacoes], "message": "ok", "status": True}
+        return output_json(corpo, 200).get_data()
+
+    def atual():
+        corpo = {"Localizacoes": [loc.json() for loc in localizacoes], "message": "ok", "status": True}
+        return saida_json(corpo, 200).get_data()
+
+    with app.app_context():
+        resultados = {'json + str()': _medir(anterior, opcoes.repeticoes), 'orjson': _medir(atual, opcoes.repeticoes)}
+
+    print(f"{opcoes.quantidade} localizações por resposta, {opcoes.repeticoes} repetições")
+    for nome, segundos in resultados.items():
+        print(f"  {nome:<14} {segundos * 1000:8.2f} ms/resposta  {1 / segundos:8.1f} respostas/s")
+    print(f"  ganho: {resultados['json + str()'] / resultados['orjson']:.2f}x")
+
+if __name__ == '__main__':
+    main()
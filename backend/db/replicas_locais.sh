@@ -0,0 +1,66 @@
+#!/usr/bin/env bash
+# Módulo: replicas_locais.sh
+# Descrição: Sobe dois PostgreSQL locais, um primário e uma réplica em streaming, para testar DATABASE_REPLICA_URLS.
+# Autor: Rafael dos Santos Giorgi
+# Data: 19/10/2026
+#
+# NOTE: Uso (a partir de backend/, com os binários do PostgreSQL no PATH: initdb, pg_ctl, pg_basebackup, createdb):
+#         db/replicas_locais.sh iniciar [pasta]   cria (se preciso) e inicia os dois servidores
+#         db/replicas_locais.sh parar [pasta]     para os dois servidores
+#         db/replicas_locais.sh remover [pasta]   para os servidores e apaga a pasta
+#       A pasta padrão é .replicas_locais. As portas são PORTA_PRIMARIO (5432) e PORTA_REPLICA (5433), e o banco é
+#       BANCO (entregas_db). Os servidores aceitam apenas conexões locais, sem senha (usuário postgres).
+# NOTE: Depois de iniciar, crie as tabelas no primário (flask db upgrade) e suba a API com as URLs impressas. Para
+#       simular a queda da réplica, pare-a com: pg_ctl -D <pasta>/replica stop. As leituras devem continuar (no
+#       primário) e GET /banco/pool deve mostrar a réplica com 'disponivel' falso.
+
+set -euo pipefail
+
+ACAO=${1:-iniciar}
+PASTA=${2:-.replicas_locais}
+PORTA_PRIMARIO=${PORTA_PRIMARIO:-5432}
+PORTA_REPLICA=${PORTA_REPLICA:-5433}
+BANCO=${BANCO:-entregas_db}
+
+iniciar() {
+    mkdir -p "$PASTA"
+    if [ ! -d "$PASTA/primario" ]; then
+        initdb -D "$PASTA/primario" -U postgres --auth=trust >/dev/null
+        cat >> "$PASTA/primario/postgresql.conf" <<EOF
+port = $PORTA_PRIMARIO
+listen_addresses = 'localhost'
+wal_level = replica
+max_wal_senders = 4
+hot_standby = on
+EOF
+    fi
+    pg_ctl -D "$PASTA/primario" -l "$PASTA/primario.log" -w status >/dev/null 2>&1 \
+        || pg_ctl -D "$PASTA/primario" -l "$PASTA/primario.log" -w start
+    createdb -h localhost -p "$PORTA_PRIMARIO" -U postgres "$BANCO" 2>/dev/null || true
+
+    if [ ! -d "$PASTA/replica" ]; then
+        # -R grava standby.signal e a conexão com o primário; a réplica passa a receber o WAL em streaming.
+        pg_basebackup -h localhost -p "$PORTA_PRIMARIO" -U postgres -D "$PASTA/replica" -R -X stream -c fast
+        echo "port = $PORTA_REPLICA" >> "$PASTA/replica/postgresql.conf"
+    fi
+    pg_ctl -D "$PASTA/replica" -l "$PASTA/replica.log" -w status >/dev/null 2>&1 \
+        || pg_ctl -D "$PASTA/replica" -l "$PASTA/replica.log" -w start
+
+    echo "DATABASE_URL=postgresql://postgres@localhost:$PORTA_PRIMARIO/$BANCO"
+    echo "DATABASE_REPLICA_URLS=postgresql://postgres@localhost:$PORTA_REPLICA/$BANCO"
+}
+
+parar() {
+    for servidor in replica primario; do
+        if [ -d "$PASTA/$servidor" ]; then
+            pg_ctl -D "$PASTA/$servidor" -m fast stop || true
+        fi
+    done
+}
+
+case "$ACAO" in
+    iniciar) iniciar ;;
+    parar) parar ;;
+    remover) parar; rm -rf "$PASTA" ;;
+    *) echo "Uso: $0 {iniciar|parar|remover} [pasta]" >&2; exit 1 ;;
+esac
@@ -1,38 +1,34 @@
 """
 Módulo: main.py
-Descrição: Ponto de entrada da aplicação Flask, inicializa a API e registra os endpoints.
+Descrição: Ponto de entrada da aplicação Flask: fábrica create_app(), que inicializa a API e registra os endpoints.
 Autor: Rafael dos Santos Giorgi
 Data: 01/10/2025
 
-NOTE: A blacklist é mantida em memória localmente; considere Redis em produção.
-TODO: Desativar modo de depuração (debug=False) em produção.
+NOTE: A blacklist de JWT é configurada por JWT_BLOCKLIST (ver app/utils.py).
+NOTE: 'python main.py' inicia o servidor de desenvolvimento (depuração apenas com FLASK_DEBUG=1). Em produção, use
+      'flask serve' (ver app/servidor.py).
+NOTE: Importar este módulo não cria a aplicação: a CLI do Flask (FLASK_APP=main.py) e servidores WSGI
+      ('main:create_app()') chamam a fábrica. Tempos de inicialização: python -m benchmarks.inicializacao.
 """
 
-from flask import Flask, jsonify, request
+from flask import current_app, jsonify, request
+from flask.cli import AppGroup, with_appcontext
 from flask_restful import Api
-from app.db import create_app, db
+from werkzeug.exceptions import HTTPException
+from app.db import configurar_app, db
 from flask_jwt_extended import JWTManager
-from app.routes import Ping, UsuarioResource, LoginResource, LogoutResource, SessionResource, EntregaResource, EntregaPorNumeroResource, EntregaPorMotoristaResource, EntregaStatusResource, LocalizacaoResource, LocalizacaoIoTResource, LocalizacaoEntregaResource, LocalizacaoMotoristaResource
-from app.utils import check_if_token_in_blacklist
+from app.routes import Ping, UsuarioResource, LoginResource, LogoutResource, SessionResource, EntregaResource, EntregaLoteResource, EntregaFotoResource, FotoResource, FotoProcessamentoResource, PoolBancoResource, EntregaPorNumeroResource, EntregaPorMotoristaResource, EntregaStatusResource, EntregaStatusLoteResource, EntregaEstatisticasResource, EntregaBuscaResource, MetricasResource, LocalizacaoResource, LocalizacaoIoTResource, LocalizacaoEntregaResource, LocalizacaoMotoristaResource, SincronizacaoResource
+from app.utils import check_if_token_in_blacklist, init_blocklist
 from dotenv import load_dotenv
 import os
 from flask_babel import Babel
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from datetime import timedelta
-from flask_migrate import Migrate
-
-load_dotenv()
-app = create_app()
-api = Api(app)
-jwt = JWTManager(app)
-babel = Babel(app)
-limiter = Limiter(
-    app=app,
-    key_func=get_remote_address,
-    default_limits=["100 per hour"]
-)
-migrate = Migrate(app, db)
+from app.limites import init_limites
+from app.proxy import init_proxy
+from app.compressao import init_compressao
+from app.metricas import init_metricas
+from app.perfil_sql import init_perfil_sql
+from app.representacao import saida_json
+import click
 
 def decorated_check_if_token_in_blacklist(jwt_header, jwt_payload):
     """
@@ -52,20 +48,6 @@ def decorated_check_if_token_in_blacklist(jwt_header, jwt_payload):
         raise KeyError("Token JWT inválido: 'jti' não encontrado.")
     return check_if_token_in_blacklist(jwt_payload)
 
-app.config["JWT_SECRET_KEY"] = os.getenv('JWT_SECRET_KEY')
-if not app.config["JWT_SECRET_KEY"]:
-    raise ValueError("JWT_SECRET_KEY não configurada no ambiente.")
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(days=7)
-app.config["BABEL_DEFAULT_LOCALE"] = 'pt_BR'
-app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024
-app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv('DATABASE_URL')
-if not app.config["SQLALCHEMY_DATABASE_URI"]:
-    raise ValueError("DATABASE_URL não configurada no ambiente.")
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.config["UPLOAD_FOLDER"] = os.path.join(os.path.dirname(__file__), 'uploads')
-os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
-
-@jwt.token_in_blocklist_loader
 def token_in_blocklist_callback(jwt_header, jwt_payload):
     """
     Callback para verificar se o token está na blacklist.
@@ -82,6 +64,21 @@ def token_in_blocklist_callback(jwt_header, jwt_payload):
     except KeyError as e:
         return jsonify({"error": str(e), "status": False}), 400
 
+def token_rejeitado_callback(*args):
+    """
+    Responde às requisições com token JWT ausente, inválido, expirado ou revogado.
+
+    Args:
+        *args: Motivo (token ausente ou inválido) ou cabeçalho e payload do token (expirado ou revogado).
+
+    Returns:
+        tuple: JSON com 'error' e 'status' falso (status 401).
+
+    NOTE: Os erros do flask_jwt_extended só chegam a estes handlers com PROPAGATE_EXCEPTIONS (ver app/db.py); sem
+          ela, o Flask-RESTful os converte em 500.
+    """
+    return jsonify({"error": "Token de autenticação ausente ou inválido", "status": False}), 401
+
 def get_locale():
     """
     Determina o idioma preferido com base nos cabeçalhos de aceitação do cliente.
@@ -93,7 +90,6 @@ def get_locale():
     """
     return request.accept_languages.best_match(['pt_BR', 'en_US'], default='pt_BR')
 
-@app.errorhandler(Exception)
 def handle_exception(e):
     """
     Trata exceções não capturadas na aplicação.
@@ -102,33 +98,157 @@ def handle_exception(e):
         e (Exception): Exceção levantada.
 
     Returns:
-        tuple: JSON com mensagem de erro e status 500 (Internal Server Error).
+        tuple: JSON com 'error' e 'status' falso e o código do erro HTTP (ex.: 404 para rotas inexistentes).
+        tuple: JSON com mensagem de erro e status 500 (Internal Server Error) para as demais exceções.
 
-    NOTE: Logar o erro em um sistema de logging em produção para rastreamento.
+    NOTE: Erros internos são registrados com o traceback no log da aplicação; a contagem por recurso e código fica em
+          /metrics.
     """
+    if isinstance(e, HTTPException):
+        return jsonify({"error": e.description, "status": False}), e.code
+    current_app.logger.exception("Erro não tratado em %s %s", request.method, request.path)
     return jsonify({"message": f"Erro interno no servidor: {str(e)}", "status": False}), 500
 
-api.add_resource(Ping, '/ping')
-api.add_resource(UsuarioResource, '/usuarios', '/usuarios/<uuid:user_id>')
-api.add_resource(LoginResource, '/usuarios/login')
-api.add_resource(LogoutResource, '/usuarios/logout')
-api.add_resource(SessionResource, '/usuarios/session')
-api.add_resource(EntregaResource, '/entregas', '/entregas/<uuid:entrega_id>')
-api.add_resource(EntregaPorNumeroResource, '/entregas/numero_pedido/<string:numero_pedido>')
-api.add_resource(EntregaPorMotoristaResource, '/entregas/motorista/<uuid:motorista_id>')
-api.add_resource(EntregaStatusResource, '/entregas/<uuid:entrega_id>/status')
-api.add_resource(LocalizacaoResource, '/localizacoes', '/localizacoes/<uuid:loc_id>')
-api.add_resource(LocalizacaoIoTResource, '/localizacoes/iot')
-api.add_resource(LocalizacaoEntregaResource, '/localizacoes/entrega/<uuid:entrega_id>')
-api.add_resource(LocalizacaoMotoristaResource, '/localizacoes/motorista/<uuid:motorista_id>')
-
-# Bloco para registrar o comando 'seed-db' (POSIÇÃO CORRETA)
-@app.cli.command("seed-db")
+@click.command("seed-db")
+@with_appcontext
 def seed_db_command():
     """Popula o banco de dados com dados de teste."""
     from seed import seed_data # Adicione o import aqui dentro para evitar importação circular
     seed_data()
 
+@click.command("importar-entregas")
+@with_appcontext
+@click.argument("arquivo", type=click.Path(exists=True, dir_okay=False))
+@click.option("--parcial", is_flag=True, help="Importa as linhas válidas mesmo que outras tenham erros.")
+def importar_entregas_command(arquivo, parcial):
+    """Importa entregas em lote a partir de um arquivo CSV ou JSON."""
+    from app.importacao import ler_arquivo_entregas, importar_entregas
+    try:
+        linhas = ler_arquivo_entregas(arquivo)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    criadas, erros = importar_entregas(linhas, parcial=parcial)
+    for erro in erros:
+        click.echo(f"Linha {erro['linha']}: {erro['error']}", err=True)
+    if not criadas:
+        db.session.rollback()
+        raise click.ClickException("Nenhuma entrega foi importada.")
+    db.session.commit()
+    click.echo(f"{len(criadas)} entregas importadas com sucesso.")
+
+@click.command("limpar-idempotencia")
+@with_appcontext
+def limpar_idempotencia_command():
+    """Remove as chaves de idempotência expiradas de /sync."""
+    from app.sincronizacao import remover_chaves_expiradas
+    removidas = remover_chaves_expiradas()
+    db.session.commit()
+    click.echo(f"{removidas} chaves expiradas removidas.")
+
+@click.command("processar-fotos")
+@with_appcontext
+def processar_fotos_command():
+    """Gera as variantes que faltam nas fotos de prova armazenadas."""
+    from app.fotos import fotos_sem_variantes
+    from app.miniaturas import gerar_variantes
+    pendentes = fotos_sem_variantes()
+    for original in pendentes:
+        try:
+            gerar_variantes(original)
+        except Exception as e:
+            click.echo(f"{os.path.basename(original)}: {str(e)}", err=True)
+    click.echo(f"{len(pendentes)} fotos processadas.")
+
+@click.command("serve")
+@with_appcontext
+@click.option("--bind", "-b", help="Endereço de escuta (ex.: 0.0.0.0:5000). Padrão: SERVIDOR_BIND.")
+@click.option("--workers", "-w", type=int, help="Processos de trabalho. Padrão: SERVIDOR_WORKERS (2 x núcleos + 1).")
+@click.option("--threads", "-t", type=int, help="Threads por processo. Padrão: SERVIDOR_THREADS (4).")
+@click.option("--max-requests", type=int, help="Requisições atendidas por um processo antes de ser reciclado. Padrão: SERVIDOR_MAX_REQUESTS (1000).")
+def serve_command(bind, workers, threads, max_requests):
+    """Inicia a API em produção (gunicorn) com processos de trabalho pré-carregados."""
+    from app.servidor import ServidorProducao
+    ServidorProducao(current_app._get_current_object(), {"bind": bind, "workers": workers, "threads": threads, "max_requests": max_requests}).run()
+
+class ComandosAplicacao(AppGroup):
+    """
+    Comandos da aplicação na CLI, com o grupo 'flask db' do Flask-Migrate registrado apenas quando é usado.
+
+    NOTE: O Flask-Migrate importa o Alembic, que não é usado pelos workers, pelos testes nem pelos demais comandos.
+    """
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), 'db'})
+
+    def get_command(self, ctx, nome):
+        if nome == 'db' and 'migrate' not in current_app.extensions:
+            from flask_migrate import Migrate
+            Migrate(current_app._get_current_object(), db)
+        return super().get_command(ctx, nome)
+
+COMANDOS = (seed_db_command, importar_entregas_command, limpar_idempotencia_command, processar_fotos_command, serve_command)
+
+def create_app():
+    """
+    Fábrica da aplicação: cria a aplicação Flask configurada e registra as extensões, as rotas e os comandos.
+
+    Returns:
+        Flask: Aplicação pronta para servir requisições.
+
+    Raises:
+        ValueError: Se variáveis de ambiente obrigatórias não estiverem definidas.
+
+    NOTE: Usada pela CLI ('flask', com FLASK_APP=main.py), por 'python main.py' e pelo gunicorn ('main:create_app()').
+          O Flask-Migrate só é registrado quando um comando 'flask db' é usado (ver ComandosAplicacao).
+    """
+    load_dotenv()
+    app = configurar_app()
+    app.config["UPLOAD_FOLDER"] = os.path.join(os.path.dirname(__file__), 'uploads')
+    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+
+    api = Api(app)
+    api.representations['application/json'] = saida_json
+    init_metricas(app, db)
+    init_perfil_sql(app, db)
+    jwt = JWTManager(app)
+    jwt.token_in_blocklist_loader(token_in_blocklist_callback)
+    for registrar in (jwt.unauthorized_loader, jwt.invalid_token_loader, jwt.expired_token_loader, jwt.revoked_token_loader):
+        registrar(token_rejeitado_callback)
+    Babel(app)
+    init_proxy(app)
+    init_limites(app)
+    init_compressao(app)
+    init_blocklist(app)
+    app.register_error_handler(Exception, handle_exception)
+
+    api.add_resource(Ping, '/ping')
+    api.add_resource(UsuarioResource, '/usuarios', '/usuarios/<uuid:user_id>')
+    api.add_resource(LoginResource, '/usuarios/login')
+    api.add_resource(LogoutResource, '/usuarios/logout')
+    api.add_resource(SessionResource, '/usuarios/session')
+    api.add_resource(EntregaResource, '/entregas', '/entregas/<uuid:entrega_id>')
+    api.add_resource(EntregaLoteResource, '/entregas/lote')
+    api.add_resource(EntregaFotoResource, '/entregas/<uuid:entrega_id>/foto', '/entregas/<uuid:entrega_id>/foto/<string:upload_id>')
+    api.add_resource(FotoProcessamentoResource, '/fotos/processamento')
+    api.add_resource(FotoResource, '/fotos/<string:identificador>')
+    api.add_resource(PoolBancoResource, '/banco/pool')
+    api.add_resource(MetricasResource, '/metrics')
+    api.add_resource(EntregaPorNumeroResource, '/entregas/numero_pedido/<string:numero_pedido>')
+    api.add_resource(EntregaPorMotoristaResource, '/entregas/motorista/<uuid:motorista_id>')
+    api.add_resource(EntregaStatusResource, '/entregas/<uuid:entrega_id>/status')
+    api.add_resource(EntregaStatusLoteResource, '/entregas/status/lote')
+    api.add_resource(EntregaEstatisticasResource, '/entregas/estatisticas')
+    api.add_resource(EntregaBuscaResource, '/entregas/busca')
+    api.add_resource(LocalizacaoResource, '/localizacoes', '/localizacoes/<uuid:loc_id>')
+    api.add_resource(LocalizacaoIoTResource, '/localizacoes/iot')
+    api.add_resource(LocalizacaoEntregaResource, '/localizacoes/entrega/<uuid:entrega_id>')
+    api.add_resource(LocalizacaoMotoristaResource, '/localizacoes/motorista/<uuid:motorista_id>')
+    api.add_resource(SincronizacaoResource, '/sync')
+
+    app.cli = ComandosAplicacao(app.name)
+    for comando in COMANDOS:
+        app.cli.add_command(comando)
+    return app
 
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', debug=True)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', debug=os.getenv('FLASK_DEBUG') == '1')
@@ -0,0 +1,24 @@
+"""Sequência para alocação de números de pedido
+
+Revision ID: 240187b18d55
+Revises: a4170c637eaf
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '240187b18d55'
+down_revision = 'a4170c637eaf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.schema.CreateSequence(sa.Sequence('numero_pedido_seq')))
+
+
+def downgrade():
+    op.execute(sa.schema.DropSequence(sa.Sequence('numero_pedido_seq')))
@@ -0,0 +1,33 @@
+"""Tokens JWT revogados compartilhados entre processos
+
+Revision ID: 3b8f2d6e9a14
+Revises: e7a3c58b2f19
+Create Date: 2026-10-19 16:42:10.118275
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f2d6e9a14'
+down_revision = 'e7a3c58b2f19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('token_revogado',
+    sa.Column('jti', sa.String(length=64), nullable=False),
+    sa.Column('expira_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    with op.batch_alter_table('token_revogado', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_token_revogado_expira_em'), ['expira_em'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('token_revogado', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_token_revogado_expira_em'))
+
+    op.drop_table('token_revogado')
@@ -0,0 +1,63 @@
+"""Histórico de eventos de entrega e contadores diários por motorista
+
+Revision ID: 5c2e9a7d41b3
+Revises: 8301612d5839
+Create Date: 2026-10-19 11:22:05.481936
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e9a7d41b3'
+down_revision = '8301612d5839'
+branch_labels = None
+depends_on = None
+
+status_entrega = postgresql.ENUM('PENDENTE', 'EM_ROTA', 'ENTREGUE', 'CANCELADA', 'NAO_ENTREGUE', name='statusentrega', create_type=False)
+
+
+def upgrade():
+    op.create_table('entrega_evento',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('entrega_id', sa.UUID(), nullable=False),
+    sa.Column('motorista_id', sa.UUID(), nullable=False),
+    sa.Column('status', status_entrega, nullable=False),
+    sa.Column('motivo', sa.String(length=255), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('entrega_evento', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_entrega_evento_entrega_id'), ['entrega_id'], unique=False)
+
+    op.create_table('entrega_contador',
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('motorista_id', sa.UUID(), nullable=False),
+    sa.Column('status', status_entrega, nullable=False),
+    sa.Column('quantidade', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('dia', 'motorista_id', 'status')
+    )
+
+    # Entregas já existentes entram no histórico com o status atual, na data da última atualização.
+    op.execute("""
+        INSERT INTO entrega_evento (entrega_id, motorista_id, status, motivo, criado_em)
+        SELECT id, motorista_id, status, motivo, COALESCE(atualizado_em, criado_em, CURRENT_TIMESTAMP)
+        FROM entrega
+        ORDER BY COALESCE(atualizado_em, criado_em, CURRENT_TIMESTAMP)
+    """)
+    op.execute("""
+        INSERT INTO entrega_contador (dia, motorista_id, status, quantidade)
+        SELECT CAST(criado_em AS DATE), motorista_id, status, COUNT(*)
+        FROM entrega_evento
+        GROUP BY CAST(criado_em AS DATE), motorista_id, status
+    """)
+
+
+def downgrade():
+    op.drop_table('entrega_contador')
+    with op.batch_alter_table('entrega_evento', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_entrega_evento_entrega_id'))
+
+    op.drop_table('entrega_evento')
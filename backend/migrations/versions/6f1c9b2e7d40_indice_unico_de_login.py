@@ -0,0 +1,53 @@
+"""Índice único de login (cnh, placa_veiculo)
+
+Revision ID: 6f1c9b2e7d40
+Revises: 3b8f2d6e9a14
+Create Date: 2026-10-19 17:20:44.506113
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6f1c9b2e7d40'
+down_revision = '3b8f2d6e9a14'
+branch_labels = None
+depends_on = None
+
+
+# Usuários repetidos (mesma CNH e placa) são unificados no mais antigo antes da criação do índice: entregas,
+# localizações, eventos e contadores dos repetidos passam para ele e as chaves de idempotência são descartadas.
+REPETIDOS = """
+    CREATE TEMPORARY TABLE usuario_repetido ON COMMIT DROP AS
+    SELECT id, manter FROM (
+        SELECT id, first_value(id) OVER (PARTITION BY cnh, placa_veiculo ORDER BY criado_em, id) AS manter
+        FROM usuario
+    ) AS usuarios
+    WHERE id <> manter
+"""
+
+
+def upgrade():
+    op.execute(REPETIDOS)
+    op.execute("UPDATE entrega SET motorista_id = r.manter FROM usuario_repetido r WHERE entrega.motorista_id = r.id")
+    op.execute("UPDATE localizacao SET motorista_id = r.manter FROM usuario_repetido r WHERE localizacao.motorista_id = r.id")
+    op.execute("UPDATE entrega_evento SET motorista_id = r.manter FROM usuario_repetido r WHERE entrega_evento.motorista_id = r.id")
+    op.execute("""
+        INSERT INTO entrega_contador (dia, motorista_id, status, quantidade)
+        SELECT c.dia, r.manter, c.status, sum(c.quantidade)
+        FROM entrega_contador c JOIN usuario_repetido r ON c.motorista_id = r.id
+        GROUP BY c.dia, r.manter, c.status
+        ON CONFLICT (dia, motorista_id, status)
+        DO UPDATE SET quantidade = entrega_contador.quantidade + EXCLUDED.quantidade
+    """)
+    op.execute("DELETE FROM entrega_contador c USING usuario_repetido r WHERE c.motorista_id = r.id")
+    op.execute("DELETE FROM chave_idempotencia k USING usuario_repetido r WHERE k.usuario_id = r.id")
+    op.execute("DELETE FROM usuario u USING usuario_repetido r WHERE u.id = r.id")
+
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.create_index('uq_usuario_cnh_placa_veiculo', ['cnh', 'placa_veiculo'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.drop_index('uq_usuario_cnh_placa_veiculo')
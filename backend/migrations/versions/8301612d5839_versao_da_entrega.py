@@ -0,0 +1,26 @@
+"""Coluna de versão para controle de concorrência otimista em entrega
+
+Revision ID: 8301612d5839
+Revises: 240187b18d55
+Create Date: 2026-10-19 10:04:17.339120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8301612d5839'
+down_revision = '240187b18d55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('entrega', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('versao', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('entrega', schema=None) as batch_op:
+        batch_op.drop_column('versao')
@@ -0,0 +1,34 @@
+"""Busca de entregas: extensões pg_trgm e unaccent e índices de trigramas
+
+Revision ID: 9d4b1f0c6a27
+Revises: 5c2e9a7d41b3
+Create Date: 2026-10-19 13:41:52.208713
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4b1f0c6a27'
+down_revision = '5c2e9a7d41b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    # unaccent() é STABLE e não pode ser usada em índices; o dicionário explícito torna o resultado imutável.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sem_acento(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+    op.execute('CREATE INDEX ix_entrega_nome_cliente_trgm ON entrega USING gin (sem_acento(lower(nome_cliente)) gin_trgm_ops)')
+    op.execute('CREATE INDEX ix_entrega_endereco_entrega_trgm ON entrega USING gin (sem_acento(lower(endereco_entrega)) gin_trgm_ops)')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_entrega_endereco_entrega_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_entrega_nome_cliente_trgm')
+    op.execute('DROP FUNCTION IF EXISTS sem_acento(text)')
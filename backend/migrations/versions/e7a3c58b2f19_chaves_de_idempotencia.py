@@ -0,0 +1,36 @@
+"""Chaves de idempotência da sincronização offline
+
+Revision ID: e7a3c58b2f19
+Revises: 9d4b1f0c6a27
+Create Date: 2026-10-19 15:06:37.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3c58b2f19'
+down_revision = '9d4b1f0c6a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chave_idempotencia',
+    sa.Column('usuario_id', sa.UUID(), nullable=False),
+    sa.Column('chave', sa.String(length=64), nullable=False),
+    sa.Column('resultado', sa.JSON(), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.Column('expira_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('usuario_id', 'chave')
+    )
+    with op.batch_alter_table('chave_idempotencia', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_chave_idempotencia_expira_em'), ['expira_em'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('chave_idempotencia', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_chave_idempotencia_expira_em'))
+
+    op.drop_table('chave_idempotencia')
@@ -1,20 +1,17 @@
 import random
-import string
 from datetime import datetime
 from app.db import db
+from app.numero_pedido import obter_alocador
+from app.eventos import registrar_eventos
 from app.models.usuarios import Usuario
 from app.models.entrega import Entrega, StatusEntrega
 from app.models.localizacao import Localizacao
-from main import app
-
-def gerar_numero_pedido_seed(tamanho=6):
-    caracteres = string.ascii_uppercase + string.digits
-    return ''.join(random.choice(caracteres) for _ in range(tamanho))
+from flask import current_app
 
 def seed_data():
-    with app.app_context():
+    with current_app.app_context():
         print("Limpando todas as tabelas...")
-        db.session.execute(db.text('TRUNCATE TABLE entrega, usuario, localizacao RESTART IDENTITY CASCADE;'))
+        db.session.execute(db.text('TRUNCATE TABLE entrega, usuario, localizacao, entrega_evento, entrega_contador RESTART IDENTITY CASCADE;'))
         db.session.commit()
         print("Tabelas limpas com sucesso.")
 
@@ -23,20 +20,23 @@ def seed_data():
         db.session.commit()
         print(f"Usuário '{motorista1.nome}' criado.")
 
+        numeros = iter(obter_alocador().reservar(10))
         entregas_para_criar = [
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Rua Dr. Salles de Oliveira, 1380, Vila Industrial, Campinas, SP", nome_cliente="Oficina do Zé", status=StatusEntrega.PENDENTE, observacao="Entregar no portão dos fundos."),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Avenida da Amizade, 2300, Vila Carlota, Sumaré, SP", nome_cliente="Supermercado Amigo", status=StatusEntrega.PENDENTE),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Rua Luiz Camilo de Camargo, 585, Centro, Hortolândia, SP", nome_cliente="Shopping Hortolândia", status=StatusEntrega.PENDENTE, observacao="Deixar na doca de recebimento 3."),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Av. Iguatemi, 777, Vila Brandina, Campinas, SP", nome_cliente="Shopping Iguatemi", status=StatusEntrega.PENDENTE),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Rua Antônio de Castro, 123, Sousas, Campinas, SP", nome_cliente="Empório do Campo", status=StatusEntrega.PENDENTE, observacao="Cuidado, rua de terra."),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Avenida Olivo Callegari, 789, Centro, Sumaré, SP", nome_cliente="Padaria Pão Nosso", status=StatusEntrega.PENDENTE),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Rua Sete de Setembro, 50, Centro, Valinhos, SP", nome_cliente="Loja de Ferragens Tavares", status=StatusEntrega.PENDENTE),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Avenida Francisco Glicério, 1000, Centro, Campinas, SP", nome_cliente="Relojoaria Pontual", status=StatusEntrega.PENDENTE, observacao="Procurar por Sra. Helena."),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Rua Rosina Zagatti, 204, Jardim Amanda II, Hortolândia, SP", nome_cliente="Farmácia Bem Estar", status=StatusEntrega.PENDENTE),
-            Entrega(motorista_id=motorista1.id, numero_pedido=gerar_numero_pedido_seed(), endereco_entrega="Avenida John Boyd Dunlop, 3900, Jardim Ipaussurama, Campinas, SP", nome_cliente="Parque Shopping Bandeiras", status=StatusEntrega.PENDENTE),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Rua Dr. Salles de Oliveira, 1380, Vila Industrial, Campinas, SP", nome_cliente="Oficina do Zé", status=StatusEntrega.PENDENTE, observacao="Entregar no portão dos fundos."),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Avenida da Amizade, 2300, Vila Carlota, Sumaré, SP", nome_cliente="Supermercado Amigo", status=StatusEntrega.PENDENTE),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Rua Luiz Camilo de Camargo, 585, Centro, Hortolândia, SP", nome_cliente="Shopping Hortolândia", status=StatusEntrega.PENDENTE, observacao="Deixar na doca de recebimento 3."),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Av. Iguatemi, 777, Vila Brandina, Campinas, SP", nome_cliente="Shopping Iguatemi", status=StatusEntrega.PENDENTE),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Rua Antônio de Castro, 123, Sousas, Campinas, SP", nome_cliente="Empório do Campo", status=StatusEntrega.PENDENTE, observacao="Cuidado, rua de terra."),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Avenida Olivo Callegari, 789, Centro, Sumaré, SP", nome_cliente="Padaria Pão Nosso", status=StatusEntrega.PENDENTE),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Rua Sete de Setembro, 50, Centro, Valinhos, SP", nome_cliente="Loja de Ferragens Tavares", status=StatusEntrega.PENDENTE),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Avenida Francisco Glicério, 1000, Centro, Campinas, SP", nome_cliente="Relojoaria Pontual", status=StatusEntrega.PENDENTE, observacao="Procurar por Sra. Helena."),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Rua Rosina Zagatti, 204, Jardim Amanda II, Hortolândia, SP", nome_cliente="Farmácia Bem Estar", status=StatusEntrega.PENDENTE),
+            Entrega(motorista_id=motorista1.id, numero_pedido=next(numeros), endereco_entrega="Avenida John Boyd Dunlop, 3900, Jardim Ipaussurama, Campinas, SP", nome_cliente="Parque Shopping Bandeiras", status=StatusEntrega.PENDENTE),
         ]
         
         db.session.add_all(entregas_para_criar)
+        db.session.flush()
+        registrar_eventos([{'entrega_id': e.id, 'motorista_id': e.motorista_id, 'status': e.status} for e in entregas_para_criar])
         db.session.commit()
         print(f"{len(entregas_para_criar)} entregas de teste foram criadas.")
 
@@ -0,0 +1,302 @@
+"""
+Módulo: servidor_ingestao.py
+Descrição: Servidor assíncrono (aiohttp) de ingestão das localizações enviadas por dispositivos IoT, implantado ao lado
+           da API para atender POST /localizacoes/iot.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Executar a partir de backend/: python servidor_ingestao.py [--host 0.0.0.0] [--porta 8001] [--porta-metricas 9101]
+      Cada conexão de dispositivo ocupa apenas uma corrotina, e não uma thread; as gravações são agrupadas em lotes
+      (app/ingestao.py) em um pool assíncrono de INGESTAO_POOL conexões. A porta é aberta com SO_REUSEPORT, de modo
+      que várias instâncias podem ser iniciadas na mesma máquina para usar mais núcleos.
+NOTE: O proxy reverso deve encaminhar POST /localizacoes/iot para este servidor e as demais rotas para a API. A
+      validação, as respostas e os limites (LIMITE_IOT por dispositivo, LIMITE_IOT_IP por IP) são os mesmos da rota
+      da API; com RATELIMIT_STORAGE_URI em Redis, os contadores são compartilhados entre as instâncias. Como as
+      conexões chegam pelo proxy, o IP do dispositivo é lido do X-Forwarded-For enviado pelos endereços em
+      PROXIES_CONFIAVEIS (app/proxy.py); sem ela, todos os dispositivos contam para o IP do proxy.
+NOTE: Além da rota de ingestão, GET /ping responde com a quantidade de localizações aguardando gravação, para
+      verificações de saúde do balanceador, e GET /metrics exporta no formato do Prometheus as localizações recebidas
+      por resultado (localizacoes_iot_total{origem="ingestao"}) e as que aguardam gravação. Como na API, /metrics
+      exige METRICAS_TOKEN, se definido, e responde 404 com METRICAS_ATIVAS=0.
+NOTE: Com várias instâncias na mesma porta, cada coleta de /metrics cai em uma instância qualquer. Inicie cada uma com
+      a sua --porta-metricas (ex.: 9101, 9102), que serve apenas GET /metrics sem SO_REUSEPORT, e cadastre essas
+      portas como alvos do Prometheus: as séries de cada instância ficam separadas pelo rótulo 'instance'.
+"""
+
+from aiohttp import web
+from app.ingestao import ESQUEMA_LOCALIZACAO_IOT, MENSAGEM_RECEBIDA, GravadorLotes, FilaCheia, url_assincrona
+from app.limites import PADRAO_DISPOSITIVO
+from app.metricas import contar_localizacao_iot, gerar_metricas, autorizado
+from app.proxy import ip_cliente, redes_confiaveis
+from app.representacao import dumps
+from dotenv import load_dotenv
+from limits import parse
+from limits.aio.strategies import STRATEGIES
+from limits.storage import storage_from_string
+from prometheus_client import Gauge
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.datastructures import MultiDict
+import argparse
+import orjson
+import os
+
+CHAVE_GRAVADOR = web.AppKey('gravador', GravadorLotes)
+CHAVE_METRICAS_TOKEN = web.AppKey('metricas_token', str)
+
+PENDENTES = Gauge('ingestao_localizacoes_pendentes', 'Localizações aguardando gravação.', multiprocess_mode='livesum')
+
+def _resposta(dados, status, headers=None):
+    """
+    Monta uma resposta JSON.
+
+    Args:
+        dados (dict): Corpo da resposta.
+        status (int): Código HTTP.
+        headers (dict, optional): Headers adicionais.
+
+    Returns:
+        Response: Resposta com o corpo serializado por app/representacao.py.
+    """
+    return web.Response(body=dumps(dados), status=status, headers=headers, content_type='application/json')
+
+class LimitesIngestao:
+    """
+    Limites de requisições da ingestão, equivalentes a LIMITES_IOT da API.
+
+    Args:
+        uri (str): Armazenamento dos contadores (RATELIMIT_STORAGE_URI).
+        estrategia (str): Estratégia de contagem (RATELIMIT_STRATEGY).
+        limite_dispositivo (str): Limite por dispositivo (LIMITE_IOT).
+        limite_ip (str): Limite por IP (LIMITE_IOT_IP).
+        proxies (tuple): Redes dos proxies cujo X-Forwarded-For é aceito (PROXIES_CONFIAVEIS).
+    """
+
+    def __init__(self, uri, estrategia, limite_dispositivo, limite_ip, proxies=()):
+        uri = uri if uri.startswith('async+') else f"async+{uri}"
+        self._limitador = STRATEGIES[estrategia](storage_from_string(uri))
+        self._dispositivo = parse(limite_dispositivo)
+        self._ip = parse(limite_ip)
+        self._proxies = proxies
+
+    async def verificar(self, request):
+        """
+        Conta a requisição nos limites do dispositivo e do IP.
+
+        Args:
+            request (Request): Requisição recebida.
+
+        Returns:
+            tuple: (limite excedido ou None, headers X-RateLimit-* do limite por dispositivo).
+
+        NOTE: Sem um X-Dispositivo-Id válido, o limite por dispositivo é contado pelo IP, como na API. O IP é o do
+              cliente informado pelos proxies confiáveis (ver app/proxy.py).
+        """
+        dispositivo = request.headers.get('X-Dispositivo-Id', '')
+        ip = f"ip:{ip_cliente(request.remote, request.headers.get('X-Forwarded-For'), self._proxies)}"
+        chave = f"dispositivo:{dispositivo}" if PADRAO_DISPOSITIVO.fullmatch(dispositivo) else ip
+
+        excedido = None
+        if not await self._limitador.hit(self._dispositivo, 'ingestao', chave):
+            excedido = self._dispositivo
+        elif not await self._limitador.hit(self._ip, 'ingestao-ip', ip):
+            excedido = self._ip
+        janela = await self._limitador.get_window_stats(self._dispositivo, 'ingestao', chave)
+        headers = {
+            'X-RateLimit-Limit': str(self._dispositivo.amount),
+            'X-RateLimit-Remaining': str(janela.remaining),
+            'X-RateLimit-Reset': str(int(janela.reset_time)),
+        }
+        return excedido, headers
+
+CHAVE_LIMITES = web.AppKey('limites', LimitesIngestao)
+
+async def _ler_entrada(request):
+    """
+    Lê o corpo da requisição como o Flask: JSON, ou formulário na falta dele.
+
+    Args:
+        request (Request): Requisição recebida.
+
+    Returns:
+        tuple: (corpo JSON ou None, query string, formulário ou None).
+    """
+    corpo, formulario = None, None
+    if request.content_type == 'application/json' or request.content_type.endswith('+json'):
+        try:
+            corpo = orjson.loads(await request.read())
+        except orjson.JSONDecodeError:
+            corpo = None
+    elif request.content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+        formulario = MultiDict(list((await request.post()).items()))
+    return corpo, MultiDict(list(request.query.items())), formulario
+
+async def receber_localizacao(request):
+    """
+    Recebe uma localização e a conta nas métricas pelo código da resposta.
+
+    Args:
+        request (Request): Requisição recebida.
+
+    Returns:
+        Response: Resposta de _receber_localizacao().
+    """
+    resposta = await _receber_localizacao(request)
+    contar_localizacao_iot('ingestao', resposta.status)
+    return resposta
+
+async def _receber_localizacao(request):
+    """
+    Recebe uma localização de um dispositivo IoT (sem autenticação), como POST /localizacoes/iot da API.
+
+    Args:
+        request (Request): Requisição com latitude e longitude no corpo JSON.
+
+    Returns:
+        Response: JSON com dados da localização criada, mensagem de sucesso e 'status' verdadeiro (status 201).
+        Response: JSON com 'error' e 'status' falso (status 400) se dados inválidos ou integridade violada.
+        Response: JSON com 'error' e 'status' falso (status 429) se o limite de requisições for excedido.
+        Response: JSON com 'error' e 'status' falso (status 503) se a fila de gravação estiver cheia.
+        Response: JSON com 'message' e 'status' falso (status 500) em caso de erro interno.
+    """
+    excedido, headers = await request.app[CHAVE_LIMITES].verificar(request)
+    if excedido is not None:
+        return _resposta({"error": f"Limite de requisições excedido ({excedido}). Tente novamente mais tarde.", "status": False}, 429, headers)
+    try:
+        dados = ESQUEMA_LOCALIZACAO_IOT.validar_dados(*await _ler_entrada(request))
+        localizacao = await request.app[CHAVE_GRAVADOR].gravar({"latitude": dados['latitude'], "longitude": dados['longitude']})
+        return _resposta({"Localizacao": localizacao, "message": MENSAGEM_RECEBIDA, "status": True}, 201, headers)
+    except ValueError as e:
+        return _resposta({"error": f"Dados inválidos: {str(e)}", "status": False}, 400, headers)
+    except FilaCheia:
+        return _resposta({"error": "Servidor de ingestão sobrecarregado. Tente novamente mais tarde.", "status": False}, 503, {**headers, 'Retry-After': '1'})
+    except DataError as e:
+        return _resposta({"error": f"Erro de dados: {str(e)}", "status": False}, 400, headers)
+    except IntegrityError as e:
+        return _resposta({"error": f"Violação de integridade: {str(e)}", "status": False}, 400, headers)
+    except Exception as e:
+        return _resposta({"message": f"Erro interno no servidor: {str(e)}", "status": False}, 500, headers)
+
+async def ping(request):
+    """
+    Verifica a disponibilidade do servidor de ingestão.
+
+    Args:
+        request (Request): Requisição recebida.
+
+    Returns:
+        Response: JSON com 'pong' verdadeiro, localizações aguardando gravação e 'status' verdadeiro (status 200).
+    """
+    return _resposta({"pong": True, "pendentes": request.app[CHAVE_GRAVADOR].pendentes, "status": True}, 200)
+
+async def metricas(request):
+    """
+    Exporta as métricas do servidor de ingestão no formato de texto do Prometheus.
+
+    Args:
+        request (Request): Requisição recebida.
+
+    Headers:
+        Authorization (str): 'Bearer <METRICAS_TOKEN>', obrigatório apenas se METRICAS_TOKEN estiver definido.
+
+    Returns:
+        Response: Métricas em texto (status 200).
+        Response: JSON com 'error' e 'status' falso (status 401) se o token for exigido e não conferir.
+    """
+    if not autorizado(request.headers.get('Authorization'), request.app[CHAVE_METRICAS_TOKEN]):
+        return _resposta({"error": "Token de métricas inválido.", "status": False}, 401)
+    PENDENTES.set(request.app[CHAVE_GRAVADOR].pendentes)
+    corpo, tipo = gerar_metricas()
+    return web.Response(body=corpo, status=200, headers={'Content-Type': tipo})
+
+def _metricas_ativas():
+    """
+    Indica se as métricas estão ativas (METRICAS_ATIVAS, com os mesmos valores aceitos pela API).
+
+    Returns:
+        bool: False se METRICAS_ATIVAS for '0', 'false', 'nao' ou 'não'.
+    """
+    return os.getenv('METRICAS_ATIVAS', '1').lower() not in ('0', 'false', 'nao', 'não')
+
+def criar_aplicacao(host='0.0.0.0', porta_metricas=None):
+    """
+    Cria a aplicação aiohttp de ingestão com as configurações do ambiente.
+
+    Args:
+        host (str, optional): Endereço de escuta da porta de métricas.
+        porta_metricas (int, optional): Porta exclusiva desta instância para GET /metrics, servida em uma aplicação
+            separada (sem SO_REUSEPORT) no mesmo host da ingestão.
+
+    Returns:
+        Application: Aplicação configurada.
+
+    Raises:
+        ValueError: Se DATABASE_URL não estiver definida ou PROXIES_CONFIAVEIS for inválida.
+
+    NOTE: INGESTAO_DATABASE_URL, se definida, substitui a URL derivada de DATABASE_URL (ex.: para usar um pooler).
+    """
+    load_dotenv()
+    url = os.getenv('INGESTAO_DATABASE_URL') or os.getenv('DATABASE_URL')
+    if not url:
+        raise ValueError("DATABASE_URL não configurada no ambiente.")
+    pool = int(os.getenv('INGESTAO_POOL', '4'))
+    token = os.getenv('METRICAS_TOKEN') or ''
+
+    aplicacao = web.Application(client_max_size=64 * 1024)
+    aplicacao[CHAVE_METRICAS_TOKEN] = token
+    aplicacao[CHAVE_LIMITES] = LimitesIngestao(
+        os.getenv('RATELIMIT_STORAGE_URI', 'memory://'),
+        os.getenv('RATELIMIT_STRATEGY', 'sliding-window-counter'),
+        os.getenv('LIMITE_IOT', '720 per hour'),
+        os.getenv('LIMITE_IOT_IP', '7200 per hour'),
+        redes_confiaveis(os.getenv('PROXIES_CONFIAVEIS')),
+    )
+
+    async def ciclo_gravador(aplicacao):
+        engine = create_async_engine(url_assincrona(url), pool_size=pool, max_overflow=0, pool_pre_ping=True)
+        gravador = GravadorLotes(
+            engine,
+            gravadores=pool,
+            lote_maximo=int(os.getenv('INGESTAO_LOTE_MAXIMO', '500')),
+            espera=float(os.getenv('INGESTAO_LOTE_ESPERA', '0.02')),
+            fila_maxima=int(os.getenv('INGESTAO_FILA_MAXIMA', '10000')),
+        )
+        gravador.iniciar()
+        aplicacao[CHAVE_GRAVADOR] = gravador
+        yield
+        await gravador.fechar()
+
+    async def ciclo_metricas(aplicacao):
+        exportador = web.Application()
+        exportador[CHAVE_METRICAS_TOKEN] = token
+        exportador[CHAVE_GRAVADOR] = aplicacao[CHAVE_GRAVADOR]
+        exportador.router.add_get('/metrics', metricas)
+        executor = web.AppRunner(exportador, access_log=None)
+        await executor.setup()
+        await web.TCPSite(executor, host, porta_metricas).start()
+        yield
+        await executor.cleanup()
+
+    aplicacao.cleanup_ctx.append(ciclo_gravador)
+    aplicacao.router.add_post('/localizacoes/iot', receber_localizacao)
+    aplicacao.router.add_get('/ping', ping)
+    if _metricas_ativas():
+        aplicacao.router.add_get('/metrics', metricas)
+        if porta_metricas:
+            aplicacao.cleanup_ctx.append(ciclo_metricas)
+    return aplicacao
+
+def main():
+    """
+    Inicia o servidor de ingestão.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--host', default=os.getenv('INGESTAO_HOST', '0.0.0.0'), help='Endereço de escuta.')
+    parser.add_argument('--porta', type=int, default=int(os.getenv('INGESTAO_PORTA', '8001')), help='Porta de escuta.')
+    parser.add_argument('--porta-metricas', type=int, default=int(os.getenv('INGESTAO_PORTA_METRICAS', '0')) or None,
+                        help='Porta exclusiva desta instância para GET /metrics.')
+    opcoes = parser.parse_args()
+    web.run_app(criar_aplicacao(opcoes.host, opcoes.porta_metricas), host=opcoes.host, port=opcoes.porta, reuse_port=True)
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ Data: 07/10/2025
 
 NOTE: Este módulo usa pytest para testar os endpoints definidos em routes.py.
       Assume que a API está rodando em http://localhost:5000.
+      Os testes do servidor de ingestão IoT rodam apenas se INGESTAO_URL estiver definida (ex.: http://localhost:8001).
       Usa fixtures para gerenciar o estado do banco de dados e autenticação.
 TODO: Adicionar testes para validações de erro específicas, como CNH inválida.
 """
@@ -14,8 +15,11 @@ import pytest
 import requests
 from datetime import datetime
 import uuid
+import hashlib
+import os
 
 BASE_URL = "http://localhost:5000"
+INGESTAO_URL = os.getenv("INGESTAO_URL")
 
 # --------------------------- FIXTURES ---------------------------
 
@@ -45,34 +49,48 @@ def user_data():
         "telefone": "11999999999"
     }
 
+@pytest.fixture(scope="session")
+def tokens():
+    """
+    Guarda os headers de autenticação obtidos durante a sessão de testes.
+
+    Returns:
+        dict: Headers já obtidos, reaproveitados entre os testes.
+    """
+    return {}
+
 @pytest.fixture
-def auth_headers(client, user_data):
+def auth_headers(client, user_data, tokens):
     """
-    Cria um usuário, realiza login e retorna os headers com token JWT.
-    Também realiza logout ao final dos testes que usam esta fixture.
+    Realiza login do usuário de teste (criando-o se ainda não existir) e retorna os headers com token JWT.
 
     Args:
         client (Session): Sessão de requests.
         user_data (dict): Dados do usuário.
+        tokens (dict): Headers já obtidos na sessão de testes.
 
-    Yields:
+    Returns:
         dict: Headers com token de autorização.
 
     Raises:
         AssertionError: Se a criação do usuário ou login falhar.
-    """
-    resp = client.post(f"{BASE_URL}/usuarios", json=user_data)
-    assert resp.status_code == 201, f"Falha ao criar usuário de teste: {resp.json()}"
 
-    login_data = {
-        "cnh": user_data["cnh"],
-        "placa_veiculo": user_data["placa_veiculo"]
-    }
-    resp = client.post(f"{BASE_URL}/usuarios/login", json=login_data)
-    assert resp.status_code == 200, f"Falha no login: {resp.json()}"
-    token = resp.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    yield headers
+    NOTE: O token é obtido uma única vez por sessão de testes, já que (cnh, placa_veiculo) é único e o login é
+          limitado por IP (LIMITE_LOGIN).
+    """
+    if "headers" not in tokens:
+        login_data = {
+            "cnh": user_data["cnh"],
+            "placa_veiculo": user_data["placa_veiculo"]
+        }
+        resp = client.post(f"{BASE_URL}/usuarios/login", json=login_data)
+        if resp.status_code == 401:
+            resp = client.post(f"{BASE_URL}/usuarios", json=user_data)
+            assert resp.status_code == 201, f"Falha ao criar usuário de teste: {resp.json()}"
+            resp = client.post(f"{BASE_URL}/usuarios/login", json=login_data)
+        assert resp.status_code == 200, f"Falha no login: {resp.json()}"
+        tokens["headers"] = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    return tokens["headers"]
 
 @pytest.fixture
 def user_id(auth_headers, client):
@@ -146,6 +164,33 @@ def loc_id(auth_headers, client, entrega_id, user_id):
     assert resp.status_code == 201, f"Falha ao criar localização: {resp.json()}"
     return resp.json()["Localizacao"]["id"]
 
+# --------------------------- AUXILIARES ---------------------------
+
+def _enviar_foto(client, auth_headers, entrega_id, foto):
+    """
+    Envia uma foto de prova pelo upload retomável, em uma única parte.
+
+    Args:
+        client (Session): Sessão de requests.
+        auth_headers (dict): Headers de autenticação.
+        entrega_id (str): ID da entrega.
+        foto (bytes): Conteúdo da foto (JPEG).
+
+    Returns:
+        Response: Resposta do envio da parte, com a entrega atualizada.
+
+    Raises:
+        AssertionError: Se o upload não for iniciado ou concluído.
+    """
+    data = {"tamanho": len(foto), "sha256": hashlib.sha256(foto).hexdigest(), "tipo": "image/jpeg"}
+    resp = client.post(f"{BASE_URL}/entregas/{entrega_id}/foto", json=data, headers=auth_headers)
+    assert resp.status_code == 201, f"Falha ao iniciar upload: {resp.json()}"
+    url = f"{BASE_URL}/entregas/{entrega_id}/foto/{resp.json()['Upload']['upload_id']}"
+    resp = client.patch(url, data=foto, headers={**auth_headers, "Upload-Offset": "0"})
+    assert resp.status_code == 200, f"Falha ao concluir upload: {resp.json()}"
+    assert resp.json()["Upload"]["concluido"]
+    return resp
+
 # --------------------------- TESTES GERAIS ---------------------------
 
 @pytest.mark.order(1)
@@ -181,6 +226,9 @@ def test_create_user(client, user_data):
     assert resp.status_code == 201
     assert resp.json()["status"] is True
 
+    resp = client.post(f"{BASE_URL}/usuarios", json=user_data)
+    assert resp.status_code == 400, "CNH e placa repetidas deveriam ser rejeitadas"
+
 @pytest.mark.order(11)
 def test_login(client, user_data):
     """
@@ -216,23 +264,39 @@ def test_session(auth_headers, client):
     resp = client.get(f"{BASE_URL}/usuarios/session", headers=auth_headers)
     assert resp.status_code == 200
     assert resp.json()["status"] is True
+    assert resp.json()["renovado"] is False, "Token recém-emitido não deveria ser renovado"
+    assert auth_headers["Authorization"].endswith(resp.json()["access_token"])
 
 @pytest.mark.order(13)
-def test_logout(auth_headers, client):
+def test_logout(client, user_data):
     """
-    Realiza logout do usuário de teste e verifica sucesso.
+    Realiza logout com um token próprio e verifica que ele deixa de ser aceito.
 
     Args:
-        auth_headers (dict): Headers de autenticação.
         client (Session): Sessão de requests.
+        user_data (dict): Dados do usuário.
 
     Raises:
-        AssertionError: Se o logout falhar.
+        AssertionError: Se o logout falhar ou o token continuar válido.
+
+    NOTE: Usa um token separado para não revogar o token compartilhado pelos demais testes.
     """
-    resp = client.post(f"{BASE_URL}/usuarios/logout", headers=auth_headers)
+    login_data = {"cnh": user_data["cnh"], "placa_veiculo": user_data["placa_veiculo"]}
+    resp = client.post(f"{BASE_URL}/usuarios/login", json=login_data)
+    assert resp.status_code == 200, f"Falha no login: {resp.json()}"
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    resp = client.post(f"{BASE_URL}/usuarios/logout", headers=headers)
     assert resp.status_code == 200
     assert resp.json()["status"] is True
 
+    resp = client.get(f"{BASE_URL}/usuarios/session", headers=headers)
+    assert resp.status_code == 401, f"Token revogado não deveria ser aceito: {resp.text}"
+    assert resp.json()["status"] is False
+
+    resp = client.post(f"{BASE_URL}/usuarios/logout", headers=headers)
+    assert resp.status_code == 401
+
 # --------------------------- TESTES DE USUÁRIOS ---------------------------
 
 @pytest.mark.order(14)
@@ -283,7 +347,7 @@ def test_update_user(auth_headers, client, user_id):
     """
     data = {
         "nome": "Motorista Atualizado",
-        "placa_veiculo": "ABC-1234",
+        "placa_veiculo": "XYZ-9876",
         "cnh": "12345678901",
         "telefone": "11988888888"
     }
@@ -454,6 +518,102 @@ def test_update_entrega_status(auth_headers, client, entrega_id):
     assert resp.status_code == 200, f"Falha ao atualizar status: {resp.json()}"
     assert resp.json()["status"] is True
 
+@pytest.mark.order(27)
+def test_create_entregas_lote(auth_headers, client, user_id):
+    """
+    Testa a criação de entregas em lote e o relatório de erros por linha.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        user_id (str): ID do usuário.
+
+    Raises:
+        AssertionError: Se a importação em lote falhar.
+    """
+    entregas = [
+        {"motorista_id": user_id, "endereco_entrega": "Rua Lote, 1", "nome_cliente": "Cliente Lote 1"},
+        {"motorista_id": user_id, "endereco_entrega": "Rua Lote, 2", "nome_cliente": "Cliente Lote 2"},
+        {"motorista_id": str(uuid.uuid4()), "endereco_entrega": "Rua Lote, 3", "nome_cliente": "Cliente Lote 3"}
+    ]
+    resp = client.post(f"{BASE_URL}/entregas/lote", json={"entregas": entregas}, headers=auth_headers)
+    assert resp.status_code == 400, f"Lote com motorista inexistente deveria ser rejeitado: {resp.json()}"
+    assert resp.json()["Erros"][0]["linha"] == 3
+
+    resp = client.post(f"{BASE_URL}/entregas/lote", json={"entregas": entregas, "parcial": True}, headers=auth_headers)
+    assert resp.status_code == 201, f"Falha na importação em lote: {resp.json()}"
+    assert resp.json()["status"] is True
+    assert len(resp.json()["Entregas"]) == 2
+    assert len({e["numero_pedido"] for e in resp.json()["Entregas"]}) == 2
+
+@pytest.mark.order(28)
+def test_update_entregas_status_lote(auth_headers, client, user_id):
+    """
+    Testa a atualização de status em lote com resultado por entrega.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        user_id (str): ID do usuário.
+
+    Raises:
+        AssertionError: Se a atualização em lote falhar.
+    """
+    entregas = [
+        {"motorista_id": user_id, "endereco_entrega": f"Rua Depósito, {i}", "nome_cliente": "Cliente Depósito"}
+        for i in range(3)
+    ]
+    resp = client.post(f"{BASE_URL}/entregas/lote", json={"entregas": entregas}, headers=auth_headers)
+    assert resp.status_code == 201, f"Falha ao criar entregas: {resp.json()}"
+    ids = [e["id"] for e in resp.json()["Entregas"]]
+
+    inexistente = str(uuid.uuid4())
+    data = {"ids": ids + [inexistente], "status": "em_rota"}
+    resp = client.put(f"{BASE_URL}/entregas/status/lote", json=data, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha ao atualizar status em lote: {resp.json()}"
+    assert resp.json()["atualizadas"] == 3
+    assert resp.json()["Resultados"][-1]["status"] is False
+
+    resp = client.put(f"{BASE_URL}/entregas/status/lote", json={"ids": ids, "status": "em_rota"}, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha ao repetir o status em lote: {resp.json()}"
+    assert resp.json()["atualizadas"] == 0
+    assert all(r["status"] and r["inalterada"] for r in resp.json()["Resultados"])
+
+    resp = client.put(f"{BASE_URL}/entregas/status/lote", json={"ids": ids, "status": "cancelada"}, headers=auth_headers)
+    assert resp.status_code == 400, "Status 'cancelada' sem motivo deveria ser rejeitado"
+
+@pytest.mark.order(29)
+def test_update_entrega_status_conflito(auth_headers, client, entrega_id):
+    """
+    Testa a rejeição de transições não permitidas e de versões desatualizadas, e a repetição do status atual.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        entrega_id (list): ID da entrega.
+
+    Raises:
+        AssertionError: Se o controle de transições ou de versão falhar, ou se a repetição do status for rejeitada.
+    """
+    resp = client.put(f"{BASE_URL}/entregas/{entrega_id[0]}/status", json={"status": "em_rota", "versao": 1}, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha ao atualizar status: {resp.json()}"
+    assert resp.json()["Entrega"]["versao"] == 2
+
+    resp = client.put(f"{BASE_URL}/entregas/{entrega_id[0]}/status", json={"status": "em_rota", "versao": 1}, headers=auth_headers)
+    assert resp.status_code == 200, "Repetir o status atual deveria ser aceito sem alterações"
+    assert resp.json()["Entrega"]["versao"] == 2
+
+    data = {"status": "entregue", "nome_recebido": "Recebedor Teste", "versao": 1}
+    resp = client.put(f"{BASE_URL}/entregas/{entrega_id[0]}/status", json=data, headers=auth_headers)
+    assert resp.status_code == 409, "Versão desatualizada deveria ser rejeitada"
+
+    data["versao"] = 2
+    resp = client.put(f"{BASE_URL}/entregas/{entrega_id[0]}/status", json=data, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha ao atualizar status: {resp.json()}"
+
+    resp = client.put(f"{BASE_URL}/entregas/{entrega_id[0]}/status", json={"status": "pendente"}, headers=auth_headers)
+    assert resp.status_code == 409, "Entrega finalizada não deveria voltar para 'pendente'"
+
 @pytest.mark.order(91)
 def test_delete_entrega(auth_headers, client, entrega_id):
     """
@@ -509,9 +669,10 @@ def test_create_localizacao_iot(client):
         AssertionError: Se o envio de localização IoT falhar.
     """
     data = {"latitude": -23.58, "longitude": -46.66}
-    resp = client.post(f"{BASE_URL}/localizacoes/iot", json=data)
+    resp = client.post(f"{BASE_URL}/localizacoes/iot", json=data, headers={"X-Dispositivo-Id": "esp32-teste"})
     assert resp.status_code == 201, f"Falha ao criar localização IoT: {resp.json()}"
     assert resp.json()["status"] is True
+    assert int(resp.headers["X-RateLimit-Limit"]) >= 360, "Limite IoT deveria comportar um envio a cada 10 segundos"
 
 @pytest.mark.order(32)
 def test_list_localizacoes(auth_headers, client, entrega_id, user_id):
@@ -640,6 +801,330 @@ def test_update_localizacao(auth_headers, client, loc_id, entrega_id, user_id):
     assert resp.status_code == 200, f"Falha ao atualizar localização: {resp.json()}"
     assert resp.json()["status"] is True
 
+@pytest.mark.order(37)
+def test_get_estatisticas_entregas(auth_headers, client, user_id):
+    """
+    Testa a consulta das estatísticas diárias de entregas por motorista.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        user_id (str): ID do usuário.
+
+    Raises:
+        AssertionError: Se as estatísticas não refletirem as entregas criadas.
+    """
+    resp = client.get(f"{BASE_URL}/entregas/estatisticas", params={"motorista_id": user_id}, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha ao consultar estatísticas: {resp.json()}"
+    motoristas = resp.json()["Estatisticas"]["motoristas"]
+    assert len(motoristas) == 1
+    assert motoristas[0]["pendente"] >= 1
+    assert motoristas[0]["total"] >= motoristas[0]["entregue"]
+
+    resp = client.get(f"{BASE_URL}/entregas/estatisticas", params={"data": "19/10/2026"}, headers=auth_headers)
+    assert resp.status_code == 400, "Data em formato inválido deveria ser rejeitada"
+
+@pytest.mark.order(38)
+def test_busca_entregas(auth_headers, client, entrega_id):
+    """
+    Testa a busca de entregas por nome do cliente sem diferenciar maiúsculas e acentos.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        entrega_id (list): ID da entrega.
+
+    Raises:
+        AssertionError: Se a entrega criada não for encontrada ou a validação do termo falhar.
+    """
+    resp = client.get(f"{BASE_URL}/entregas/busca", params={"q": "CLIÉNTE TESTE", "por_pagina": 100}, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha na busca: {resp.json()}"
+    assert entrega_id[0] in [e["id"] for e in resp.json()["Entregas"]]
+
+    resp = client.get(f"{BASE_URL}/entregas/busca", params={"q": "ab"}, headers=auth_headers)
+    assert resp.status_code == 400, "Termo curto deveria ser rejeitado"
+
+@pytest.mark.order(39)
+def test_sync_mutacoes(auth_headers, client, entrega_id):
+    """
+    Testa a sincronização de mutações offline e a deduplicação por chave de idempotência.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        entrega_id (list): ID da entrega.
+
+    Raises:
+        AssertionError: Se as mutações não forem aplicadas ou forem reaplicadas ao repetir a chave.
+    """
+    mutacoes = [
+        {"chave": f"{entrega_id[0]}-obs", "tipo": "observacao", "entrega_id": entrega_id[0], "observacao": "Portão azul"},
+        {"chave": f"{entrega_id[0]}-loc", "tipo": "localizacao", "entrega_id": entrega_id[0], "latitude": -23.5505, "longitude": -46.6333}
+    ]
+    resp = client.post(f"{BASE_URL}/sync", json={"mutacoes": mutacoes}, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha na sincronização: {resp.json()}"
+    assert resp.json()["aplicadas"] == 2
+    assert all(r["status"] for r in resp.json()["Resultados"])
+
+    resp = client.post(f"{BASE_URL}/sync", json={"mutacoes": mutacoes}, headers=auth_headers)
+    assert resp.status_code == 200, f"Falha na sincronização repetida: {resp.json()}"
+    assert resp.json()["duplicadas"] == 2
+    assert resp.json()["aplicadas"] == 0
+
+@pytest.mark.order(40)
+def test_upload_foto_prova(auth_headers, client, entrega_id):
+    """
+    Testa o upload retomável da foto de prova em duas partes.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        entrega_id (list): ID da entrega.
+
+    Raises:
+        AssertionError: Se o upload falhar ou a foto não for vinculada à entrega.
+    """
+    foto = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 64
+    data = {"tamanho": len(foto), "sha256": hashlib.sha256(foto).hexdigest(), "tipo": "image/jpeg"}
+    resp = client.post(f"{BASE_URL}/entregas/{entrega_id[0]}/foto", json=data, headers=auth_headers)
+    assert resp.status_code == 201, f"Falha ao iniciar upload: {resp.json()}"
+    url = f"{BASE_URL}/entregas/{entrega_id[0]}/foto/{resp.json()['Upload']['upload_id']}"
+
+    resp = client.patch(url, data=foto[:5000], headers={**auth_headers, "Upload-Offset": "0"})
+    assert resp.status_code == 200, f"Falha ao enviar parte: {resp.json()}"
+    assert resp.json()["Upload"]["recebido"] == 5000
+
+    resp = client.patch(url, data=foto[:5000], headers={**auth_headers, "Upload-Offset": "0"})
+    assert resp.status_code == 409, "Deslocamento incorreto deveria ser rejeitado"
+
+    resp = client.patch(url, data=foto[5000:], headers={**auth_headers, "Upload-Offset": "5000"})
+    assert resp.status_code == 200, f"Falha ao concluir upload: {resp.json()}"
+    assert resp.json()["Upload"]["concluido"]
+    assert resp.json()["Entrega"]["foto_prova"]
+    assert set(resp.json()["Entrega"]["fotos"]) == {"original", "miniatura", "web"}
+
+@pytest.mark.order(41)
+def test_servir_foto(auth_headers, client, entrega_id):
+    """
+    Envia uma foto de prova e testa o envio dela com ETag, cache e intervalo de bytes.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+        entrega_id (list): ID da entrega (criada sem foto de prova).
+
+    Raises:
+        AssertionError: Se a foto não for servida ou os headers de cache e Range não forem respeitados.
+    """
+    foto = b"\xff\xd8\xff\xe0" + uuid.uuid4().bytes * 512
+    resp = _enviar_foto(client, auth_headers, entrega_id[0], foto)
+    url = f"{BASE_URL}{resp.json()['Entrega']['fotos']['original']}"
+
+    resp = client.get(url, headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.content == foto
+    assert "immutable" in resp.headers["Cache-Control"]
+    etag = resp.headers["ETag"]
+
+    resp = client.get(url, headers={**auth_headers, "Range": "bytes=0-3"})
+    assert resp.status_code == 206
+    assert resp.content == b"\xff\xd8\xff\xe0"
+    assert resp.headers["Content-Range"] == f"bytes 0-3/{len(foto)}"
+
+    resp = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+
+    resp = client.get(f"{BASE_URL}/fotos/{'0' * 64}", headers=auth_headers)
+    assert resp.status_code == 404
+
+@pytest.mark.order(42)
+def test_processamento_fotos(auth_headers, client):
+    """
+    Testa a consulta da fila de geração das variantes das fotos.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se a consulta falhar ou faltarem indicadores.
+    """
+    resp = client.get(f"{BASE_URL}/fotos/processamento", headers=auth_headers)
+    assert resp.status_code == 200
+    assert {"pendentes", "limite_fila", "processos", "recusadas", "falhas"} <= set(resp.json()["Processamento"])
+
+@pytest.mark.order(43)
+def test_validacao_entrada(auth_headers, client):
+    """
+    Testa a rejeição de parâmetros ausentes ou inválidos pelos esquemas de entrada.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se algum parâmetro inválido não for rejeitado com a mensagem do campo.
+    """
+    resp = client.post(f"{BASE_URL}/localizacoes", json={"latitude": -23.56}, headers=auth_headers)
+    assert resp.status_code == 400
+    assert resp.json() == {"error": "Dados inválidos: Longitude inválida", "status": False}
+
+    resp = client.post(f"{BASE_URL}/localizacoes", json={"latitude": 95, "longitude": -46.64}, headers=auth_headers)
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "Dados inválidos: Latitude inválida"
+
+    resp = client.get(f"{BASE_URL}/entregas/estatisticas", params={"data": "19/10/2026"}, headers=auth_headers)
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "Dados inválidos: Data deve estar no formato AAAA-MM-DD"
+
+@pytest.mark.order(44)
+def test_compressao_respostas(auth_headers, client):
+    """
+    Testa a compressão negociada das respostas pelo header Accept-Encoding.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se uma resposta grande não for comprimida ou uma resposta pequena for.
+    """
+    resp = client.get(f"{BASE_URL}/localizacoes", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    if len(resp.content) >= 1024:
+        assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.json()["status"] is True
+
+    resp = client.get(f"{BASE_URL}/ping", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers, "Respostas pequenas não devem ser comprimidas"
+
+    resp = client.get(f"{BASE_URL}/localizacoes", headers={**auth_headers, "Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in resp.headers
+
+@pytest.mark.order(45)
+@pytest.mark.skipif(not INGESTAO_URL, reason="INGESTAO_URL não definida (servidor de ingestão não iniciado)")
+def test_servidor_ingestao(auth_headers, client):
+    """
+    Testa o envio de localizações pelo servidor assíncrono de ingestão e a leitura delas pela API.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se a localização não for gravada ou os dados inválidos não forem rejeitados como na API.
+    """
+    resp = client.post(f"{INGESTAO_URL}/localizacoes/iot", json={"latitude": -23.59, "longitude": -46.67},
+                       headers={"X-Dispositivo-Id": "esp32-teste-ingestao"})
+    assert resp.status_code == 201, f"Falha ao enviar localização à ingestão: {resp.json()}"
+    assert resp.json()["message"] == "Localização recebida com sucesso."
+    loc_id = resp.json()["Localizacao"]["id"]
+
+    resp = client.get(f"{BASE_URL}/localizacoes/{loc_id}", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["Localizacao"]["latitude"] == -23.59
+    client.delete(f"{BASE_URL}/localizacoes/{loc_id}", headers=auth_headers)
+
+    resp = client.post(f"{INGESTAO_URL}/localizacoes/iot", json={"latitude": -23.59})
+    assert resp.status_code == 400
+    assert resp.json() == {"error": "Dados inválidos: Longitude é obrigatória", "status": False}
+
+@pytest.mark.order(46)
+def test_pool_banco(auth_headers, client):
+    """
+    Testa a consulta das estatísticas do pool de conexões com o banco.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se a consulta falhar ou faltarem indicadores.
+    """
+    resp = client.get(f"{BASE_URL}/banco/pool", headers=auth_headers)
+    assert resp.status_code == 200
+    pool = resp.json()["Pool"]
+    assert {"tamanho", "em_uso", "disponiveis", "excedentes", "obtencoes", "espera_media_ms", "esgotamentos"} <= set(pool)
+    assert pool["obtencoes"] > 0
+    for replica in resp.json()["Replicas"].values():
+        assert {"disponivel", "tamanho", "em_uso", "obtencoes"} <= set(replica)
+
+@pytest.mark.order(47)
+def test_metricas(client):
+    """
+    Testa a exportação das métricas no formato do Prometheus.
+
+    Args:
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se a rota falhar ou faltarem as séries das requisições anteriores.
+
+    NOTE: Exige que METRICAS_TOKEN não esteja definido no servidor de testes.
+    """
+    client.get(f"{BASE_URL}/ping")
+    resp = client.get(f"{BASE_URL}/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"].startswith("text/plain")
+    assert 'api_requisicoes_total{codigo="200",metodo="GET",recurso="Ping"}' in resp.text
+    assert "api_requisicao_duracao_segundos_bucket" in resp.text
+    assert "localizacoes_iot_total" in resp.text
+
+@pytest.mark.order(48)
+def test_perfil_sql(auth_headers, client):
+    """
+    Testa o resumo do perfil SQL no header X-Perfil-SQL.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se o header não tiver o formato esperado.
+
+    NOTE: Ignorado se o servidor de testes não estiver com PERFIL_SQL=1.
+    """
+    resp = client.get(f"{BASE_URL}/entregas", headers=auth_headers)
+    perfil = resp.headers.get("X-Perfil-SQL")
+    if perfil is None:
+        pytest.skip("PERFIL_SQL não está ativo no servidor de testes.")
+    valores = dict(item.split("=") for item in perfil.split("; "))
+    assert set(valores) == {"consultas", "tempo_ms", "repetidas"}
+    assert int(valores["consultas"]) >= 1
+    assert float(valores["tempo_ms"]) >= 0
+
+@pytest.mark.order(49)
+def test_replicas_leitura(auth_headers, client):
+    """
+    Testa o atendimento dos GET de leitura pelas réplicas de DATABASE_REPLICA_URLS.
+
+    Args:
+        auth_headers (dict): Headers de autenticação.
+        client (Session): Sessão de requests.
+
+    Raises:
+        AssertionError: Se as leituras não obtiverem conexões das réplicas.
+
+    NOTE: Ignorado se o servidor de testes não tiver réplicas (ver db/replicas_locais.sh). Os indicadores do pool são
+          do processo que atende a requisição: inicie a API com um único processo (python main.py).
+    """
+    resp = client.get(f"{BASE_URL}/banco/pool", headers=auth_headers)
+    replicas = resp.json()["Replicas"]
+    if not replicas:
+        pytest.skip("DATABASE_REPLICA_URLS não está definida no servidor de testes.")
+    assert all(r["disponivel"] for r in replicas.values()), f"Réplica fora do rodízio: {replicas}"
+    antes = sum(r["obtencoes"] for r in replicas.values())
+
+    leituras = 2 * len(replicas)
+    for _ in range(leituras):
+        resp = client.get(f"{BASE_URL}/entregas", headers=auth_headers)
+        assert resp.status_code == 200, f"Falha ao listar entregas: {resp.json()}"
+
+    replicas = client.get(f"{BASE_URL}/banco/pool", headers=auth_headers).json()["Replicas"]
+    assert sum(r["obtencoes"] for r in replicas.values()) >= antes + leituras
+    assert all(r["obtencoes"] > 0 for r in replicas.values()), "O rodízio deveria usar todas as réplicas"
+
 @pytest.mark.order(90)
 def test_delete_localizacao(auth_headers, client, loc_id):
     """
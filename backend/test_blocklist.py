@@ -0,0 +1,215 @@
+"""
+Módulo: test_blocklist.py
+Descrição: Testes unitários da blacklist de JWT (app/utils.py) nos armazenamentos 'banco' e 'memoria': revogação,
+           expiração junto com o token e propagação de um logout feito em outro processo.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Não dependem da API em execução: cada teste cria a aplicação com um banco SQLite temporário e substitui o relógio
+      de app/utils.py, para avançar o tempo sem esperar.
+"""
+
+import pytest
+import time
+import uuid
+from app import utils
+from app.db import configurar_app, db
+from app.models.token_revogado import TokenRevogado
+from app.models import usuarios, entrega, localizacao, evento  # noqa: F401 (mapeadores das relações entre os modelos)
+from app.utils import init_blocklist, add_to_blacklist, check_if_token_in_blacklist
+
+TTL = 5
+
+class Relogio:
+    """
+    Relógio controlado pelos testes, no lugar do módulo 'time' de app/utils.py.
+    """
+
+    def __init__(self):
+        self.agora = time.time()
+
+    def time(self):
+        """
+        Returns:
+            float: Timestamp Unix atual do relógio.
+        """
+        return self.agora
+
+    def avancar(self, segundos):
+        """
+        Avança o relógio.
+
+        Args:
+            segundos (float): Segundos a avançar.
+        """
+        self.agora += segundos
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """
+    Substitui o relógio da blacklist.
+
+    Args:
+        monkeypatch (MonkeyPatch): Fixture do pytest.
+
+    Returns:
+        Relogio: Relógio controlado pelo teste.
+    """
+    relogio = Relogio()
+    monkeypatch.setattr(utils, 'time', relogio)
+    return relogio
+
+@pytest.fixture
+def criar_app(tmp_path, monkeypatch):
+    """
+    Fornece uma fábrica de aplicações com a blacklist configurada, todas no mesmo banco SQLite.
+
+    Args:
+        tmp_path (Path): Pasta temporária do teste.
+        monkeypatch (MonkeyPatch): Fixture do pytest para alterar o ambiente.
+
+    Returns:
+        Callable: Função que recebe o armazenamento ('banco' ou 'memoria') e retorna a aplicação.
+
+    NOTE: Cada aplicação tem o seu engine e o seu cache, como um processo separado.
+    """
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'blocklist.db'}")
+    monkeypatch.setenv('SECRET_KEY', 'segredo')
+    monkeypatch.setenv('JWT_SECRET_KEY', 'segredo-jwt')
+    monkeypatch.setenv('NUMERO_PEDIDO_CHAVE', 'chave-dos-pedidos')
+    monkeypatch.setenv('JWT_BLOCKLIST_CACHE_TTL', str(TTL))
+
+    def criar(tipo):
+        monkeypatch.setenv('JWT_BLOCKLIST', tipo)
+        app = configurar_app()
+        init_blocklist(app)
+        with app.app_context():
+            TokenRevogado.__table__.create(db.engine, checkfirst=True)
+        return app
+
+    return criar
+
+def _token(relogio, validade=3600):
+    """
+    Monta o payload de um token ainda não revogado.
+
+    Args:
+        relogio (Relogio): Relógio do teste.
+        validade (int, optional): Segundos até a expiração ('exp').
+
+    Returns:
+        dict: Payload com 'jti' e 'exp'.
+    """
+    return {"jti": str(uuid.uuid4()), "exp": relogio.time() + validade}
+
+@pytest.mark.parametrize('tipo', ['banco', 'memoria'])
+def test_revogar_token(criar_app, relogio, tipo):
+    """
+    Testa que um token revogado passa a ser recusado, mesmo já estando em cache como válido.
+
+    Args:
+        criar_app (Callable): Fábrica de aplicações.
+        relogio (Relogio): Relógio do teste.
+        tipo (str): Armazenamento da blacklist.
+
+    Raises:
+        AssertionError: Se o token revogado continuar aceito ou se outro token for afetado.
+    """
+    app = criar_app(tipo)
+    token, outro = _token(relogio), _token(relogio)
+    with app.app_context():
+        assert check_if_token_in_blacklist(token) is False
+        add_to_blacklist(token['jti'], token['exp'])
+        assert check_if_token_in_blacklist(token) is True
+        assert app.extensions['blocklist'].contem(token['jti']) is True
+        assert check_if_token_in_blacklist(outro) is False
+
+@pytest.mark.parametrize('tipo', ['banco', 'memoria'])
+def test_revogacao_expira_com_o_token(criar_app, relogio, tipo):
+    """
+    Testa que a revogação vale até o 'exp' do token e que o registro é descartado depois dele.
+
+    Args:
+        criar_app (Callable): Fábrica de aplicações.
+        relogio (Relogio): Relógio do teste.
+        tipo (str): Armazenamento da blacklist.
+
+    Raises:
+        AssertionError: Se a revogação terminar antes do 'exp' ou o registro expirado permanecer armazenado.
+    """
+    app = criar_app(tipo)
+    token = _token(relogio, validade=60)
+    with app.app_context():
+        blocklist = app.extensions['blocklist']
+        add_to_blacklist(token['jti'], token['exp'])
+
+        relogio.avancar(59)
+        assert check_if_token_in_blacklist(token) is True
+        assert blocklist.contem(token['jti']) is True
+
+        relogio.avancar(1)
+        assert check_if_token_in_blacklist(token) is False
+        assert blocklist.contem(token['jti']) is False
+
+        # A inclusão seguinte descarta os registros expirados.
+        add_to_blacklist(str(uuid.uuid4()), relogio.time() + 60)
+        if tipo == 'banco':
+            armazenados = db.session.scalars(db.select(TokenRevogado.jti)).all()
+        else:
+            armazenados = list(blocklist._expiracoes)
+        assert token['jti'] not in armazenados
+        assert len(armazenados) == 1
+
+def test_revogacao_de_outro_processo_banco(criar_app, relogio):
+    """
+    Testa que um logout feito em outro processo passa a valer depois de JWT_BLOCKLIST_CACHE_TTL segundos.
+
+    Args:
+        criar_app (Callable): Fábrica de aplicações.
+        relogio (Relogio): Relógio do teste.
+
+    Raises:
+        AssertionError: Se o token for recusado antes do fim do cache ou aceito depois dele.
+
+    NOTE: O outro processo é uma segunda aplicação no mesmo banco, com o seu próprio cache.
+    """
+    app, outro_processo = criar_app('banco'), criar_app('banco')
+    token = _token(relogio)
+    with app.app_context():
+        assert check_if_token_in_blacklist(token) is False
+
+    with outro_processo.app_context():
+        add_to_blacklist(token['jti'], token['exp'])
+        assert check_if_token_in_blacklist(token) is True
+
+    with app.app_context():
+        relogio.avancar(TTL - 1)
+        assert check_if_token_in_blacklist(token) is False
+        relogio.avancar(1)
+        assert check_if_token_in_blacklist(token) is True
+
+def test_revogacao_fora_do_cache_memoria(criar_app, relogio):
+    """
+    Testa que, em 'memoria', uma revogação gravada sem passar pelo cache passa a valer depois de
+    JWT_BLOCKLIST_CACHE_TTL segundos.
+
+    Args:
+        criar_app (Callable): Fábrica de aplicações.
+        relogio (Relogio): Relógio do teste.
+
+    Raises:
+        AssertionError: Se o token for recusado antes do fim do cache ou aceito depois dele.
+
+    NOTE: A blacklist em memória não é compartilhada entre processos; a revogação é gravada direto no armazenamento,
+          como faria outro processo em 'banco'.
+    """
+    app = criar_app('memoria')
+    token = _token(relogio)
+    with app.app_context():
+        assert check_if_token_in_blacklist(token) is False
+        app.extensions['blocklist'].adicionar(token['jti'], token['exp'])
+
+        relogio.avancar(TTL - 1)
+        assert check_if_token_in_blacklist(token) is False
+        relogio.avancar(1)
+        assert check_if_token_in_blacklist(token) is True
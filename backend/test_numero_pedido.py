@@ -0,0 +1,127 @@
+"""
+Módulo: test_numero_pedido.py
+Descrição: Testes unitários do alocador de números de pedido (app/numero_pedido.py) e da exigência de
+           NUMERO_PEDIDO_CHAVE na configuração da aplicação.
+Autor: Rafael dos Santos Giorgi
+Data: 19/10/2026
+
+NOTE: Não dependem da API em execução nem do banco de dados: a permutação e a codificação são funções puras.
+"""
+
+import pytest
+import random
+from app.db import configurar_app
+from app.numero_pedido import AlocadorNumeroPedido, ALFABETO, ESPACO, TAMANHO
+
+# Extremos do espaço e das metades da rede de Feistel, mais uma amostra fixa de valores.
+VALORES = sorted({0, 1, 46655, 46656, 46657, ESPACO // 2, ESPACO - 46656, ESPACO - 2, ESPACO - 1}
+                 | set(random.Random(19102026).sample(range(ESPACO), 5000)))
+
+@pytest.fixture
+def alocador():
+    """
+    Cria um alocador com uma chave fixa de teste.
+
+    Returns:
+        AlocadorNumeroPedido: Alocador.
+    """
+    return AlocadorNumeroPedido('chave-de-teste')
+
+def test_permutar_inverter_ida_e_volta(alocador):
+    """
+    Testa que inverter() desfaz permutar() e que ambos permanecem no espaço [0, 36^6).
+
+    Args:
+        alocador (AlocadorNumeroPedido): Alocador de teste.
+
+    Raises:
+        AssertionError: Se algum valor não voltar ao original ou sair do espaço.
+    """
+    for valor in VALORES:
+        permutado = alocador.permutar(valor)
+        assert 0 <= permutado < ESPACO
+        assert alocador.inverter(permutado) == valor
+        assert 0 <= alocador.inverter(valor) < ESPACO
+        assert alocador.permutar(alocador.inverter(valor)) == valor
+
+def test_permutar_sem_colisoes(alocador):
+    """
+    Testa que valores distintos da sequência geram valores permutados distintos.
+
+    Args:
+        alocador (AlocadorNumeroPedido): Alocador de teste.
+
+    Raises:
+        AssertionError: Se dois valores forem levados ao mesmo resultado.
+    """
+    sequencia = range(20000)
+    assert len({alocador.permutar(valor) for valor in sequencia}) == len(sequencia)
+
+def test_codificar_decodificar_no_espaco(alocador):
+    """
+    Testa que os números de pedido têm 6 caracteres base 36 e que decodificar() recupera o valor da sequência.
+
+    Args:
+        alocador (AlocadorNumeroPedido): Alocador de teste.
+
+    Raises:
+        AssertionError: Se um código tiver formato inválido ou não voltar ao valor original.
+    """
+    for valor in VALORES:
+        codigo = alocador.codificar(valor)
+        assert len(codigo) == TAMANHO
+        assert all(caractere in ALFABETO for caractere in codigo)
+        assert alocador.decodificar(codigo) == valor
+    assert 0 <= alocador.decodificar('0' * TAMANHO) < ESPACO
+    assert 0 <= alocador.decodificar('Z' * TAMANHO) < ESPACO
+
+def test_codificar_fora_do_espaco(alocador):
+    """
+    Testa a rejeição de valores da sequência fora do espaço de 36^6 códigos e de códigos mal formados.
+
+    Args:
+        alocador (AlocadorNumeroPedido): Alocador de teste.
+
+    Raises:
+        AssertionError: Se um valor ou código inválido for aceito.
+    """
+    with pytest.raises(RuntimeError):
+        alocador.codificar(ESPACO)
+    with pytest.raises(RuntimeError):
+        alocador.codificar(-1)
+    for codigo in ('ABC12', 'ABC1234', 'abc123', 'ABC-12'):
+        with pytest.raises(ValueError):
+            alocador.decodificar(codigo)
+
+def test_chave_define_permutacao():
+    """
+    Testa que a permutação depende da chave: a mesma chave repete os códigos e outra chave gera códigos diferentes.
+
+    Raises:
+        AssertionError: Se a chave não determinar os códigos.
+    """
+    codigos = [AlocadorNumeroPedido('chave-a').codificar(valor) for valor in range(100)]
+    assert codigos == [AlocadorNumeroPedido('chave-a').codificar(valor) for valor in range(100)]
+    assert codigos != [AlocadorNumeroPedido('chave-b').codificar(valor) for valor in range(100)]
+    with pytest.raises(ValueError):
+        AlocadorNumeroPedido('')
+
+def test_configuracao_exige_chave(monkeypatch):
+    """
+    Testa que a aplicação não inicia sem NUMERO_PEDIDO_CHAVE, em vez de derivar a chave de SECRET_KEY.
+
+    Args:
+        monkeypatch (MonkeyPatch): Fixture do pytest para alterar o ambiente.
+
+    Raises:
+        AssertionError: Se a aplicação for criada sem a chave ou usar outra chave.
+    """
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    monkeypatch.setenv('SECRET_KEY', 'segredo')
+    monkeypatch.setenv('JWT_SECRET_KEY', 'segredo-jwt')
+    monkeypatch.delenv('NUMERO_PEDIDO_CHAVE', raising=False)
+    with pytest.raises(ValueError, match='NUMERO_PEDIDO_CHAVE'):
+        configurar_app()
+
+    monkeypatch.setenv('NUMERO_PEDIDO_CHAVE', 'chave-dos-pedidos')
+    assert configurar_app().config['NUMERO_PEDIDO_CHAVE'] == 'chave-dos-pedidos'